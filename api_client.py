@@ -0,0 +1,130 @@
+"""
+Streamlit arayüzünün kullandığı Kütüphane API istemcisi.
+
+Bağlantı havuzu ve keep-alive bir httpx taşıma katmanında tutulur; her
+isteğin bağlantı/okuma zaman aşımı vardır. Taşıma katmanı birden çok istemci
+arasında paylaşılabilir; her istemcinin kendi çerezleri (ör. read-your-writes
+çerezi) ve ETag önbelleği olur. Okuma istekleri geçici hatalarda
+(bağlantı hatası, 502/503/504) artan beklemeyle yeniden denenir ve sunucunun
+ETag'leri saklanarak değişmemiş listeler gövdesiz 304 ile doğrulanır.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import httpx
+
+API_URL = os.getenv("LIBRARY_API_URL", "http://localhost:8000")
+CONNECT_TIMEOUT = float(os.getenv("LIBRARY_API_CONNECT_TIMEOUT", "3"))
+READ_TIMEOUT = float(os.getenv("LIBRARY_API_READ_TIMEOUT", "10"))
+RETRIES = int(os.getenv("LIBRARY_API_RETRIES", "3"))
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+# Yalnızca okuma istekleri yeniden denenir; yazmalar iki kez uygulanmamalı
+RETRY_STATUSES = {502, 503, 504}
+RETRY_BACKOFF = 0.2
+MAX_RETRY_DELAY = 5.0
+
+
+def create_transport(retries: int = RETRIES) -> httpx.HTTPTransport:
+    """
+    Bağlantı havuzlu taşıma katmanı; thread'ler ve istemciler arasında paylaşılabilir.
+    """
+    return httpx.HTTPTransport(
+        limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+        # Bağlantı kurulamadığında taşıma katmanı yeniden dener
+        retries=retries,
+    )
+
+
+class LibraryClient:
+    """
+    Kütüphane API'si için bağlantı havuzlu istemci. Thread'ler arasında
+    paylaşılabilir; çerezler istemci başına tutulduğundan farklı kullanıcılar
+    ayrı istemciler kullanmalıdır.
+
+    - **base_url**: API adresi (varsayılan: `LIBRARY_API_URL`)
+    - **http**: Hazır bir httpx.Client (ör. testlerde TestClient); verilmezse oluşturulur
+    - **transport**: Paylaşılan taşıma katmanı (bkz. `create_transport`); verilmezse istemciye özel oluşturulur
+    """
+
+    def __init__(self, base_url: str = API_URL, retries: int = RETRIES, http: Optional[httpx.Client] = None,
+                 etag_cache_size: int = 256, transport: Optional[httpx.BaseTransport] = None):
+        self.retries = retries
+        self.http = http or httpx.Client(
+            base_url=base_url,
+            timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+            transport=transport or create_transport(retries),
+        )
+        self._etag_cache_size = etag_cache_size
+        self._validated = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _retry_delay(self, response: httpx.Response, attempt: int) -> float:
+        retry_after = response.headers.get("retry-after", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), MAX_RETRY_DELAY)
+        return RETRY_BACKOFF * 2 ** attempt
+
+    def _get(self, path: str, params: Optional[dict] = None) -> tuple:
+        params = {key: value for key, value in (params or {}).items() if value is not None}
+        key = (path, tuple(sorted(params.items())))
+        with self._lock:
+            cached = self._validated.get(key)
+        headers = {"If-None-Match": cached[0]} if cached else {}
+
+        for attempt in range(self.retries + 1):
+            try:
+                response = self.http.get(path, params=params, headers=headers)
+            except httpx.TransportError:
+                if attempt == self.retries:
+                    raise
+                time.sleep(RETRY_BACKOFF * 2 ** attempt)
+                continue
+            if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                break
+            time.sleep(self._retry_delay(response, attempt))
+
+        if response.status_code == 304 and cached:
+            with self._lock:
+                # Başka bir thread girdiyi bu arada atmış olabilir
+                if key in self._validated:
+                    self._validated.move_to_end(key)
+            return cached[1], cached[2]
+        response.raise_for_status()
+        data = response.json()
+        next_cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        etag = response.headers.get("etag")
+        if etag:
+            with self._lock:
+                self._validated[key] = (etag, data, next_cursor)
+                self._validated.move_to_end(key)
+                while len(self._validated) > self._etag_cache_size:
+                    self._validated.popitem(last=False)
+        return data, next_cursor
+
+    def get(self, path: str, params: Optional[dict] = None):
+        """
+        GET isteğinin JSON gövdesini döndürür; hata durumlarında httpx.HTTPStatusError fırlatır.
+        """
+        return self._get(path, params)[0]
+
+    def get_page(self, path: str, params: Optional[dict] = None) -> tuple:
+        """
+        Sayfalı liste endpoint'leri için (kayıtlar, sonraki sayfa imleci) döndürür.
+        """
+        return self._get(path, params)
+
+    def post(self, path: str, json=None) -> httpx.Response:
+        return self.http.post(path, json=json)
+
+    def put(self, path: str, json=None) -> httpx.Response:
+        return self.http.put(path, json=json)
+
+    def delete(self, path: str) -> httpx.Response:
+        return self.http.delete(path)
+
+    def close(self) -> None:
+        self.http.close()
\ No newline at end of file
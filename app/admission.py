@@ -0,0 +1,240 @@
+"""
+Kabul kontrolü ve yük atma. Veritabanı yavaşladığında istekler threadpool'da
+birikip gecikmeyi onlarca saniyeye çıkarmak yerine erken reddedilir.
+
+Her istek route'una göre bir maliyet sınıfına ayrılır:
+
+- **export**: Dışa aktarma akışları; en pahalı sınıftır, kuyruğa alınmaz
+- **list**: Liste, arama, toplu sorgu ve rapor okumaları
+- **write**: Yazma istekleri
+- **read**: Tekil okumalar (ör. `GET /books/{book_id}`); en ucuz sınıftır
+
+Her route'un sınıfına göre bir eşzamanlılık sınırı vardır; sınır doluysa
+istek kısa bir süre kuyrukta bekler, kuyruk dolu ya da bekleme süresi aşılmışsa
+`503` ve `Retry-After` döner. Sunucunun toplam yükü arttıkça önce export,
+sonra list istekleri reddedilir; tekil okumalar ve yazmalar en son reddedilir.
+İstemci başına token bucket ile istek hızı da sınırlanabilir (`429`).
+"""
+import asyncio
+import json
+import math
+import os
+import time
+from collections import OrderedDict, deque
+
+from starlette.routing import Match
+
+from app import metrics
+
+LIST_ROUTES = {
+    "/categories/", "/books/", "/books/search", "/loans/", "/loans/details", "/loans/history",
+    "/stats/categories",
+}
+# Gövdesinde birçok değer taşıyan, yazma yapmayan POST'lar
+LIST_POSTS = {"/books/lookup"}
+EXPORT_PREFIX = "/export/"
+READ_METHODS = ("GET", "HEAD")
+# Yönetim ve dokümantasyon yolları yük altında da erişilebilir kalır; uzun ömürlü
+# olay akışı route kapısını süresiz tutmasın diye abone sınırıyla korunur
+EXEMPT_PATHS = ("/metrics", "/docs", "/redoc", "/openapi.json", "/events")
+
+# Sınıf başına (route başına eşzamanlılık, kuyruk uzunluğu, en fazla bekleme sn,
+# reddedilmeye başlandığı toplam yük oranı, token bucket maliyeti)
+DEFAULT_POLICIES = {
+    "export": (2, 0, 0.0, 0.5, 10),
+    "list": (16, 32, 1.0, 0.75, 2),
+    "write": (32, 64, 2.0, 1.0, 1),
+    "read": (64, 128, 2.0, 1.0, 1),
+}
+
+ADMISSION_MAX_IN_FLIGHT = int(os.getenv("LIBRARY_ADMISSION_MAX_IN_FLIGHT", "100"))
+# Sınıf sınırları ortam değişkenleriyle ezilebilir (ör. LIBRARY_ADMISSION_LIST_CONCURRENCY=8)
+ADMISSION_POLICIES = {
+    cost_class: (
+        int(os.getenv(f"LIBRARY_ADMISSION_{cost_class.upper()}_CONCURRENCY", str(concurrency))),
+        int(os.getenv(f"LIBRARY_ADMISSION_{cost_class.upper()}_QUEUE", str(queue))),
+        float(os.getenv(f"LIBRARY_ADMISSION_{cost_class.upper()}_MAX_WAIT", str(max_wait))),
+        shed_ratio,
+        cost,
+    )
+    for cost_class, (concurrency, queue, max_wait, shed_ratio, cost) in DEFAULT_POLICIES.items()
+}
+# İstemci başına saniyedeki token sayısı; 0 hız sınırını kapatır
+RATE_LIMIT_PER_SECOND = float(os.getenv("LIBRARY_RATE_LIMIT_PER_SECOND", "0"))
+RATE_LIMIT_BURST = float(os.getenv("LIBRARY_RATE_LIMIT_BURST", str(max(RATE_LIMIT_PER_SECOND * 2, 20))))
+RETRY_AFTER_SECONDS = 1
+
+
+def cost_class(method: str, path: str) -> str:
+    """
+    Route şablonuna göre isteğin maliyet sınıfı.
+    """
+    if path.startswith(EXPORT_PREFIX):
+        return "export"
+    if method == "POST" and path in LIST_POSTS:
+        return "list"
+    if method not in READ_METHODS:
+        return "write"
+    if path in LIST_ROUTES:
+        return "list"
+    return "read"
+
+
+class ConcurrencyGate:
+    """
+    En fazla `limit` isteğin aynı anda çalışmasına izin veren, sınırlı FIFO
+    kuyruklu kapı. Boşalan yer doğrudan kuyruktaki ilk isteğe devredilir.
+    """
+
+    def __init__(self, limit: int, max_queue: int, max_wait: float):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.active = 0
+        self.waiters = deque()
+
+    async def acquire(self) -> bool:
+        if self.active < self.limit and not self.waiters:
+            self.active += 1
+            return True
+        if len(self.waiters) >= self.max_queue or self.max_wait <= 0:
+            return False
+
+        future = asyncio.get_running_loop().create_future()
+        self.waiters.append(future)
+        try:
+            await asyncio.wait_for(future, self.max_wait)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        except asyncio.CancelledError:
+            # Yer devredildikten sonra iptal edildiyse yer bir sonrakine aktarılır
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+        finally:
+            if future in self.waiters:
+                self.waiters.remove(future)
+
+    def release(self) -> None:
+        while self.waiters:
+            future = self.waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+                return
+        self.active -= 1
+
+
+class TokenBuckets:
+    """
+    İstemci başına token bucket. En son görülen `max_clients` istemci tutulur.
+    """
+
+    def __init__(self, rate: float, burst: float, max_clients: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets = OrderedDict()
+
+    def take(self, client: str, cost: float, now: float = None) -> float:
+        """
+        Yeterli token varsa düşer ve 0 döndürür; yoksa gereken bekleme süresini (sn).
+        """
+        now = time.monotonic() if now is None else now
+        tokens, updated = self._buckets.pop(client, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        wait = 0.0
+        if tokens >= cost:
+            tokens -= cost
+        else:
+            wait = (cost - tokens) / self.rate
+        self._buckets[client] = (tokens, now)
+        while len(self._buckets) > self.max_clients:
+            self._buckets.popitem(last=False)
+        return wait
+
+
+def _match_route(scope):
+    for route in scope["app"].router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route
+    return None
+
+
+async def _reject(send, status_code: int, detail: str, retry_after: float) -> None:
+    body = json.dumps({"detail": detail}, ensure_ascii=False).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status_code,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode("latin-1")),
+            (b"retry-after", str(max(math.ceil(retry_after), 1)).encode("latin-1")),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class AdmissionMiddleware:
+    """
+    Route bazında eşzamanlılık sınırı, istemci başına hız sınırı ve yük
+    altında maliyet sınıfına göre öncelikli reddetme uygulayan ASGI middleware'i.
+    """
+
+    def __init__(self, app, max_in_flight: int = ADMISSION_MAX_IN_FLIGHT, policies: dict = None,
+                 rate: float = RATE_LIMIT_PER_SECOND, burst: float = RATE_LIMIT_BURST):
+        self.app = app
+        self.max_in_flight = max_in_flight
+        self.policies = ADMISSION_POLICIES if policies is None else policies
+        self.buckets = TokenBuckets(rate, burst) if rate > 0 else None
+        self.gates = {}
+        self.in_flight = 0
+
+    def _gate(self, key: tuple, cost_class: str) -> ConcurrencyGate:
+        gate = self.gates.get(key)
+        if gate is None:
+            limit, max_queue, max_wait, _, _ = self.policies[cost_class]
+            gate = self.gates[key] = ConcurrencyGate(limit, max_queue, max_wait)
+        return gate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = _match_route(scope)
+        if route is not None:
+            # Reddedilen istekler de metriklerde route şablonuyla etiketlenir
+            scope["route"] = route
+        path = route.path if route is not None else "unmatched"
+        request_class = cost_class(method, path)
+        _, _, _, shed_ratio, cost = self.policies[request_class]
+
+        if self.buckets is not None:
+            client = scope["client"][0] if scope.get("client") else "anonymous"
+            wait = self.buckets.take(client, cost)
+            if wait:
+                metrics.REQUESTS_SHED.inc(request_class, "rate_limit")
+                await _reject(send, 429, "İstek sınırı aşıldı, lütfen daha sonra tekrar deneyin", wait)
+                return
+
+        # Toplam yük sınıfın eşiğini aştıysa pahalı istekler kuyruğa girmeden reddedilir
+        if self.in_flight >= self.max_in_flight * shed_ratio:
+            metrics.REQUESTS_SHED.inc(request_class, "overload")
+            await _reject(send, 503, "Sunucu yoğun, lütfen daha sonra tekrar deneyin", RETRY_AFTER_SECONDS)
+            return
+
+        gate = self._gate((method, path), request_class)
+        if not await gate.acquire():
+            metrics.REQUESTS_SHED.inc(request_class, "queue")
+            await _reject(send, 503, "Sunucu yoğun, lütfen daha sonra tekrar deneyin", RETRY_AFTER_SECONDS)
+            return
+
+        self.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
+            gate.release()
@@ -0,0 +1,113 @@
+import argparse
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, insert, literal, select
+from sqlalchemy.schema import CreateTable
+from sqlalchemy.orm import Session
+
+from app import models
+
+# Bir transaction'da arşive taşınacak en fazla ödünç kaydı; yazma kilidi kısa tutulur
+ARCHIVE_BATCH_SIZE = int(os.getenv("LIBRARY_ARCHIVE_BATCH_SIZE", "1000"))
+
+HISTORY_COLUMNS = ["id", "book_id", "borrower_name", "loan_date", "return_date", "archived_at"]
+
+
+def ensure_loan_id_sequence(engine) -> None:
+    """
+    Arşivlenen ödünçler loan_history'ye özgün id'leriyle taşındığından loans
+    id'leri yeniden kullanılmamalıdır. AUTOINCREMENT olmadan oluşturulmuş
+    mevcut bir loans tablosunu yeniden kurar (indeksleri `create_missing_indexes`
+    tamamlar) ve id sayacını arşivdeki en büyük id'nin altına düşmeyecek
+    şekilde ayarlar.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    table = models.Loan.__table__
+    columns = ", ".join(column.name for column in table.columns)
+    with engine.begin() as conn:
+        table_sql = conn.exec_driver_sql(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'loans'"
+        ).scalar()
+        if "AUTOINCREMENT" not in table_sql.upper():
+            create_sql = str(CreateTable(table).compile(dialect=engine.dialect))
+            conn.exec_driver_sql(create_sql.replace("CREATE TABLE loans", "CREATE TABLE loans_autoincrement", 1))
+            conn.exec_driver_sql(f"INSERT INTO loans_autoincrement ({columns}) SELECT {columns} FROM loans")
+            conn.exec_driver_sql("DROP TABLE loans")
+            conn.exec_driver_sql("ALTER TABLE loans_autoincrement RENAME TO loans")
+
+        history_max = conn.exec_driver_sql("SELECT max(id) FROM loan_history").scalar() or 0
+        sequence = conn.exec_driver_sql("SELECT seq FROM sqlite_sequence WHERE name = 'loans'").scalar()
+        if sequence is None and history_max:
+            conn.exec_driver_sql("INSERT INTO sqlite_sequence (name, seq) VALUES ('loans', ?)", (history_max,))
+        elif sequence is not None and history_max > sequence:
+            conn.exec_driver_sql("UPDATE sqlite_sequence SET seq = ? WHERE name = 'loans'", (history_max,))
+
+
+def archive_returned_loans(db: Session, older_than_days: int, batch_size: int = ARCHIVE_BATCH_SIZE,
+                           max_batches: Optional[int] = None) -> dict:
+    """
+    `older_than_days` günden daha önce iade edilmiş ödünçleri loans
+    tablosundan loan_history tablosuna taşır.
+
+    Kayıtlar en fazla `batch_size` satırlık partiler halinde, her parti kendi
+    transaction'ında INSERT ... SELECT ve DELETE ile taşınır; böylece uzun süre
+    yazma kilidi tutulmaz ve iş kesilirse kaldığı yerden devam edilebilir.
+    İstatistik sayaçları değişmez, arşivlenen ödünçler toplamlarda kalır.
+    """
+    cutoff = datetime.now() - timedelta(days=older_than_days)
+    archived = batches = 0
+    while max_batches is None or batches < max_batches:
+        # loan_date <= return_date olduğundan loan_date koşulu
+        # (is_returned, loan_date) indeksiyle aralığı daraltır
+        ids = db.scalars(
+            select(models.Loan.id)
+            .where(
+                models.Loan.is_returned == True,
+                models.Loan.loan_date < cutoff,
+                models.Loan.return_date < cutoff,
+            )
+            .order_by(models.Loan.loan_date, models.Loan.id)
+            .limit(batch_size)
+        ).all()
+        if not ids:
+            break
+        archived_at = datetime.now()
+        db.execute(insert(models.LoanHistory).from_select(
+            HISTORY_COLUMNS,
+            select(
+                models.Loan.id, models.Loan.book_id, models.Loan.borrower_name,
+                models.Loan.loan_date, models.Loan.return_date, literal(archived_at),
+            ).where(models.Loan.id.in_(ids)),
+        ))
+        db.execute(delete(models.Loan).where(models.Loan.id.in_(ids)).execution_options(synchronize_session=False))
+        db.commit()
+        archived += len(ids)
+        batches += 1
+        if len(ids) < batch_size:
+            break
+    return {"archived": archived, "batches": batches, "cutoff": cutoff}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="İade edilmiş eski ödünçleri loan_history tablosuna taşır")
+    parser.add_argument("--older-than-days", type=int, default=365, help="Bu kadar günden önce iade edilenler")
+    parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE)
+    parser.add_argument("--max-batches", type=int, help="Çalıştırılacak en fazla parti sayısı")
+    args = parser.parse_args()
+
+    from app.database import create_db_engine
+    from app.settings import Settings
+
+    # Şemanın `python -m app.migrate` ile kurulmuş olduğu varsayılır
+    engine = create_db_engine(Settings.from_env())
+    with Session(engine) as db:
+        result = archive_returned_loans(db, args.older_than_days, args.batch_size, args.max_batches)
+    engine.dispose()
+    print(f"{result['archived']} ödünç kaydı {result['batches']} partide arşivlendi")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,328 @@
+import json
+import re
+from datetime import datetime
+from typing import List
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app import models, schemas, stats
+
+# Tek transaction içinde eklenecek satır sayısı
+BULK_CHUNK_SIZE = 1000
+# Tek bir IN listesine konacak en fazla değer; eski SQLite sürümlerinin 999
+# parametre sınırının altında kalır
+IN_CHUNK_SIZE = 500
+
+
+def parse_bulk_payload(body: bytes, content_type: str) -> list:
+    """
+    İstek gövdesini JSON dizisi ya da NDJSON olarak ham satırlara ayırır.
+    Gövdenin kendisi çözümlenemiyorsa ValueError fırlatır.
+    """
+    if "ndjson" in content_type or "jsonl" in content_type:
+        rows = []
+        for line in body.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rows.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                # Bozuk satır tüm yüklemeyi bozmasın, satır hatası olarak raporlanır
+                rows.append(e)
+        return rows
+
+    rows = json.loads(body)
+    if not isinstance(rows, list):
+        raise ValueError("Gövde bir JSON dizisi olmalıdır")
+    return rows
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in error.errors()
+    )
+
+
+def bulk_create_books(db: Session, rows: list, chunk_size: int = BULK_CHUNK_SIZE) -> schemas.BulkBookResponse:
+    """
+    Kitapları parçalar halinde toplu ekler.
+
+    Tüm satırlar önce doğrulanır; ardından her parça için mevcut ISBN'ler ve
+    kategoriler tek bir IN sorgusuyla kontrol edilir, geçerli satırlar tek bir
+    executemany ile eklenir ve parça başına bir commit yapılır. Hatalı satırlar
+    yüklemeyi durdurmaz, sonuç listesinde satır numarasıyla raporlanır.
+    """
+    results: List[schemas.BulkBookResult] = [None] * len(rows)
+    valid = []
+    seen_isbns = set()
+
+    for index, raw in enumerate(rows):
+        if isinstance(raw, Exception):
+            results[index] = schemas.BulkBookResult(index=index, status="error", error=f"Geçersiz JSON: {raw}")
+            continue
+        try:
+            book = schemas.BookCreate.model_validate(raw)
+        except ValidationError as e:
+            results[index] = schemas.BulkBookResult(index=index, status="error", error=_format_validation_error(e))
+            continue
+        if book.isbn in seen_isbns:
+            results[index] = schemas.BulkBookResult(
+                index=index, status="error", isbn=book.isbn, error="ISBN bu yüklemede tekrar ediyor"
+            )
+            continue
+        seen_isbns.add(book.isbn)
+        valid.append((index, book))
+
+    for start in range(0, len(valid), chunk_size):
+        chunk = valid[start:start + chunk_size]
+        for index, result in _insert_chunk(db, chunk):
+            results[index] = result
+
+    created = sum(1 for result in results if result.status == "created")
+    return schemas.BulkBookResponse(created=created, failed=len(results) - created, results=results)
+
+
+def _insert_chunk(db: Session, chunk: list):
+    isbns = [book.isbn for _, book in chunk]
+    category_ids = {book.category_id for _, book in chunk}
+    existing_isbns = set(db.scalars(select(models.Book.isbn).where(models.Book.isbn.in_(isbns))))
+    existing_categories = set(
+        db.scalars(select(models.Category.id).where(models.Category.id.in_(category_ids)))
+    )
+
+    to_insert = []
+    for index, book in chunk:
+        if book.isbn in existing_isbns:
+            yield index, schemas.BulkBookResult(index=index, status="error", isbn=book.isbn, error="ISBN zaten kayıtlı")
+        elif book.category_id not in existing_categories:
+            yield index, schemas.BulkBookResult(index=index, status="error", isbn=book.isbn, error="Kategori bulunamadı")
+        else:
+            to_insert.append((index, book))
+
+    if not to_insert:
+        return
+
+    params = [{**book.model_dump(), "available": True} for _, book in to_insert]
+    try:
+        ids = db.scalars(
+            insert(models.Book).returning(models.Book.id, sort_by_parameter_order=True), params
+        ).all()
+        stats.books_added(db, [book.category_id for _, book in to_insert])
+        db.commit()
+    except IntegrityError:
+        # Kontrol ile ekleme arasında başka bir istek aynı ISBN'i eklemiş olabilir;
+        # parçayı satır satır (savepoint ile) yeniden deneriz.
+        db.rollback()
+        yield from _insert_one_by_one(db, to_insert)
+        return
+
+    for (index, book), book_id in zip(to_insert, ids):
+        yield index, schemas.BulkBookResult(index=index, status="created", id=book_id, isbn=book.isbn)
+
+
+def _insert_one_by_one(db: Session, rows: list):
+    created_category_ids = []
+    for index, book in rows:
+        try:
+            with db.begin_nested():
+                db_book = models.Book(**book.model_dump(), available=True)
+                db.add(db_book)
+            created_category_ids.append(book.category_id)
+            yield index, schemas.BulkBookResult(index=index, status="created", id=db_book.id, isbn=book.isbn)
+        except IntegrityError:
+            yield index, schemas.BulkBookResult(index=index, status="error", isbn=book.isbn, error="ISBN zaten kayıtlı")
+    stats.books_added(db, created_category_ids)
+    db.commit()
+
+
+def _chunks(values: list, chunk_size: int):
+    for start in range(0, len(values), chunk_size):
+        yield values[start:start + chunk_size]
+
+
+def _existing_ids(db: Session, column, values: list, chunk_size: int) -> set:
+    existing = set()
+    for chunk in _chunks(values, chunk_size):
+        existing.update(db.scalars(select(column).where(column.in_(chunk))))
+    return existing
+
+
+def bulk_checkout(db: Session, request: schemas.BulkLoanCreate,
+                  chunk_size: int = IN_CHUNK_SIZE) -> schemas.BulkLoanResponse:
+    """
+    Bir sepetteki kitapları tek transaction'da ödünç verir.
+
+    Müsait kitaplar parça başına bir koşullu UPDATE ... RETURNING ile
+    işaretlenir (eşzamanlı isteklere karşı güvenli), ödünç kayıtları tek bir
+    executemany ile eklenir. Başarısız kalemler için varlık kontrolü de parça
+    başına bir IN sorgusudur.
+    """
+    book_ids = list(dict.fromkeys(request.book_ids))
+    checked_out_rows = []
+    for chunk in _chunks(book_ids, chunk_size):
+        checked_out_rows.extend(db.execute(
+            update(models.Book)
+            .where(models.Book.id.in_(chunk), models.Book.available == True)
+            .values(available=False)
+            .returning(models.Book.id, models.Book.author, models.Book.category_id)
+            .execution_options(synchronize_session=False)
+        ).all())
+    checked_out = {row.id for row in checked_out_rows}
+
+    failed = [book_id for book_id in book_ids if book_id not in checked_out]
+    existing = _existing_ids(db, models.Book.id, failed, chunk_size)
+
+    loan_ids = {}
+    to_loan = [book_id for book_id in book_ids if book_id in checked_out]
+    if to_loan:
+        loan_date = datetime.now()
+        rows = db.execute(
+            insert(models.Loan).returning(models.Loan.id, models.Loan.book_id, sort_by_parameter_order=True),
+            [
+                {"book_id": book_id, "borrower_name": request.borrower_name, "loan_date": loan_date, "is_returned": False}
+                for book_id in to_loan
+            ],
+        )
+        loan_ids = {book_id: loan_id for loan_id, book_id in rows}
+        stats.loans_created(db, [tuple(row) for row in checked_out_rows])
+    db.commit()
+
+    results = []
+    seen = set()
+    for book_id in request.book_ids:
+        if book_id in seen:
+            results.append(schemas.BulkLoanResult(book_id=book_id, status="error", error="Kitap sepette tekrar ediyor"))
+        elif book_id in loan_ids:
+            results.append(schemas.BulkLoanResult(book_id=book_id, status="loaned", loan_id=loan_ids[book_id]))
+        elif book_id in existing:
+            results.append(schemas.BulkLoanResult(book_id=book_id, status="error", error="Kitap şu anda ödünç verilemez"))
+        else:
+            results.append(schemas.BulkLoanResult(book_id=book_id, status="error", error="Kitap bulunamadı"))
+        seen.add(book_id)
+
+    succeeded = len(loan_ids)
+    return schemas.BulkLoanResponse(succeeded=succeeded, failed=len(results) - succeeded, results=results)
+
+
+def bulk_return(db: Session, request: schemas.BulkLoanReturn,
+                chunk_size: int = IN_CHUNK_SIZE) -> schemas.BulkReturnResponse:
+    """
+    Ödünç kayıtlarını tek transaction'da iade eder.
+
+    İade edilmemiş kayıtlar parça başına bir koşullu UPDATE ... RETURNING ile
+    kapatılır, ilgili kitaplar parça başına bir set tabanlı UPDATE ile müsait
+    yapılır.
+    """
+    loan_ids = list(dict.fromkeys(request.loan_ids))
+    return_date = datetime.now()
+    returned_rows = []
+    for chunk in _chunks(loan_ids, chunk_size):
+        returned_rows.extend(db.execute(
+            update(models.Loan)
+            .where(models.Loan.id.in_(chunk), models.Loan.is_returned == False)
+            .values(is_returned=True, return_date=return_date)
+            .returning(models.Loan.id, models.Loan.book_id, models.Loan.loan_date)
+            .execution_options(synchronize_session=False)
+        ).all())
+    returned = {row.id: row.book_id for row in returned_rows}
+
+    if returned:
+        released = []
+        for chunk in _chunks(list(set(returned.values())), chunk_size):
+            released.extend(db.scalars(
+                update(models.Book)
+                .where(models.Book.id.in_(chunk))
+                .values(available=True)
+                .returning(models.Book.category_id)
+                .execution_options(synchronize_session=False)
+            ).all())
+        stats.loans_returned(
+            db, [(return_date - row.loan_date).total_seconds() for row in returned_rows], released
+        )
+
+    failed = [loan_id for loan_id in loan_ids if loan_id not in returned]
+    existing = _existing_ids(db, models.Loan.id, failed, chunk_size)
+    db.commit()
+
+    results = []
+    seen = set()
+    for loan_id in request.loan_ids:
+        if loan_id in seen:
+            results.append(schemas.BulkReturnResult(loan_id=loan_id, status="error", error="Ödünç kaydı listede tekrar ediyor"))
+        elif loan_id in returned:
+            results.append(schemas.BulkReturnResult(loan_id=loan_id, status="returned", book_id=returned[loan_id]))
+        elif loan_id in existing:
+            results.append(schemas.BulkReturnResult(loan_id=loan_id, status="error", error="Bu kitap zaten iade edilmiş"))
+        else:
+            results.append(schemas.BulkReturnResult(loan_id=loan_id, status="error", error="Ödünç kaydı bulunamadı"))
+        seen.add(loan_id)
+
+    succeeded = len(returned)
+    return schemas.BulkReturnResponse(succeeded=succeeded, failed=len(results) - succeeded, results=results)
+
+
+def _isbn10_check_digit(digits: str) -> str:
+    check = (11 - sum((10 - i) * int(d) for i, d in enumerate(digits)) % 11) % 11
+    return "X" if check == 10 else str(check)
+
+
+def _isbn13_check_digit(digits: str) -> str:
+    return str((10 - sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(digits)) % 10) % 10)
+
+
+def isbn_variants(value: str) -> tuple:
+    """
+    ISBN'in normalize edilmiş hali ve diğer biçimdeki karşılığı (ISBN-10 ↔
+    978 önekli ISBN-13). Geçersiz biçimde boş tuple döner.
+    """
+    isbn = schemas.normalize_isbn(value)
+    if not re.match(schemas.ISBN_PATTERN, isbn):
+        return ()
+    if len(isbn) == 10:
+        prefix = "978" + isbn[:9]
+        return (isbn, prefix + _isbn13_check_digit(prefix))
+    if isbn.startswith("978"):
+        return (isbn, isbn[3:12] + _isbn10_check_digit(isbn[3:12]))
+    return (isbn,)
+
+
+def _fetch_in_chunks(db: Session, column, values: list, chunk_size: int) -> list:
+    books = []
+    for chunk in _chunks(values, chunk_size):
+        books.extend(db.scalars(select(models.Book).where(column.in_(chunk))))
+    return books
+
+
+def bulk_lookup_books(db: Session, request: schemas.BookLookup,
+                      chunk_size: int = IN_CHUNK_SIZE) -> schemas.BookLookupResponse:
+    """
+    Kitapları id ve ISBN listeleriyle toplu sorgular.
+
+    Değerler tekilleştirilip parça başına tek bir `IN` sorgusuyla (birincil
+    anahtar ve benzersiz `isbn` indeksi üzerinden) okunur. ISBN'ler hem
+    gönderilen hem de diğer biçimleriyle aranır; sonuçlar gönderilen değerle
+    anahtarlanır.
+    """
+    ids = list(dict.fromkeys(request.ids))
+    by_id = {book.id: book for book in _fetch_in_chunks(db, models.Book.id, ids, chunk_size)}
+
+    variants = {value: isbn_variants(value) for value in dict.fromkeys(request.isbns)}
+    candidates = list(dict.fromkeys(isbn for isbns in variants.values() for isbn in isbns))
+    by_isbn = {book.isbn: book for book in _fetch_in_chunks(db, models.Book.isbn, candidates, chunk_size)}
+
+    id_results = {book_id: by_id.get(book_id) for book_id in ids}
+    isbn_results = {
+        value: next((by_isbn[isbn] for isbn in isbns if isbn in by_isbn), None)
+        for value, isbns in variants.items()
+    }
+    found = sum(book is not None for book in [*id_results.values(), *isbn_results.values()])
+    return schemas.BookLookupResponse(
+        found=found,
+        missing=len(id_results) + len(isbn_results) - found,
+        ids=id_results,
+        isbns=isbn_results,
+    )
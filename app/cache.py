@@ -0,0 +1,236 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from typing import NamedTuple
+
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app import models
+from app.database import get_async_db, get_db
+
+
+class CacheEntry(NamedTuple):
+    body: bytes
+    etag: str
+    headers: dict
+    expires_at: float
+
+
+class ResponseCache:
+    """
+    Serileştirilmiş JSON yanıtları için sınırlı boyutlu LRU/TTL önbellek.
+
+    Girdiler (isim alanı, anahtar) çiftiyle tutulur. Bir isim alanının tamamı
+    nesil sayacı artırılarak O(1)'de geçersiz kılınır; eski nesle ait girdiler
+    bir daha okunmaz ve LRU sırasıyla dışarı atılır.
+
+    Veritabanından okuyup önbelleğe yazan endpoint'ler okumadan önce `token`
+    alır ve `set`'e verir; okuma sırasında isim alanında bir geçersiz kılma
+    olduysa eski okuma önbelleğe yazılmaz.
+
+    Replikadan okunan yanıtlar (`replica=True`) birincilden okunanlardan ayrı
+    tutulur. Yazmadan sonra birincilden okuyan istemciler replikanın geride
+    kalmış kopyasını görmez.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._generations = {}
+        self._invalidations = {}
+        self._lock = threading.Lock()
+
+    def _key(self, namespace: str, key, replica: bool):
+        return (namespace, replica, self._generations.get(namespace, 0), key)
+
+    def get(self, namespace: str, key, replica: bool = False):
+        with self._lock:
+            full_key = self._key(namespace, key, replica)
+            entry = self._entries.get(full_key)
+            if entry is None or entry.expires_at < time.monotonic():
+                if entry is not None:
+                    del self._entries[full_key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(full_key)
+            self.hits += 1
+            return entry
+
+    def token(self, namespace: str) -> int:
+        """
+        İsim alanındaki geçersiz kılma sayacı; veritabanı okumasından önce alınır.
+        """
+        with self._lock:
+            return self._invalidations.get(namespace, 0)
+
+    def set(self, namespace: str, key, body: bytes, headers: dict = None, token: int = None,
+            replica: bool = False) -> CacheEntry:
+        entry = CacheEntry(
+            body=body,
+            etag=f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"',
+            headers=headers or {},
+            expires_at=time.monotonic() + self.ttl,
+        )
+        if self.maxsize <= 0:
+            return entry
+        with self._lock:
+            if token is not None and token != self._invalidations.get(namespace, 0):
+                # Okuma eşzamanlı bir yazmadan önce yapılmış olabilir; yanıt yine döner
+                return entry
+            full_key = self._key(namespace, key, replica)
+            self._entries[full_key] = entry
+            self._entries.move_to_end(full_key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, namespace: str, key=None) -> None:
+        """
+        Anahtar verilirse yalnızca o girdiyi, verilmezse isim alanının tamamını siler.
+        """
+        with self._lock:
+            self._invalidations[namespace] = self._invalidations.get(namespace, 0) + 1
+            if key is None:
+                self._generations[namespace] = self._generations.get(namespace, 0) + 1
+            else:
+                for replica in (False, True):
+                    self._entries.pop(self._key(namespace, key, replica), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+            self._invalidations.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+            }
+
+
+def collection_validators(db: Session, tables: tuple, key: str) -> tuple:
+    """
+    Koleksiyon yanıtı için (zayıf ETag, Last-Modified zaman damgası) döndürür.
+
+    Değerler yanıt gövdesiyle aynı oturumdan okunan `table_versions`
+    satırlarından türetilir; böylece tüm işçiler aynı ETag'i üretir ve
+    replikadan sunulan bir yanıtın doğrulayıcıları replikadaki veriyle
+    eşleşir. Sürümler gövdeden önce okunduğundan arada yapılan bir yazma
+    en fazla gereksiz bir tam yanıta yol açar. Sürüm satırı olmayan bir
+    tablo varsa Last-Modified None döner. `key` aynı tablolardan okunan
+    farklı istekleri (yol, sorgu) ayırır.
+    """
+    rows = {
+        name: (version, modified_at)
+        for name, version, modified_at in db.execute(
+            select(models.TableVersion.table_name, models.TableVersion.version, models.TableVersion.modified_at)
+            .where(models.TableVersion.table_name.in_(tables))
+        )
+    }
+    state = tuple(rows.get(table) for table in tables)
+    digest = hashlib.blake2b(f"{state}:{key}".encode(), digest_size=12).hexdigest()
+    modified = max(row[1] for row in rows.values()) if len(rows) == len(tables) else None
+    return f'W/"{digest}"', modified
+
+
+def _strip_weak(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    If-None-Match başlığının verilen ETag'i (zayıf karşılaştırmayla) içerip içermediğini kontrol eder.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {_strip_weak(tag.strip()) for tag in header.split(",")}
+    return _strip_weak(etag) in candidates
+
+
+def not_modified_since(request: Request, modified: float) -> bool:
+    """
+    If-Modified-Since başlığı verilmişse ve kaynak o tarihten sonra (saniye
+    çözünürlüğünde) değişmemişse True döner.
+    """
+    header = request.headers.get("if-modified-since")
+    if not header:
+        return False
+    try:
+        since = parsedate_to_datetime(header).timestamp()
+    except (TypeError, ValueError):
+        return False
+    return int(modified) <= since
+
+
+def _apply_validators(request: Request, response: Response, etag: str, modified) -> dict:
+    headers = {"ETag": etag}
+    if modified is not None:
+        headers["Last-Modified"] = formatdate(modified, usegmt=True)
+    # If-None-Match verilmişse If-Modified-Since yok sayılır (RFC 9110)
+    if request.headers.get("if-none-match") is not None:
+        fresh = etag_matches(request, etag)
+    else:
+        fresh = modified is not None and not_modified_since(request, modified)
+    if fresh:
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return headers
+
+
+def conditional_get(*tables: str):
+    """
+    Koleksiyon endpoint'leri için bağımlılık üretir: istek If-None-Match ya da
+    If-Modified-Since ile güncel bir kopyayı işaret ediyorsa yalnızca tablo
+    sürümleri okunarak (liste sorgusu çalıştırılmadan) 304 döner; aksi halde
+    ETag ve Last-Modified başlıklarını yanıta ekler ve (doğrudan Response
+    döndüren yollar için) sözlük olarak verir.
+
+    Async modda AsyncSessionRoute bağımlılığı `async_variant` ile değiştirir;
+    sürümler endpoint'in kullandığı aynı async oturumdan okunur.
+    """
+    def dependency(request: Request, response: Response, db: Session = Depends(get_db)) -> dict:
+        validators = collection_validators(db, tables, f"{request.url.path}?{request.url.query}")
+        return _apply_validators(request, response, *validators)
+
+    async def async_dependency(request: Request, response: Response,
+                               db: AsyncSession = Depends(get_async_db)) -> dict:
+        validators = await db.run_sync(collection_validators, tables, f"{request.url.path}?{request.url.query}")
+        return _apply_validators(request, response, *validators)
+
+    dependency.async_variant = async_dependency
+    return dependency
+
+
+def cached_response(request: Request, entry: CacheEntry) -> Response:
+    """
+    Önbellek girdisinden yanıt üretir; istemcideki kopya güncelse gövdesiz 304 döner.
+    """
+    headers = {"ETag": entry.etag, **entry.headers}
+    if etag_matches(request, entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+response_cache = ResponseCache(
+    maxsize=int(os.getenv("LIBRARY_CACHE_MAXSIZE", "1024")),
+    ttl=float(os.getenv("LIBRARY_CACHE_TTL", "60")),
+)
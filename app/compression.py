@@ -0,0 +1,154 @@
+import os
+import zlib
+
+try:
+    import brotli
+except ImportError:  # brotli opsiyoneldir; yoksa yalnızca gzip sunulur
+    brotli = None
+
+# Bu boyutun (bayt) altındaki yanıtlar sıkıştırılmaz
+COMPRESSION_MIN_SIZE = int(os.getenv("LIBRARY_COMPRESSION_MIN_SIZE", "1024"))
+# Tercih sırasına göre sunulan kodlamalar; boş bırakılırsa sıkıştırma kapanır
+COMPRESSION_ENCODINGS = [
+    encoding.strip() for encoding in os.getenv("LIBRARY_COMPRESSION", "br,gzip").split(",") if encoding.strip()
+]
+GZIP_LEVEL = int(os.getenv("LIBRARY_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("LIBRARY_BROTLI_QUALITY", "4"))
+
+# Zaten sıkıştırılmış ya da akışın parça parça iletilmesi gereken içerikler
+SKIPPED_CONTENT_TYPES = ("application/gzip", "application/zip", "image/", "audio/", "video/", "text/event-stream")
+
+
+class _GzipCompressor:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        # Akışta her parça istemciye hemen ulaşsın diye senkron flush yapılır
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class _BrotliCompressor:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+def available_encodings(encodings: list) -> list:
+    return [encoding for encoding in encodings if encoding == "gzip" or (encoding == "br" and brotli is not None)]
+
+
+def choose_encoding(accept_encoding: str, encodings: list):
+    """
+    Accept-Encoding başlığına göre sunucunun tercih sırasındaki ilk uygun
+    kodlamayı döndürür (q=0 ile reddedilenler atlanır); yoksa None.
+    """
+    accepted = set()
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip().lower())
+    for encoding in encodings:
+        if encoding in accepted or "*" in accepted:
+            return encoding
+    return None
+
+
+class CompressionMiddleware:
+    """
+    İstemcinin Accept-Encoding başlığına göre yanıtları brotli ya da gzip ile
+    sıkıştıran ASGI middleware'i. Tek parça yanıtlar `minimum_size`
+    baytın altındaysa olduğu gibi gönderilir; akış yanıtları parça parça
+    sıkıştırılır. Zaten kodlanmış ya da sıkıştırılmış içerikler atlanır.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE, encodings: list = None,
+                 gzip_level: int = GZIP_LEVEL, brotli_quality: int = BROTLI_QUALITY):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encodings = available_encodings(COMPRESSION_ENCODINGS if encodings is None else encodings)
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def _compressor(self, encoding: str):
+        if encoding == "br":
+            return _BrotliCompressor(self.brotli_quality)
+        return _GzipCompressor(self.gzip_level)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.encodings:
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+        encoding = choose_encoding(accept_encoding, self.encodings)
+
+        start_message = None
+        compressor = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                headers = dict(start_message["headers"])
+                content_type = headers.get(b"content-type", b"").decode("latin-1")
+                compressible = b"content-encoding" not in headers and not content_type.startswith(SKIPPED_CONTENT_TYPES)
+                if compressible:
+                    _append_vary(start_message)
+                if (not compressible or encoding is None
+                        or (not more_body and len(body) < self.minimum_size)):
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                compressor = self._compressor(encoding)
+                raw_headers = [
+                    (name, value) for name, value in start_message["headers"] if name != b"content-length"
+                ]
+                raw_headers.append((b"content-encoding", encoding.encode("latin-1")))
+                if not more_body:
+                    body = compressor.finish(body)
+                    raw_headers.append((b"content-length", str(len(body)).encode("latin-1")))
+                    await send({**start_message, "headers": raw_headers})
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                await send({**start_message, "headers": raw_headers})
+
+            chunk = compressor.compress(body) if more_body else compressor.finish(body)
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def _append_vary(start_message: dict) -> None:
+    headers = list(start_message["headers"])
+    for i, (name, value) in enumerate(headers):
+        if name == b"vary":
+            if b"accept-encoding" not in value.lower():
+                headers[i] = (name, value + b", Accept-Encoding")
+            break
+    else:
+        headers.append((b"vary", b"Accept-Encoding"))
+    start_message["headers"] = headers
\ No newline at end of file
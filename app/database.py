@@ -1,19 +1,298 @@
-from sqlalchemy import create_engine
+import functools
+import inspect
+import itertools
+import os
+from dataclasses import replace
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.routing import APIRoute
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./library.db"
+from app.replicas import uses_replica
+from app.settings import Settings
+
+# SQLite bağlantı profilleri. "default" SQLite'ın kendi ayarlarını kullanır;
+# "production" WAL ile okuyucuların yazıcıları beklemesini önler ve commit
+# başına tam fsync yerine checkpoint'lerde fsync yapar.
+SQLITE_PROFILES = {
+    "default": {},
+    "production": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,
+        "cache_size": -64000,  # negatif değer KiB cinsindendir (~64 MB)
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+    },
+}
+
+def sqlite_pragmas(profile: str = "default") -> dict:
+    """
+    Profilin pragma'larını döndürür; her pragma LIBRARY_SQLITE_<PRAGMA>
+    ortam değişkeniyle ayrıca ezilebilir (ör. LIBRARY_SQLITE_BUSY_TIMEOUT=10000).
+    """
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Bilinmeyen SQLite profili: {profile}")
+    pragmas = dict(SQLITE_PROFILES[profile])
+    for name in SQLITE_PROFILES["production"]:
+        override = os.getenv(f"LIBRARY_SQLITE_{name.upper()}")
+        if override is not None:
+            pragmas[name] = override
+    return pragmas
+
+def set_sqlite_pragmas(engine, pragmas: dict) -> None:
+    """
+    Havuzdaki her yeni bağlantı açıldığında pragma'ları uygular.
+    """
+    if not pragmas or engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+def engine_options(settings: Settings) -> dict:
+    """
+    Bağlantı havuzu ayarları; bellek içi SQLite tek bağlantı kullandığından
+    yalnızca dosya tabanlı veritabanlarına uygulanır.
+    """
+    if settings.database_url in ("sqlite://", "sqlite:///:memory:"):
+        return {}
+    return {
+        "pool_size": settings.pool_size,
+        "max_overflow": settings.max_overflow,
+        "pool_timeout": settings.pool_timeout,
+    }
+
+def to_async_url(url: str) -> str:
+    """
+    sqlite:///... adresini sqlite+aiosqlite:///... adresine çevirir.
+    """
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    return url
+
+def engine_pragmas(settings: Settings, read_only: bool) -> dict:
+    pragmas = sqlite_pragmas(settings.sqlite_profile)
+    if read_only:
+        # Replika bağlantıları veritabanı düzeyinde salt okunurdur
+        pragmas["query_only"] = "ON"
+    return pragmas
+
+def create_db_engine(settings: Settings, read_only: bool = False):
+    """
+    Ayarlara göre senkron motoru oluşturur. SQLAlchemy bağlantıları ilk
+    kullanımda açtığından bu çağrı veritabanına dokunmaz.
+    """
+    connect_args = {"check_same_thread": False} if settings.database_url.startswith("sqlite") else {}
+    engine = create_engine(settings.database_url, connect_args=connect_args, **engine_options(settings))
+    set_sqlite_pragmas(engine, engine_pragmas(settings, read_only))
+    return engine
+
+def create_async_db_engine(settings: Settings, read_only: bool = False):
+    # aiosqlite yalnızca async mod seçildiğinde gereklidir
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+    options = engine_options(settings)
+    if options:
+        # aiosqlite dosya veritabanlarında varsayılan olarak NullPool kullanır;
+        # havuz ayarlarının geçerli olması için kuyruklu havuz seçilir
+        options["poolclass"] = AsyncAdaptedQueuePool
+    async_engine = create_async_engine(to_async_url(settings.database_url), **options)
+    set_sqlite_pragmas(async_engine.sync_engine, engine_pragmas(settings, read_only))
+    return async_engine
+
+
+class Database:
+    """
+    Bir uygulama örneğinin motorları ve oturum fabrikaları. create_app'in
+    lifespan'inde oluşturulur ve `app.state.database` üzerinden kullanılır.
+    Yazmalar birincil motora gider; replika tanımlıysa okumalar replikalar
+    arasında sırayla dağıtılır.
+
+    - **settings**: Uygulama ayarları
+    - **engine**: Hazır bir senkron motor (ör. testlerde bellek içi SQLite); verilmezse ayarlardan oluşturulur
+    - **session_factory**: Oturum fabrikası; verilmezse motora bağlı bir sessionmaker kullanılır
+    """
+
+    def __init__(self, settings: Settings, engine=None, session_factory=None):
+        self.settings = settings
+        self.engine = engine if engine is not None else create_db_engine(settings)
+        self.SessionLocal = session_factory or sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        replica_settings = [replace(settings, database_url=url) for url in settings.replica_urls]
+        self.replica_engines = [create_db_engine(replica, read_only=True) for replica in replica_settings]
+        self.ReadSessionLocals = [
+            sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+            for replica_engine in self.replica_engines
+        ]
+        self._next_replica = itertools.count()
+
+        self.async_engine = None
+        self.AsyncSessionLocal = None
+        self.async_replica_engines = []
+        self.AsyncReadSessionLocals = []
+        if settings.db_mode == "async":
+            from sqlalchemy.ext.asyncio import async_sessionmaker
+
+            self.async_engine = create_async_db_engine(settings)
+            self.async_replica_engines = [
+                create_async_db_engine(replica, read_only=True) for replica in replica_settings
+            ]
+            # Yanıt, oturum kapandıktan sonra serileştirildiği için commit sonrası
+            # nesnelerin expire edilmemesi gerekir
+            self.AsyncSessionLocal, *self.AsyncReadSessionLocals = [
+                async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+                for async_engine in (self.async_engine, *self.async_replica_engines)
+            ]
+
+    def _pick(self, replicas: list, primary, replica: Optional[int]):
+        if not replicas:
+            return primary
+        if replica is None:
+            replica = next(self._next_replica) % len(replicas)
+        return replicas[replica]
+
+    def replica_for(self, request: Request) -> Optional[int]:
+        """
+        İsteğin okuyacağı replikanın sırası; istek birincilden okunacaksa None.
+        Seçim istek başına bir kez yapılır; böylece aynı isteğin oturumları
+        (ör. koşullu GET doğrulayıcıları ve yanıt gövdesi) aynı replikayı okur.
+        """
+        if not self.replica_engines or not uses_replica(request):
+            return None
+        if not hasattr(request.state, "replica"):
+            request.state.replica = next(self._next_replica) % len(self.replica_engines)
+        return request.state.replica
+
+    def session_factory(self, read: bool, replica: Optional[int] = None):
+        return self._pick(self.ReadSessionLocals, self.SessionLocal, replica) if read else self.SessionLocal
+
+    def async_session_factory(self, read: bool, replica: Optional[int] = None):
+        if not read:
+            return self.AsyncSessionLocal
+        return self._pick(self.AsyncReadSessionLocals, self.AsyncSessionLocal, replica)
+
+    async def dispose(self) -> None:
+        for engine in (self.engine, *self.replica_engines):
+            engine.dispose()
+        for async_engine in (self.async_engine, *self.async_replica_engines):
+            if async_engine is not None:
+                await async_engine.dispose()
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
+def create_missing_indexes(metadata, bind) -> None:
+    """
+    create_all var olan tablolara sonradan eklenen indeksleri oluşturmaz;
+    mevcut veritabanlarında eksik indeksleri tamamlar.
+    """
+    for table in metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
+
+def get_db(request: Request):
+    database = request.app.state.database
+    replica = database.replica_for(request)
+    db = database.session_factory(read=replica is not None, replica=replica)()
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+
+def get_streaming_db(request: Request):
+    """
+    Akış (StreamingResponse) endpoint'leri için her modda senkron oturum.
+    Gövde endpoint döndükten sonra threadpool'da üretildiğinden bu endpoint'ler
+    async oturuma sarılmaz. Bağımlılık teardown'ının yanıttan önce mi sonra mı
+    çalışacağı FastAPI sürümüne bağlı olduğundan oturumu burada kapatmaz;
+    yanıt bittiğinde oturumu kapatmak endpoint'in sorumluluğundadır.
+    """
+    database = request.app.state.database
+    replica = database.replica_for(request)
+    return database.session_factory(read=replica is not None, replica=replica)()
+
+
+async def get_async_db(request: Request):
+    database = request.app.state.database
+    replica = database.replica_for(request)
+    async with database.async_session_factory(read=replica is not None, replica=replica)() as db:
+        yield db
+
+
+def run_in_async_session(endpoint):
+    """
+    `db: Session = Depends(get_db)` alan senkron bir endpoint'i, aynı gövdeyi
+    AsyncSession.run_sync içinde çalıştıran bir async endpoint'e dönüştürür.
+
+    Böylece endpoint'ler tek bir yerde yazılır; async modda veritabanı
+    beklemeleri threadpool işçisi tutmaz, event loop'u bırakır.
+
+    Kendisi get_db'ye bağlı olan ve `async_variant` niteliği taşıyan
+    bağımlılıklar (ör. cache.conditional_get) async karşılıklarıyla
+    değiştirilir; get_async_db istek başına önbelleklendiğinden bunlar
+    endpoint ile aynı oturumu kullanır ve senkron motora dokunulmaz.
+    """
+    if inspect.iscoroutinefunction(endpoint):
+        return endpoint
+
+    signature = inspect.signature(endpoint)
+    db_param = None
+    parameters = []
+    for name, param in signature.parameters.items():
+        dependency = getattr(param.default, "dependency", None)
+        if dependency is get_db and db_param is None:
+            db_param = name
+            param = param.replace(default=Depends(get_async_db))
+        elif hasattr(dependency, "async_variant"):
+            param = param.replace(default=Depends(dependency.async_variant, use_cache=param.default.use_cache))
+        parameters.append(param)
+    if db_param is None:
+        return endpoint
+
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        async_db = kwargs.pop(db_param)
+        return await async_db.run_sync(lambda db: endpoint(*args, **{db_param: db}, **kwargs))
+
+    wrapper.__signature__ = signature.replace(parameters=parameters)
+    return wrapper
+
+
+class AsyncSessionRoute(APIRoute):
+    """
+    Async modda kullanılan route sınıfı; endpoint'leri run_in_async_session ile sarar.
+    """
+    def __init__(self, path, endpoint, **kwargs):
+        super().__init__(path, run_in_async_session(endpoint), **kwargs)
+
+
+class SessionRouter(APIRouter):
+    """
+    Endpoint tanımlarını saklayıp uygulama oluşturulurken ekleyen router.
+    Veritabanı modu import anında değil ayarlardan belirlendiğinden her
+    uygulama, `include_into` ile tanımları kendi moduna uygun route sınıfıyla
+    (async modda AsyncSessionRoute) kaydeder.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.definitions = []
+
+    def add_api_route(self, path, endpoint, **kwargs):
+        self.definitions.append((path, endpoint, kwargs))
+
+    def include_into(self, app, db_mode: str) -> None:
+        if db_mode == "async":
+            # Tüm endpoint'ler async oturumla çalışacak şekilde sarılır
+            app.router.route_class = AsyncSessionRoute
+        for path, endpoint, kwargs in self.definitions:
+            app.router.add_api_route(path, endpoint, **kwargs)
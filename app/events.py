@@ -0,0 +1,203 @@
+"""
+Kitap ve ödünç değişiklikleri için süreç içi yayın/abonelik ve Server-Sent
+Events akışı.
+
+Yazma endpoint'leri commit'ten sonra küçük değişiklik olayları yayınlar;
+`GET /events` aboneleri bunları sırayla alır. Her abonenin kuyruğu sınırlıdır:
+yavaş bir istemcinin kuyruğu dolarsa en eski olay atılır ve istemciye
+listeleri yeniden yüklemesi için bir `reset` olayı gönderilir. Son olaylar
+kısa bir geçmişte tutulduğundan yeniden bağlanan istemci `Last-Event-ID` ile
+kaldığı yerden devam eder.
+
+Olaylar süreç içidir; birden çok işçiyle her işçi kendi yazmalarını yayınlar.
+"""
+import asyncio
+import json
+import os
+import secrets
+import threading
+from collections import deque
+from typing import Optional
+
+EVENTS_HISTORY_SIZE = int(os.getenv("LIBRARY_EVENTS_HISTORY", "1000"))
+EVENTS_QUEUE_SIZE = int(os.getenv("LIBRARY_EVENTS_QUEUE_SIZE", "256"))
+EVENTS_MAX_SUBSCRIBERS = int(os.getenv("LIBRARY_EVENTS_MAX_SUBSCRIBERS", "1000"))
+# Bu süre (sn) boyunca olay yoksa bağlantıyı açık tutmak için yorum satırı gönderilir
+EVENTS_KEEPALIVE = float(os.getenv("LIBRARY_EVENTS_KEEPALIVE", "15"))
+# EventSource'un bağlantı koptuğunda yeniden denemeden önce beklediği süre (ms)
+EVENTS_RETRY_MS = 3000
+
+
+class Subscription:
+    """
+    Tek bir `GET /events` bağlantısının olay kuyruğu. Olaylar yayınlayan
+    thread'den eklenir; bağlantının event loop'u `ready` ile uyandırılır.
+    """
+
+    def __init__(self, lock: threading.Lock, queue_size: int):
+        self._lock = lock
+        self._loop = asyncio.get_running_loop()
+        self._ready = asyncio.Event()
+        self.queue = deque(maxlen=queue_size)
+        self.dropped = False
+        self.closed = False
+
+    def push(self, event: tuple) -> None:
+        # Kilit altında çağrılır; dolu kuyrukta deque en eski olayı atar
+        if len(self.queue) == self.queue.maxlen:
+            self.dropped = True
+        self.queue.append(event)
+
+    def notify(self) -> None:
+        self._loop.call_soon_threadsafe(self._ready.set)
+
+    async def next_batch(self, timeout: float) -> tuple:
+        """
+        Bekleyen olayları (olaylar, reset gerekli mi) olarak döndürür; `timeout`
+        süresince olay gelmezse boş liste döner.
+        """
+        if not self.queue and not self.closed:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        with self._lock:
+            events, reset = list(self.queue), self.dropped
+            self.queue.clear()
+            self.dropped = False
+        return events, reset
+
+
+class EventBroker:
+    """
+    Süreç içi yayın/abonelik. Olay kimlikleri `<dönem>-<sıra>` biçimindedir;
+    dönem süreç başına rastgele seçildiğinden yeniden başlatılmış bir sürecin
+    kimlikleri öncekilerle karışmaz.
+    """
+
+    def __init__(self, history_size: int = EVENTS_HISTORY_SIZE, queue_size: int = EVENTS_QUEUE_SIZE,
+                 max_subscribers: int = EVENTS_MAX_SUBSCRIBERS):
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self.epoch = secrets.token_hex(4)
+        self._lock = threading.Lock()
+        self._history = deque(maxlen=history_size)
+        self._subscribers = set()
+        self._sequence = 0
+
+    def publish(self, event_type: str, data: dict) -> str:
+        """
+        Olayı geçmişe ve tüm abonelerin kuyruğuna ekler; olay kimliğini döndürür.
+        Veri bir kez JSON'a çevrilir ve abonelerce paylaşılır.
+        """
+        payload = json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str)
+        with self._lock:
+            self._sequence += 1
+            sequence = self._sequence
+            event = (sequence, event_type, payload)
+            self._history.append(event)
+            subscribers = list(self._subscribers)
+            for subscription in subscribers:
+                subscription.push(event)
+        for subscription in subscribers:
+            subscription.notify()
+        return self.event_id(sequence)
+
+    def event_id(self, sequence: int) -> str:
+        return f"{self.epoch}-{sequence}"
+
+    def _resume_sequence(self, last_event_id: str) -> Optional[int]:
+        """
+        İstemcinin gördüğü son olayın sırası; aradaki olaylar artık geçmişte
+        yoksa (ya da kimlik başka bir sürece aitse) None.
+        """
+        epoch, _, sequence = last_event_id.partition("-")
+        if epoch != self.epoch or not sequence.isdigit():
+            return None
+        sequence = int(sequence)
+        if sequence > self._sequence:
+            return None
+        oldest = self._history[0][0] if self._history else self._sequence + 1
+        if sequence < self._sequence and sequence + 1 < oldest:
+            return None
+        return sequence
+
+    @property
+    def is_full(self) -> bool:
+        return len(self._subscribers) >= self.max_subscribers
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> Subscription:
+        """
+        Yeni bir abonelik açar. `last_event_id` verilirse sonraki olaylar geçmişten
+        kuyruğa alınır; devam edilemiyorsa abonelik bir `reset` olayıyla başlar.
+        """
+        with self._lock:
+            subscription = Subscription(self._lock, self.queue_size)
+            if last_event_id:
+                sequence = self._resume_sequence(last_event_id)
+                if sequence is None:
+                    subscription.dropped = True
+                else:
+                    for event in self._history:
+                        if event[0] > sequence:
+                            subscription.push(event)
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def close_subscriptions(self) -> None:
+        """
+        Açık akışları sonlandırır (ör. kapanışta bağlantıların beklememesi için).
+        """
+        with self._lock:
+            subscribers = list(self._subscribers)
+            for subscription in subscribers:
+                subscription.closed = True
+        for subscription in subscribers:
+            subscription.notify()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._history.clear()
+            self._sequence = 0
+            self.epoch = secrets.token_hex(4)
+
+
+async def event_stream(broker: EventBroker, last_event_id: Optional[str] = None,
+                       keepalive: float = EVENTS_KEEPALIVE):
+    """
+    Olayları text/event-stream biçiminde üretir. Abonelik akış başladığında
+    açılır ve bağlantı kapandığında (generator kapatılınca) bırakılır.
+    """
+    subscription = broker.subscribe(last_event_id)
+    try:
+        yield f"retry: {EVENTS_RETRY_MS}\n\n"
+        while True:
+            events, reset = await subscription.next_batch(keepalive)
+            chunks = ["event: reset\ndata: {}\n\n"] if reset else []
+            chunks.extend(
+                f"id: {broker.event_id(sequence)}\nevent: {event_type}\ndata: {payload}\n\n"
+                for sequence, event_type, payload in events
+            )
+            if chunks:
+                yield "".join(chunks)
+            elif subscription.closed:
+                return
+            else:
+                yield ": keepalive\n\n"
+    finally:
+        broker.unsubscribe(subscription)
+
+
+def book_event(book) -> dict:
+    return {
+        "id": book.id, "title": book.title, "author": book.author,
+        "category_id": book.category_id, "available": book.available,
+    }
+
+
+event_broker = EventBroker()
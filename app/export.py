@@ -0,0 +1,78 @@
+import csv
+import io
+import zlib
+from enum import Enum
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.serialization import dumps
+
+# Sunucu tarafında bir seferde okunacak satır sayısı
+EXPORT_BATCH_SIZE = 1000
+# Sıkıştırılmış çıktı bu boyuta ulaştıkça istemciye gönderilir
+FLUSH_THRESHOLD = 64 * 1024
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv; charset=utf-8",
+}
+
+
+def _encode_batch(rows, keys: list, fmt: ExportFormat) -> bytes:
+    if fmt is ExportFormat.ndjson:
+        return b"".join(dumps(dict(zip(keys, row))) + b"\n" for row in rows)
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(
+        [value.isoformat() if hasattr(value, "isoformat") else value for value in row] for row in rows
+    )
+    return buffer.getvalue().encode()
+
+
+def stream_export(db: Session, columns: list, filters: list, order_by: list,
+                  fmt: ExportFormat, compress: bool = True):
+    """
+    Kolon tuple'larını partiler halinde okuyup NDJSON ya da CSV olarak üreten
+    generator. ORM nesnesi oluşturulmaz ve tablo boyutundan bağımsız olarak
+    bellekte yalnızca bir parti ile bir sıkıştırma tamponu tutulur.
+    """
+    keys = [column.key for column in columns]
+    statement = (
+        select(*columns)
+        .where(*filters)
+        .order_by(*order_by)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    # gzip biçimli (wbits=31) akış sıkıştırıcı
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    pending = []
+    pending_size = 0
+
+    def emit(data: bytes):
+        nonlocal pending_size
+        if compressor is not None:
+            data = compressor.compress(data)
+        if data:
+            pending.append(data)
+            pending_size += len(data)
+
+    if fmt is ExportFormat.csv:
+        emit(_encode_batch([keys], keys, fmt))
+
+    for partition in db.execute(statement).partitions():
+        emit(_encode_batch(partition, keys, fmt))
+        if pending_size >= FLUSH_THRESHOLD:
+            yield b"".join(pending)
+            pending.clear()
+            pending_size = 0
+
+    if compressor is not None:
+        pending.append(compressor.flush())
+    if pending:
+        yield b"".join(pending)
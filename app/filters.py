@@ -0,0 +1,70 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import Query
+
+from app import models
+
+# Liste endpoint'lerinin ortak filtre parametreleri. Her bağımlılık SQL
+# koşullarının listesini döndürür; endpoint'ler bunları query.filter(*filters)
+# ile uygular, böylece filtreleme istemcide değil veritabanında yapılır.
+
+
+def book_filters(
+    category_id: Optional[int] = Query(None, description="Filtrelenecek kategori ID"),
+    available: Optional[bool] = Query(None, description="Müsaitlik durumuna göre filtre"),
+    author: Optional[str] = Query(None, description="Yazar adı (tam eşleşme)"),
+    year_from: Optional[int] = Query(None, description="En erken yayın yılı (dahil)"),
+    year_to: Optional[int] = Query(None, description="En geç yayın yılı (dahil)"),
+) -> list:
+    filters = []
+    if category_id:
+        filters.append(models.Book.category_id == category_id)
+    if available is not None:
+        filters.append(models.Book.available == available)
+    if author is not None:
+        filters.append(models.Book.author == author)
+    if year_from is not None:
+        filters.append(models.Book.publication_year >= year_from)
+    if year_to is not None:
+        filters.append(models.Book.publication_year <= year_to)
+    return filters
+
+
+def loan_filters(
+    is_returned: Optional[bool] = Query(None, description="İade durumuna göre filtre"),
+    book_id: Optional[int] = Query(None, description="Kitap ID"),
+    borrower_name: Optional[str] = Query(None, description="Ödünç alan kişinin adı (tam eşleşme)"),
+    loan_date_from: Optional[datetime] = Query(None, description="Bu tarihten itibaren alınan ödünçler (dahil)"),
+    loan_date_to: Optional[datetime] = Query(None, description="Bu tarihten önce alınan ödünçler (hariç)"),
+) -> list:
+    filters = []
+    if is_returned is not None:
+        filters.append(models.Loan.is_returned == is_returned)
+    if book_id is not None:
+        filters.append(models.Loan.book_id == book_id)
+    if borrower_name is not None:
+        filters.append(models.Loan.borrower_name == borrower_name)
+    if loan_date_from is not None:
+        filters.append(models.Loan.loan_date >= loan_date_from)
+    if loan_date_to is not None:
+        filters.append(models.Loan.loan_date < loan_date_to)
+    return filters
+
+
+def loan_history_filters(
+    book_id: Optional[int] = Query(None, description="Kitap ID"),
+    borrower_name: Optional[str] = Query(None, description="Ödünç alan kişinin adı (tam eşleşme)"),
+    loan_date_from: Optional[datetime] = Query(None, description="Bu tarihten itibaren alınan ödünçler (dahil)"),
+    loan_date_to: Optional[datetime] = Query(None, description="Bu tarihten önce alınan ödünçler (hariç)"),
+) -> list:
+    filters = []
+    if book_id is not None:
+        filters.append(models.LoanHistory.book_id == book_id)
+    if borrower_name is not None:
+        filters.append(models.LoanHistory.borrower_name == borrower_name)
+    if loan_date_from is not None:
+        filters.append(models.LoanHistory.loan_date >= loan_date_from)
+    if loan_date_to is not None:
+        filters.append(models.LoanHistory.loan_date < loan_date_to)
+    return filters
\ No newline at end of file
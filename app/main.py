@@ -1,35 +1,62 @@
-from fastapi import FastAPI, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from sqlalchemy import update
+from sqlalchemy.orm import Session, joinedload
+from pydantic import TypeAdapter
+from typing import List, Optional
 from datetime import datetime
-from app import models, schemas
-from app.database import engine, get_db
+from app import archive, bulk, export, metrics, models, schemas, search, stats
+from app.admission import AdmissionMiddleware
+from app.compression import CompressionMiddleware
+from app.events import book_event, event_broker, event_stream
+from app.cache import cached_response, conditional_get, response_cache
+from app.filters import book_filters, loan_filters, loan_history_filters
+from app.database import Database, SessionRouter, get_db, get_streaming_db
+from app.migrate import migrate
+from app.pagination import NEXT_CURSOR_HEADER, paginate
+from app.replicas import ReadYourWritesMiddleware
+from app.serialization import FAST_JSON_RESPONSES, rows_json_response, schema_columns
+from app.settings import Settings
 
-models.Base.metadata.create_all(bind=engine)
+# Endpoint'ler bu router'a tanımlanır ve create_app içinde uygulamaya eklenir
+router = SessionRouter()
 
-app = FastAPI(
-    title="Kişisel Kütüphane API",
-    description="""
-    Bu API, kişisel kütüphane yönetimi için geliştirilmiş bir RESTful servistir.
-    
-    ## Özellikler
-    * 📚 Kitap yönetimi (ekleme, düzenleme, silme)
-    * 📋 Kategori yönetimi
-    * 📖 Kitap ödünç alma/verme sistemi
-    * 🔍 Kategoriye göre kitap filtreleme
-    
-    ## Kullanım
-    API'yi kullanmak için aşağıdaki endpoint'leri kullanabilirsiniz.
-    """,
-    version="1.0.0",
-    contact={
-        "name": "Kütüphane Yönetimi",
-        "email": "kutuphane@example.com"
-    }
-)
+category_list_adapter = TypeAdapter(List[schemas.Category])
+book_columns = schema_columns(schemas.Book, models.Book)
+loan_columns = schema_columns(schemas.Loan, models.Loan)
+
+# `view=summary` listeleri için hafif şemalar
+book_summary_columns = schema_columns(schemas.BookSummary, models.Book)
+loan_summary_columns = schema_columns(schemas.LoanSummary, models.Loan)
+book_summary_adapter = TypeAdapter(List[schemas.BookSummary])
+loan_summary_adapter = TypeAdapter(List[schemas.LoanSummary])
+
+def list_headers(validators: dict, next_cursor: Optional[str]) -> dict:
+    return {**validators, NEXT_CURSOR_HEADER: next_cursor} if next_cursor else validators
+
+def summary_response(rows, adapter: TypeAdapter, headers: dict) -> Response:
+    """
+    Hafif liste şemasına göre seçilmiş kolon satırlarını JSON yanıta çevirir.
+    """
+    if FAST_JSON_RESPONSES:
+        return rows_json_response(rows, headers)
+    body = adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+    return Response(content=body, media_type="application/json", headers=headers)
+
+async def read_bulk_rows(request: Request) -> list:
+    """
+    Toplu yükleme gövdesini okuyup ham satırlara ayırır.
+    """
+    body = await request.body()
+    try:
+        return bulk.parse_bulk_payload(body, request.headers.get("content-type", ""))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Geçersiz istek gövdesi: {e}")
 
 # Kategori endpoint'leri
-@app.post("/categories/", response_model=schemas.Category, tags=["Kategoriler"],
+@router.post("/categories/", response_model=schemas.Category, tags=["Kategoriler"],
     summary="Yeni kategori oluştur",
     description="Bu endpoint ile kütüphaneye yeni bir kategori ekleyebilirsiniz.")
 def create_category(category: schemas.CategoryCreate, db: Session = Depends(get_db)):
@@ -39,27 +66,38 @@ def create_category(category: schemas.CategoryCreate, db: Session = Depends(get_
     - **name**: Kategori adı (zorunlu)
     - **description**: Kategori açıklaması (opsiyonel)
     """
-    db_category = models.Category(**category.dict())
+    db_category = models.Category(**category.model_dump())
     db.add(db_category)
     db.commit()
+    response_cache.invalidate("categories")
     db.refresh(db_category)
     return db_category
 
-@app.get("/categories/", response_model=List[schemas.Category], tags=["Kategoriler"],
+@router.get("/categories/", response_model=List[schemas.Category], tags=["Kategoriler"],
     summary="Tüm kategorileri listele",
     description="Kütüphanedeki tüm kategorileri listeler.")
-def read_categories(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def read_categories(request: Request, skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+                    db: Session = Depends(get_db)):
     """
     Tüm kategorileri listeler.
     
     - **skip**: Atlanacak kayıt sayısı (varsayılan: 0)
     - **limit**: Listelenecek maksimum kayıt sayısı (varsayılan: 100)
+    - **cursor**: Bir önceki yanıtın `X-Next-Cursor` başlığındaki imleç (opsiyonel, verilirse skip yok sayılır)
     """
-    categories = db.query(models.Category).offset(skip).limit(limit).all()
-    return categories
+    cache_key = (skip, limit, cursor)
+    replica = request.app.state.database.replica_for(request) is not None
+    entry = response_cache.get("categories", cache_key, replica=replica)
+    if entry is None:
+        token = response_cache.token("categories")
+        categories, next_cursor = paginate(db.query(models.Category), [models.Category.id], skip, limit, cursor)
+        body = category_list_adapter.dump_json(category_list_adapter.validate_python(categories))
+        headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+        entry = response_cache.set("categories", cache_key, body, headers, token=token, replica=replica)
+    return cached_response(request, entry)
 
 # Kitap endpoint'leri
-@app.post("/books/", response_model=schemas.Book, tags=["Kitaplar"],
+@router.post("/books/", response_model=schemas.Book, tags=["Kitaplar"],
     summary="Yeni kitap ekle",
     description="Kütüphaneye yeni bir kitap ekler.")
 def create_book(book: schemas.BookCreate, db: Session = Depends(get_db)):
@@ -72,44 +110,121 @@ def create_book(book: schemas.BookCreate, db: Session = Depends(get_db)):
     - **publication_year**: Yayın yılı (zorunlu)
     - **category_id**: Kategori ID (zorunlu)
     """
-    db_book = models.Book(**book.dict())
+    db_book = models.Book(**book.model_dump())
     db.add(db_book)
+    stats.books_added(db, [db_book.category_id])
     db.commit()
+    # Yeni kitabın önbellekte girdisi olamaz; geçersiz kılınacak anahtar yoktur
     db.refresh(db_book)
+    event_broker.publish("book.created", book_event(db_book))
     return db_book
 
-@app.get("/books/", response_model=List[schemas.Book], tags=["Kitaplar"],
+@router.post("/books/bulk", response_model=schemas.BulkBookResponse, tags=["Kitaplar"],
+    summary="Toplu kitap ekle",
+    description="JSON dizisi ya da NDJSON (application/x-ndjson) olarak gönderilen kitapları toplu ekler.",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": {"type": "array", "items": schemas.BookCreate.model_json_schema()}},
+                "application/x-ndjson": {"schema": {"type": "string"}},
+            },
+        }
+    })
+def create_books_bulk(rows: list = Depends(read_bulk_rows), db: Session = Depends(get_db)):
+    """
+    Kitapları parçalar halinde, parça başına tek transaction ile ekler.
+    
+    Her satır ayrı ayrı doğrulanır; tekrar eden ISBN, bulunmayan kategori ya da
+    geçersiz alan içeren satırlar yüklemeyi durdurmaz, `results` listesinde
+    satır numarasıyla raporlanır.
+    """
+    result = bulk.bulk_create_books(db, rows)
+    if result.created:
+        event_broker.publish("book.bulk_created", {
+            "ids": [item.id for item in result.results if item.status == "created"]
+        })
+    return result
+
+@router.post("/books/lookup", response_model=schemas.BookLookupResponse, tags=["Kitaplar"],
+    summary="Kitapları toplu sorgula",
+    description="Birden çok kitabı id ya da ISBN listesiyle tek istekte getirir.")
+def lookup_books(request: schemas.BookLookup, db: Session = Depends(get_db)):
+    """
+    Kitapları id ve ISBN ile toplu sorgular; N ayrı isteğin yerini tutar.
+    
+    - **ids**: Sorgulanacak kitap ID'leri
+    - **isbns**: Sorgulanacak ISBN'ler; tire/boşluk içerebilir, ISBN-10 ve ISBN-13 biçimleri birbirini bulur
+    
+    Toplam en fazla 5000 değer gönderilebilir. Sonuçlar gönderilen değerle
+    anahtarlanır; bulunamayan ya da geçersiz değerler `null` döner.
+    """
+    return bulk.bulk_lookup_books(db, request)
+
+@router.get("/books/", response_model=List[schemas.Book], tags=["Kitaplar"],
     summary="Kitapları listele",
-    description="Tüm kitapları listeler. Opsiyonel olarak kategori ID'ye göre filtrelenebilir.")
-def read_books(skip: int = 0, limit: int = 100, category_id: int = None, db: Session = Depends(get_db)):
+    description="Tüm kitapları listeler. Kategori, müsaitlik, yazar ve yayın yılı aralığına göre filtrelenebilir.")
+def read_books(response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+               view: schemas.ListView = schemas.ListView.full, filters: list = Depends(book_filters),
+               validators: dict = Depends(conditional_get("books")), db: Session = Depends(get_db)):
     """
     Kitapları listeler.
     
     - **skip**: Atlanacak kayıt sayısı (varsayılan: 0)
     - **limit**: Listelenecek maksimum kayıt sayısı (varsayılan: 100)
-    - **category_id**: Filtrelenecek kategori ID (opsiyonel)
+    - **cursor**: Bir önceki yanıtın `X-Next-Cursor` başlığındaki imleç (opsiyonel, verilirse skip yok sayılır)
+    - **view**: `full` (varsayılan) ya da yalnızca id, başlık, yazar ve müsaitlik içeren `summary`
+    - **category_id**, **available**, **author**, **year_from**, **year_to**: Filtreler (opsiyonel)
     """
-    query = db.query(models.Book)
-    if category_id:
-        query = query.filter(models.Book.category_id == category_id)
-    books = query.offset(skip).limit(limit).all()
+    query = db.query(models.Book).filter(*filters)
+    if view is schemas.ListView.summary:
+        rows, next_cursor = paginate(query.with_entities(*book_summary_columns), [models.Book.id], skip, limit, cursor)
+        return summary_response(rows, book_summary_adapter, list_headers(validators, next_cursor))
+    if FAST_JSON_RESPONSES:
+        rows, next_cursor = paginate(query.with_entities(*book_columns), [models.Book.id], skip, limit, cursor)
+        return rows_json_response(rows, list_headers(validators, next_cursor))
+    books, next_cursor = paginate(query, [models.Book.id], skip, limit, cursor)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return books
 
-@app.get("/books/{book_id}", response_model=schemas.Book, tags=["Kitaplar"],
+@router.get("/books/search", response_model=List[schemas.Book], tags=["Kitaplar"],
+    summary="Kitap ara",
+    description="Kitap başlığı ve yazarında tam metin arama yapar; sonuçlar ilgiye göre sıralanır.")
+def search_books(q: str = Query(..., min_length=1, max_length=200), skip: int = 0,
+                 limit: int = Query(20, ge=1, le=100), validators: dict = Depends(conditional_get("books")),
+                 db: Session = Depends(get_db)):
+    """
+    Başlık ve yazarda FTS5 indeksi üzerinden arama yapar.
+    
+    - **q**: Aranacak kelimeler; her kelime önek olarak eşleşir ("dost" → "Dostoyevski")
+    - **skip**: Atlanacak sonuç sayısı (varsayılan: 0)
+    - **limit**: Listelenecek maksimum sonuç sayısı (varsayılan: 20, en fazla: 100)
+    """
+    return search.search_books(db, q, skip, limit)
+
+@router.get("/books/{book_id}", response_model=schemas.Book, tags=["Kitaplar"],
     summary="Kitap detaylarını görüntüle",
     description="Belirtilen ID'ye sahip kitabın detaylarını gösterir.")
-def read_book(book_id: int, db: Session = Depends(get_db)):
+def read_book(book_id: int, request: Request, db: Session = Depends(get_db)):
     """
-    Belirli bir kitabın detaylarını gösterir.
+    Belirli bir kitabın detaylarını gösterir. Yanıt önbellekten sunulur ve
+    `If-None-Match` ile gönderilen ETag güncelse 304 döner.
     
     - **book_id**: Görüntülenecek kitabın ID'si
     """
-    book = db.query(models.Book).filter(models.Book.id == book_id).first()
-    if book is None:
-        raise HTTPException(status_code=404, detail="Kitap bulunamadı")
-    return book
+    replica = request.app.state.database.replica_for(request) is not None
+    entry = response_cache.get("books", book_id, replica=replica)
+    if entry is None:
+        token = response_cache.token("books")
+        book = db.query(models.Book).filter(models.Book.id == book_id).first()
+        if book is None:
+            raise HTTPException(status_code=404, detail="Kitap bulunamadı")
+        body = schemas.Book.model_validate(book).model_dump_json().encode()
+        entry = response_cache.set("books", book_id, body, token=token, replica=replica)
+    return cached_response(request, entry)
 
-@app.put("/books/{book_id}", response_model=schemas.Book, tags=["Kitaplar"],
+@router.put("/books/{book_id}", response_model=schemas.Book, tags=["Kitaplar"],
     summary="Kitap bilgilerini güncelle",
     description="Belirtilen ID'ye sahip kitabın bilgilerini günceller.")
 def update_book(book_id: int, book: schemas.BookCreate, db: Session = Depends(get_db)):
@@ -123,14 +238,19 @@ def update_book(book_id: int, book: schemas.BookCreate, db: Session = Depends(ge
     if db_book is None:
         raise HTTPException(status_code=404, detail="Kitap bulunamadı")
     
-    for key, value in book.dict().items():
+    stats.book_updated(
+        db, book_id, (db_book.category_id, db_book.author), (book.category_id, book.author), db_book.available
+    )
+    for key, value in book.model_dump().items():
         setattr(db_book, key, value)
     
     db.commit()
+    response_cache.invalidate("books", book_id)
     db.refresh(db_book)
+    event_broker.publish("book.updated", book_event(db_book))
     return db_book
 
-@app.delete("/books/{book_id}", tags=["Kitaplar"],
+@router.delete("/books/{book_id}", tags=["Kitaplar"],
     summary="Kitap sil",
     description="Belirtilen ID'ye sahip kitabı siler.")
 def delete_book(book_id: int, db: Session = Depends(get_db)):
@@ -143,12 +263,15 @@ def delete_book(book_id: int, db: Session = Depends(get_db)):
     if db_book is None:
         raise HTTPException(status_code=404, detail="Kitap bulunamadı")
     
+    stats.book_removed(db, book_id, db_book.category_id, db_book.author, db_book.available)
     db.delete(db_book)
     db.commit()
+    response_cache.invalidate("books", book_id)
+    event_broker.publish("book.deleted", {"id": book_id})
     return {"message": "Kitap başarıyla silindi"}
 
 # Ödünç alma endpoint'leri
-@app.post("/loans/", response_model=schemas.Loan, tags=["Ödünç İşlemleri"],
+@router.post("/loans/", response_model=schemas.Loan, tags=["Ödünç İşlemleri"],
     summary="Kitap ödünç al",
     description="Bir kitabı ödünç alma işlemi oluşturur.")
 def create_loan(loan: schemas.LoanCreate, db: Session = Depends(get_db)):
@@ -158,21 +281,70 @@ def create_loan(loan: schemas.LoanCreate, db: Session = Depends(get_db)):
     - **book_id**: Ödünç alınacak kitabın ID'si
     - **borrower_name**: Ödünç alan kişinin adı
     """
-    db_book = db.query(models.Book).filter(models.Book.id == loan.book_id).first()
-    if not db_book:
-        raise HTTPException(status_code=404, detail="Kitap bulunamadı")
-    if not db_book.available:
+    # Müsaitlik kontrolü ve işaretleme tek bir koşullu UPDATE'tir; aynı kitabı
+    # eşzamanlı ödünç almaya çalışan isteklerden yalnızca biri satırı günceller.
+    checked_out = db.execute(
+        update(models.Book)
+        .where(models.Book.id == loan.book_id, models.Book.available == True)
+        .values(available=False)
+        .returning(models.Book.author, models.Book.category_id)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if checked_out is None:
+        # Hata yolunda 404 ile 400'ü ayırt etmek için kitabın varlığına bakılır
+        if db.query(models.Book.id).filter(models.Book.id == loan.book_id).first() is None:
+            raise HTTPException(status_code=404, detail="Kitap bulunamadı")
         raise HTTPException(status_code=400, detail="Kitap şu anda ödünç verilemez")
     
-    db_loan = models.Loan(**loan.dict(), loan_date=datetime.now())
-    db_book.available = False
-    
+    db_loan = models.Loan(**loan.model_dump(), loan_date=datetime.now(), is_returned=False)
     db.add(db_loan)
+    db.flush()
+    stats.loans_created(db, [(loan.book_id, checked_out.author, checked_out.category_id)])
+    # Yanıt commit'ten önce hazırlanır; commit sonrası refresh SELECT'i gerekmez
+    response = schemas.Loan.model_validate(db_loan)
     db.commit()
-    db.refresh(db_loan)
-    return db_loan
+    response_cache.invalidate("books", loan.book_id)
+    event_broker.publish("loan.created", {
+        "id": response.id, "book_id": response.book_id, "borrower_name": response.borrower_name,
+    })
+    return response
+
+@router.post("/loans/bulk", response_model=schemas.BulkLoanResponse, tags=["Ödünç İşlemleri"],
+    summary="Toplu ödünç al",
+    description="Bir kişinin sepetindeki kitapları tek işlemde ödünç verir.")
+def create_loans_bulk(request: schemas.BulkLoanCreate, db: Session = Depends(get_db)):
+    """
+    Sepetteki kitapları tek transaction'da ödünç verir; her kitap için sonuç döner.
+    
+    - **borrower_name**: Ödünç alan kişinin adı
+    - **book_ids**: Ödünç alınacak kitapların ID'leri (en fazla 5000)
+    """
+    result = bulk.bulk_checkout(db, request)
+    for item in result.results:
+        if item.status == "loaned":
+            response_cache.invalidate("books", item.book_id)
+            event_broker.publish("loan.created", {
+                "id": item.loan_id, "book_id": item.book_id, "borrower_name": request.borrower_name,
+            })
+    return result
+
+@router.put("/loans/return/bulk", response_model=schemas.BulkReturnResponse, tags=["Ödünç İşlemleri"],
+    summary="Toplu iade et",
+    description="Birden fazla ödünç kaydını tek işlemde iade eder.")
+def return_books_bulk(request: schemas.BulkLoanReturn, db: Session = Depends(get_db)):
+    """
+    Ödünç kayıtlarını tek transaction'da iade eder; her kayıt için sonuç döner.
+    
+    - **loan_ids**: İade edilecek ödünç kayıtlarının ID'leri (en fazla 5000)
+    """
+    result = bulk.bulk_return(db, request)
+    for item in result.results:
+        if item.status == "returned":
+            response_cache.invalidate("books", item.book_id)
+            event_broker.publish("loan.returned", {"id": item.loan_id, "book_id": item.book_id})
+    return result
 
-@app.put("/loans/{loan_id}/return", tags=["Ödünç İşlemleri"],
+@router.put("/loans/{loan_id}/return", tags=["Ödünç İşlemleri"],
     summary="Kitap iade et",
     description="Ödünç alınan bir kitabı iade eder.")
 def return_book(loan_id: int, db: Session = Depends(get_db)):
@@ -181,28 +353,350 @@ def return_book(loan_id: int, db: Session = Depends(get_db)):
     
     - **loan_id**: İade edilecek ödünç kaydının ID'si
     """
-    db_loan = db.query(models.Loan).filter(models.Loan.id == loan_id).first()
-    if not db_loan:
-        raise HTTPException(status_code=404, detail="Ödünç kaydı bulunamadı")
-    if db_loan.is_returned:
+    # Koşullu UPDATE ile yalnızca iade edilmemiş kayıt güncellenir; kitap ID'si
+    # RETURNING ile alındığından ayrı bir SELECT yapılmaz.
+    return_date = datetime.now()
+    returned = db.execute(
+        update(models.Loan)
+        .where(models.Loan.id == loan_id, models.Loan.is_returned == False)
+        .values(is_returned=True, return_date=return_date)
+        .returning(models.Loan.book_id, models.Loan.loan_date)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if returned is None:
+        if db.query(models.Loan.id).filter(models.Loan.id == loan_id).first() is None:
+            raise HTTPException(status_code=404, detail="Ödünç kaydı bulunamadı")
         raise HTTPException(status_code=400, detail="Bu kitap zaten iade edilmiş")
     
-    db_loan.is_returned = True
-    db_loan.return_date = datetime.now()
-    db_loan.book.available = True
-    
+    book_id = returned.book_id
+    released = db.execute(
+        update(models.Book)
+        .where(models.Book.id == book_id)
+        .values(available=True)
+        .returning(models.Book.category_id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    stats.loans_returned(
+        db, [(return_date - returned.loan_date).total_seconds()], [row.category_id for row in released]
+    )
     db.commit()
+    response_cache.invalidate("books", book_id)
+    event_broker.publish("loan.returned", {"id": loan_id, "book_id": book_id})
     return {"message": "Kitap başarıyla iade edildi"}
 
-@app.get("/loans/", response_model=List[schemas.Loan], tags=["Ödünç İşlemleri"],
+@router.get("/loans/", response_model=List[schemas.Loan], tags=["Ödünç İşlemleri"],
     summary="Ödünç işlemlerini listele",
     description="Tüm ödünç alma işlemlerini listeler.")
-def read_loans(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def read_loans(response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+               view: schemas.ListView = schemas.ListView.full, filters: list = Depends(loan_filters),
+               validators: dict = Depends(conditional_get("loans")), db: Session = Depends(get_db)):
+    """
+    Tüm ödünç işlemlerini ödünç alma tarihine göre listeler.
+    
+    - **skip**: Atlanacak kayıt sayısı (varsayılan: 0)
+    - **limit**: Listelenecek maksimum kayıt sayısı (varsayılan: 100)
+    - **cursor**: Bir önceki yanıtın `X-Next-Cursor` başlığındaki imleç (opsiyonel, verilirse skip yok sayılır)
+    - **view**: `full` (varsayılan) ya da iade tarihi içermeyen `summary`
+    - **is_returned**, **book_id**, **borrower_name**, **loan_date_from**, **loan_date_to**: Filtreler (opsiyonel)
+    """
+    query = db.query(models.Loan).filter(*filters)
+    if view is schemas.ListView.summary:
+        rows, next_cursor = paginate(
+            query.with_entities(*loan_summary_columns), [models.Loan.loan_date, models.Loan.id], skip, limit, cursor
+        )
+        return summary_response(rows, loan_summary_adapter, list_headers(validators, next_cursor))
+    if FAST_JSON_RESPONSES:
+        rows, next_cursor = paginate(
+            query.with_entities(*loan_columns), [models.Loan.loan_date, models.Loan.id], skip, limit, cursor
+        )
+        return rows_json_response(rows, list_headers(validators, next_cursor))
+    loans, next_cursor = paginate(query, [models.Loan.loan_date, models.Loan.id], skip, limit, cursor)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return loans
+
+@router.get("/loans/details", response_model=List[schemas.LoanDetail], tags=["Ödünç İşlemleri"],
+    summary="Ödünç işlemlerini kitap bilgisiyle listele",
+    description="Ödünç işlemlerini kitap (ve istenirse kategori) bilgisi gömülü olarak tek istekte listeler.")
+def read_loan_details(response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+                      include_category: bool = False, filters: list = Depends(loan_filters),
+                      validators: dict = Depends(conditional_get("loans", "books", "categories")),
+                      db: Session = Depends(get_db)):
+    """
+    Ödünç işlemlerini kitap bilgisiyle birlikte listeler. Kitap (ve kategori)
+    aynı sorguda JOIN ile yüklenir; kayıt başına ek sorgu ya da istek gerekmez.
+    
+    - **skip**: Atlanacak kayıt sayısı (varsayılan: 0)
+    - **limit**: Listelenecek maksimum kayıt sayısı (varsayılan: 100)
+    - **cursor**: Bir önceki yanıtın `X-Next-Cursor` başlığındaki imleç (opsiyonel, verilirse skip yok sayılır)
+    - **include_category**: Kitabın kategorisini de göm (varsayılan: false)
+    - **is_returned**, **book_id**, **borrower_name**, **loan_date_from**, **loan_date_to**: Filtreler (opsiyonel)
+    """
+    book_loader = joinedload(models.Loan.book)
+    if include_category:
+        book_loader = book_loader.joinedload(models.Book.category)
+    else:
+        # Kategori istenmediğinde serileştirme sırasında tembel yükleme yapılmasın
+        book_loader = book_loader.noload(models.Book.category)
+
+    query = db.query(models.Loan).options(book_loader).filter(*filters)
+    loans, next_cursor = paginate(query, [models.Loan.loan_date, models.Loan.id], skip, limit, cursor)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return loans
+
+@router.get("/loans/history", response_model=List[schemas.LoanHistory], tags=["Ödünç İşlemleri"],
+    summary="Arşivlenmiş ödünç işlemlerini listele",
+    description="Arşive taşınmış (iade edilmiş eski) ödünç işlemlerini ödünç alma tarihine göre listeler.")
+def read_loan_history(response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+                      filters: list = Depends(loan_history_filters),
+                      validators: dict = Depends(conditional_get("loan_history")), db: Session = Depends(get_db)):
     """
-    Tüm ödünç işlemlerini listeler.
+    `POST /loans/archive` ile loan_history tablosuna taşınan ödünç
+    işlemlerini listeler. `GET /loans/` yalnızca arşivlenmemiş kayıtları döndürür.
     
     - **skip**: Atlanacak kayıt sayısı (varsayılan: 0)
     - **limit**: Listelenecek maksimum kayıt sayısı (varsayılan: 100)
+    - **cursor**: Bir önceki yanıtın `X-Next-Cursor` başlığındaki imleç (opsiyonel, verilirse skip yok sayılır)
+    - **book_id**, **borrower_name**, **loan_date_from**, **loan_date_to**: Filtreler (opsiyonel)
     """
-    loans = db.query(models.Loan).offset(skip).limit(limit).all()
-    return loans 
\ No newline at end of file
+    query = db.query(models.LoanHistory).filter(*filters)
+    loans, next_cursor = paginate(
+        query, [models.LoanHistory.loan_date, models.LoanHistory.id], skip, limit, cursor
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return loans
+
+# Dışa aktarma endpoint'leri
+def export_response(generator, db: Session, name: str, fmt: export.ExportFormat, compress: bool) -> StreamingResponse:
+    # Oturum, gövde tamamen gönderildikten (ya da istemci koptuktan) sonra kapatılır
+    extension = fmt.value + (".gz" if compress else "")
+    media_type = "application/gzip" if compress else export.MEDIA_TYPES[fmt]
+    return StreamingResponse(
+        generator, media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{name}.{extension}"'},
+        background=BackgroundTask(db.close),
+    )
+
+@router.get("/export/books", tags=["Dışa Aktarma"],
+    summary="Kitapları dışa aktar",
+    description="Tüm kitapları akış halinde, gzip sıkıştırılmış NDJSON ya da CSV olarak indirir.",
+    response_class=StreamingResponse)
+def export_books(format: export.ExportFormat = export.ExportFormat.ndjson, compress: bool = True,
+                 filters: list = Depends(book_filters), db: Session = Depends(get_streaming_db)):
+    """
+    Kitapları sunucu tarafında partiler halinde okuyarak akış olarak döndürür;
+    bellek kullanımı tablo boyutundan bağımsızdır.
+    
+    - **format**: `ndjson` (varsayılan) ya da `csv`
+    - **compress**: gzip ile sıkıştır (varsayılan: true)
+    - **category_id**, **available**, **author**, **year_from**, **year_to**: Filtreler (opsiyonel)
+    """
+    generator = export.stream_export(db, book_columns, filters, [models.Book.id], format, compress)
+    return export_response(generator, db, "books", format, compress)
+
+@router.get("/export/loans", tags=["Dışa Aktarma"],
+    summary="Ödünç işlemlerini dışa aktar",
+    description="Ödünç işlemlerini akış halinde, gzip sıkıştırılmış NDJSON ya da CSV olarak indirir.",
+    response_class=StreamingResponse)
+def export_loans(format: export.ExportFormat = export.ExportFormat.ndjson, compress: bool = True,
+                 filters: list = Depends(loan_filters), db: Session = Depends(get_streaming_db)):
+    """
+    Ödünç işlemlerini ödünç alma tarihine göre akış olarak döndürür.
+    
+    - **format**: `ndjson` (varsayılan) ya da `csv`
+    - **compress**: gzip ile sıkıştır (varsayılan: true)
+    - **loan_date_from**, **loan_date_to**: Ödünç alma tarih aralığı (opsiyonel)
+    - **is_returned**, **book_id**, **borrower_name**: Diğer filtreler (opsiyonel)
+    """
+    generator = export.stream_export(
+        db, loan_columns, filters, [models.Loan.loan_date, models.Loan.id], format, compress
+    )
+    return export_response(generator, db, "loans", format, compress)
+
+# İstatistik endpoint'leri
+@router.get("/stats", response_model=schemas.LibraryStats, tags=["İstatistikler"],
+    summary="Kütüphane istatistikleri",
+    description="Toplam kitap, ödünçteki kitap, ortalama ödünç süresi ve en çok ödünç alınan kitap/yazarları döndürür.")
+def read_stats(top: int = Query(10, ge=1, le=100),
+               validators: dict = Depends(conditional_get("books", "library_stats", "book_loan_stats", "author_loan_stats")),
+               db: Session = Depends(get_db)):
+    """
+    Yazma işlemleriyle birlikte güncellenen özet tablolardan okur; ana
+    tabloları taramaz.
+    
+    - **top**: En çok ödünç alınan kitap ve yazar listelerinin uzunluğu (varsayılan: 10)
+    """
+    return stats.summary(db, top)
+
+@router.get("/stats/categories", response_model=List[schemas.CategoryStat], tags=["İstatistikler"],
+    summary="Kategori istatistikleri",
+    description="Her kategorideki kitap sayısını ve ödünçteki kitap sayısını döndürür.")
+def read_category_stats(skip: int = 0, limit: int = 100,
+                        validators: dict = Depends(conditional_get("categories", "category_stats")),
+                        db: Session = Depends(get_db)):
+    """
+    - **skip**: Atlanacak kayıt sayısı
+    - **limit**: Maksimum kayıt sayısı
+    """
+    return stats.category_stats(db, skip, limit)
+
+@router.post("/stats/rebuild", response_model=schemas.LibraryStats, tags=["İstatistikler"],
+    summary="İstatistikleri yeniden hesapla",
+    description="Özet tabloları ana tablolardan sıfırdan hesaplar. Veritabanı dışarıdan değiştirildiğinde kullanılır.")
+def rebuild_stats(db: Session = Depends(get_db)):
+    """
+    Özet tabloları tek transaction'da yeniden hesaplar ve güncel özeti döndürür.
+    """
+    stats.rebuild(db)
+    return stats.summary(db)
+
+# Yönetim endpoint'leri
+@router.post("/loans/archive", response_model=schemas.ArchiveResult, tags=["Yönetim"],
+    summary="Eski ödünçleri arşivle",
+    description="Belirtilen günden daha önce iade edilmiş ödünçleri partiler halinde loan_history tablosuna taşır.")
+def archive_loans(older_than_days: int = Query(365, ge=0),
+                  batch_size: int = Query(archive.ARCHIVE_BATCH_SIZE, ge=1, le=10000),
+                  max_batches: Optional[int] = Query(None, ge=1),
+                  db: Session = Depends(get_db)):
+    """
+    Her parti kendi transaction'ında taşınır; büyük arşivleme işleri
+    `max_batches` ile birden fazla çağrıya bölünebilir.
+    
+    - **older_than_days**: Bu kadar günden önce iade edilen ödünçler taşınır (varsayılan: 365)
+    - **batch_size**: Parti başına kayıt sayısı
+    - **max_batches**: Bu çağrıda çalıştırılacak en fazla parti sayısı (opsiyonel)
+    """
+    result = archive.archive_returned_loans(db, older_than_days, batch_size, max_batches)
+    return result
+
+@router.get("/events", tags=["Olaylar"],
+    summary="Değişiklik akışı",
+    description="Kitap ve ödünç değişikliklerini Server-Sent Events (text/event-stream) olarak yayınlar.",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}}})
+async def stream_events(request: Request, last_event_id: Optional[str] = None):
+    """
+    Yazma işlemlerinin ürettiği olayları (`book.created`, `book.updated`,
+    `book.deleted`, `book.bulk_created`, `loan.created`, `loan.returned`)
+    akış olarak gönderir. `reset` olayı, istemcinin bazı olayları kaçırdığını
+    ve listeleri yeniden yüklemesi gerektiğini bildirir.
+    
+    - **last_event_id**: Kaldığı yerden devam etmek için son alınan olay kimliği
+      (opsiyonel; tarayıcılar yeniden bağlanırken `Last-Event-ID` başlığını kendiliğinden gönderir)
+    """
+    if event_broker.is_full:
+        raise HTTPException(
+            status_code=503, detail="Çok fazla açık olay akışı var, lütfen daha sonra tekrar deneyin",
+            headers={"Retry-After": "5"},
+        )
+    return StreamingResponse(
+        event_stream(event_broker, request.headers.get("last-event-id") or last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/cache/stats", tags=["Yönetim"],
+    summary="Önbellek istatistikleri",
+    description="Okuma önbelleğinin isabet/ıskalama sayaçlarını ve doluluğunu gösterir.")
+def read_cache_stats():
+    """
+    Önbellek isabet (hits) ve ıskalama (misses) sayaçlarını döndürür.
+    """
+    return response_cache.stats()
+
+@router.get("/metrics", response_class=PlainTextResponse, tags=["Yönetim"],
+    summary="Prometheus metrikleri",
+    description="İstek gecikmeleri, durum kodları, SQL sayaç/süreleri ve önbellek sayaçlarını Prometheus metin formatında verir.")
+def read_metrics():
+    """
+    Prometheus metin formatında (0.0.4) metrikleri döndürür.
+    """
+    cache_stats = response_cache.stats()
+    cache_lines = [
+        "# HELP library_cache_hits_total Okuma önbelleği isabet sayısı.",
+        "# TYPE library_cache_hits_total counter",
+        f"library_cache_hits_total {cache_stats['hits']}",
+        "# HELP library_cache_misses_total Okuma önbelleği ıskalama sayısı.",
+        "# TYPE library_cache_misses_total counter",
+        f"library_cache_misses_total {cache_stats['misses']}",
+    ]
+    return PlainTextResponse(
+        metrics.render_metrics(cache_lines), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Motorlar işçi sürecinin açılışında oluşturulur, kapanışta kapatılır.
+    Şema kurulumu `python -m app.migrate` ile ayrıca yapılır; yalnızca
+    `auto_migrate` açıkken burada çalışır.
+    """
+    settings = app.state.settings
+    database = app.state.database
+    owned = database is None
+    if owned:
+        database = Database(settings)
+        app.state.database = database
+    if settings.auto_migrate:
+        migrate(database.engine)
+    try:
+        yield
+    finally:
+        if owned:
+            app.state.database = None
+            await database.dispose()
+
+
+def create_app(settings: Optional[Settings] = None, database: Optional[Database] = None) -> FastAPI:
+    """
+    Uygulamayı oluşturur. Import ve bu çağrı veritabanına dokunmaz; motorlar
+    lifespan'de oluşturulur.
+
+    - **settings**: Uygulama ayarları (varsayılan: `Settings.from_env()`)
+    - **database**: Hazır bir Database (ör. testlerde bellek içi motor); verilirse lifespan yeni motor oluşturmaz
+    """
+    settings = settings or Settings.from_env()
+    app = FastAPI(
+        lifespan=lifespan,
+        title="Kişisel Kütüphane API",
+        description="""
+    Bu API, kişisel kütüphane yönetimi için geliştirilmiş bir RESTful servistir.
+    
+    ## Özellikler
+    * 📚 Kitap yönetimi (ekleme, düzenleme, silme)
+    * 📋 Kategori yönetimi
+    * 📖 Kitap ödünç alma/verme sistemi
+    * 🔍 Kategoriye göre kitap filtreleme
+    * 🔎 Başlık ve yazarda tam metin arama
+    
+    ## Kullanım
+    API'yi kullanmak için aşağıdaki endpoint'leri kullanabilirsiniz.
+    """,
+        version="1.0.0",
+        contact={
+            "name": "Kütüphane Yönetimi",
+            "email": "kutuphane@example.com"
+        }
+    )
+    app.state.settings = settings
+    app.state.database = database
+
+    if settings.admission_control:
+        # Metrikler reddedilen istekleri de görsün diye en içte çalışır
+        app.add_middleware(AdmissionMiddleware)
+    app.add_middleware(metrics.MetricsMiddleware)
+    app.add_middleware(CompressionMiddleware)
+    if settings.replica_urls:
+        app.add_middleware(ReadYourWritesMiddleware, max_age=settings.read_your_writes_seconds)
+    metrics.instrument_engine()
+
+    router.include_into(app, settings.db_mode)
+    return app
+
+
+# `uvicorn app.main:app` için ortam değişkenleriyle oluşturulmuş uygulama;
+# `uvicorn --factory app.main:create_app` de kullanılabilir
+app = create_app()
@@ -0,0 +1,243 @@
+import logging
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+slow_query_logger = logging.getLogger("app.sql.slow")
+
+# Bu sürenin (ms) üzerindeki SQL ifadeleri loglanır; 0 kapalı demektir
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("LIBRARY_SLOW_QUERY_MS", "0"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labelnames: tuple, labelvalues: tuple, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, labelvalues)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labelvalues, value in items:
+            lines.extend(self._render_value(labelvalues, value))
+        return lines
+
+    def _render_value(self, labelvalues: tuple, value) -> list:
+        return [f"{self.name}{_format_labels(self.labelnames, labelvalues)} {value}"]
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, *labelvalues, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, *labelvalues, amount: float = 1) -> None:
+        self.inc(*labelvalues, amount=-amount)
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = buckets
+
+    def observe(self, *labelvalues, value: float) -> None:
+        with self._lock:
+            state = self._values.get(labelvalues)
+            if state is None:
+                state = self._values[labelvalues] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+            state[1] += value
+            state[2] += 1
+
+    def _render_value(self, labelvalues: tuple, value) -> list:
+        bucket_counts, total, count = value
+        lines = []
+        for bound, bucket_count in zip(self.buckets, bucket_counts):
+            labels = _format_labels(self.labelnames, labelvalues, f'le="{bound}"')
+            lines.append(f"{self.name}_bucket{labels} {bucket_count}")
+        labels = _format_labels(self.labelnames, labelvalues, 'le="+Inf"')
+        lines.append(f"{self.name}_bucket{labels} {count}")
+        lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labelvalues)} {total}")
+        lines.append(f"{self.name}_count{_format_labels(self.labelnames, labelvalues)} {count}")
+        return lines
+
+
+REQUEST_LATENCY = Histogram(
+    "library_http_request_duration_seconds", "HTTP istek süresi.", ("method", "route")
+)
+REQUESTS_TOTAL = Counter(
+    "library_http_requests_total", "Durum koduna göre HTTP istek sayısı.", ("method", "route", "status")
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "library_http_requests_in_flight", "İşlenmekte olan HTTP istek sayısı."
+)
+REQUESTS_IN_FLIGHT.inc(amount=0)
+QUERIES_PER_REQUEST = Histogram(
+    "library_db_queries_per_request", "İstek başına çalıştırılan SQL ifadesi sayısı.",
+    ("method", "route"), buckets=QUERY_COUNT_BUCKETS,
+)
+QUERY_TIME_PER_REQUEST = Histogram(
+    "library_db_query_time_per_request_seconds", "İstek başına toplam SQL süresi.", ("method", "route")
+)
+QUERY_DURATION = Histogram(
+    "library_db_query_duration_seconds", "Tek bir SQL ifadesinin süresi."
+)
+SLOW_QUERIES_TOTAL = Counter(
+    "library_db_slow_queries_total", "Yavaş sorgu eşiğini aşan SQL ifadesi sayısı."
+)
+REQUESTS_SHED = Counter(
+    "library_http_requests_shed_total", "Kabul kontrolünce reddedilen istek sayısı.", ("class", "reason")
+)
+
+REGISTRY = [
+    REQUEST_LATENCY, REQUESTS_TOTAL, REQUESTS_IN_FLIGHT,
+    QUERIES_PER_REQUEST, QUERY_TIME_PER_REQUEST, QUERY_DURATION, SLOW_QUERIES_TOTAL, REQUESTS_SHED,
+]
+
+
+class RequestQueryStats:
+    __slots__ = ("count", "duration")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+
+# Geçerli isteğin SQL sayaçları. Senkron endpoint'ler threadpool'da bağlamın
+# bir kopyasıyla çalışsa da aynı nesneyi gördükleri için sayaçlar isteğe yansır.
+current_query_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    QUERY_DURATION.observe(value=elapsed)
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += elapsed
+    if SLOW_QUERY_THRESHOLD_MS and elapsed * 1000 >= SLOW_QUERY_THRESHOLD_MS:
+        SLOW_QUERIES_TOTAL.inc()
+        slow_query_logger.warning("Yavaş sorgu (%.1f ms): %s", elapsed * 1000, statement)
+
+
+def instrument_engine(target=Engine) -> None:
+    """
+    SQL sayaç ve sürelerini toplayan olayları bağlar. Varsayılan olarak Engine
+    sınıfına bağlanır; böylece async motorun senkron çekirdeği ve testlerin
+    motorları da ölçülür.
+    """
+    if not event.contains(target, "before_cursor_execute", _before_cursor_execute):
+        event.listen(target, "before_cursor_execute", _before_cursor_execute)
+        event.listen(target, "after_cursor_execute", _after_cursor_execute)
+
+
+def _route_template(scope) -> str:
+    """
+    Etiket kardinalitesini sınırlamak için gerçek yol yerine route şablonunu
+    (/books/{book_id}) döndürür.
+    """
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    endpoint = scope.get("endpoint")
+    app = scope.get("app")
+    if endpoint is None or app is None:
+        return "unmatched"
+    for candidate in app.routes:
+        if getattr(candidate, "endpoint", None) is endpoint:
+            return candidate.path
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Route bazında gecikme histogramı, durum kodu sayaçları, eşzamanlı istek
+    sayısı ve istek başına SQL sayısı/süresi toplayan ASGI middleware'i.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        stats = RequestQueryStats()
+        token = current_query_stats.set(stats)
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            REQUESTS_IN_FLIGHT.dec()
+            current_query_stats.reset(token)
+            method, route = scope["method"], _route_template(scope)
+            REQUEST_LATENCY.observe(method, route, value=elapsed)
+            REQUESTS_TOTAL.inc(method, route, str(status_code))
+            QUERIES_PER_REQUEST.observe(method, route, value=stats.count)
+            QUERY_TIME_PER_REQUEST.observe(method, route, value=stats.duration)
+
+
+def render_metrics(extra_lines: list = ()) -> str:
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    lines.extend(extra_lines)
+    return "\n".join(lines) + "\n"
+
+
+def reset_metrics() -> None:
+    for metric in REGISTRY:
+        metric.clear()
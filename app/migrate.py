@@ -0,0 +1,34 @@
+"""
+Veritabanı şemasını ve türetilmiş yapıları kurar ya da günceller: eksik
+tablolar ve indeksler, ödünç id sayacı, tam metin arama indeksi ve özet
+istatistik tabloları.
+
+Uygulama süreçleri açılışta şemaya dokunmaz; bu adım dağıtım başına bir kez,
+sunucular başlatılmadan önce çalıştırılır:
+
+    python -m app.migrate
+"""
+from app import archive, models, search, stats
+from app.database import create_db_engine, create_missing_indexes
+from app.settings import Settings
+
+
+def migrate(engine) -> None:
+    models.Base.metadata.create_all(bind=engine)
+    archive.ensure_loan_id_sequence(engine)
+    create_missing_indexes(models.Base.metadata, engine)
+    search.ensure_search_index(engine)
+    stats.ensure_stats(engine)
+
+
+def main():
+    engine = create_db_engine(Settings.from_env())
+    try:
+        migrate(engine)
+    finally:
+        engine.dispose()
+    print("Veritabanı şeması güncel")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,9 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean
-from sqlalchemy.orm import relationship
+import itertools
+import time
+
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, Float, Index, event, insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, object_mapper, relationship
 from .database import Base
 
 class Category(Base):
@@ -12,6 +16,11 @@ class Category(Base):
 
 class Book(Base):
     __tablename__ = "books"
+    __table_args__ = (
+        # Kategori + müsaitlik filtreli listeler için; id (rowid) indeksin sonunda
+        # yer aldığından id sıralı keyset sayfalama da bu indeksi kullanır
+        Index("ix_books_category_id_available", "category_id", "available"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True)
@@ -26,12 +35,132 @@ class Book(Base):
 
 class Loan(Base):
     __tablename__ = "loans"
+    __table_args__ = (
+        # Keyset sayfalama için (loan_date, id) sıralı indeks
+        Index("ix_loans_loan_date_id", "loan_date", "id"),
+        # Aktif/iade edilmiş ödünçlerin tarih sıralı listelenmesi için
+        Index("ix_loans_is_returned_loan_date", "is_returned", "loan_date"),
+        # Bir kitabın aktif ödüncünün bulunması ve ödünç geçmişinin tarih
+        # sıralı listelenmesi için
+        Index("ix_loans_book_id_is_returned_loan_date", "book_id", "is_returned", "loan_date"),
+        # Arşivlenen ödünçler loan_history'ye özgün id'leriyle taşınır; silinen
+        # en büyük id'nin yeni bir ödünce verilmemesi için AUTOINCREMENT
+        {"sqlite_autoincrement": True},
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     book_id = Column(Integer, ForeignKey("books.id"))
-    borrower_name = Column(String)
+    borrower_name = Column(String, index=True)
     loan_date = Column(DateTime)
     return_date = Column(DateTime, nullable=True)
     is_returned = Column(Boolean, default=False)
     
-    book = relationship("Book", back_populates="loans") 
\ No newline at end of file
+    book = relationship("Book", back_populates="loans") 
+
+# İade edilmiş ve arşivlenmiş ödünçler. Kayıtlar loans tablosundan özgün id'leriyle
+# taşınır (bkz. app.archive); kitap silinmiş olabileceğinden books'a FK yoktur.
+class LoanHistory(Base):
+    __tablename__ = "loan_history"
+    __table_args__ = (
+        Index("ix_loan_history_loan_date_id", "loan_date", "id"),
+        Index("ix_loan_history_book_id_loan_date", "book_id", "loan_date"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    book_id = Column(Integer, nullable=False)
+    borrower_name = Column(String, index=True)
+    loan_date = Column(DateTime)
+    return_date = Column(DateTime)
+    archived_at = Column(DateTime)
+
+# Özet tablolar: yazma endpoint'lerinde artımlı olarak güncellenir, /stats
+# okumaları geçmiş boyutundan bağımsız kalır. Tutarsızlık durumunda
+# `python -m app.stats rebuild` ile ana tablolardan yeniden hesaplanır.
+class LibraryStats(Base):
+    __tablename__ = "library_stats"
+
+    id = Column(Integer, primary_key=True)
+    total_books = Column(Integer, nullable=False, default=0)
+    books_on_loan = Column(Integer, nullable=False, default=0)
+    total_loans = Column(Integer, nullable=False, default=0)
+    returned_loans = Column(Integer, nullable=False, default=0)
+    total_loan_seconds = Column(Float, nullable=False, default=0)
+
+class CategoryStats(Base):
+    __tablename__ = "category_stats"
+
+    category_id = Column(Integer, primary_key=True)
+    book_count = Column(Integer, nullable=False, default=0)
+    on_loan_count = Column(Integer, nullable=False, default=0)
+
+class BookLoanStats(Base):
+    __tablename__ = "book_loan_stats"
+
+    book_id = Column(Integer, primary_key=True)
+    loan_count = Column(Integer, nullable=False, default=0, index=True)
+
+class AuthorLoanStats(Base):
+    __tablename__ = "author_loan_stats"
+
+    author = Column(String, primary_key=True)
+    loan_count = Column(Integer, nullable=False, default=0, index=True)
+
+# Tablo bazlı değişiklik sürümleri. Koleksiyon yanıtlarının ETag ve
+# Last-Modified değerleri bu tablodan okunur (bkz. app.cache.conditional_get).
+# Sürümler yazmayla aynı transaction'da artırıldığından tüm işçiler aynı
+# değerleri görür ve replikalara verilerle birlikte kopyalanır.
+class TableVersion(Base):
+    __tablename__ = "table_versions"
+
+    table_name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    modified_at = Column(Float, nullable=False)
+
+WRITTEN_TABLES = "written_tables"
+
+@event.listens_for(TableVersion.__table__, "after_create")
+def _seed_table_versions(target, connection, **kw):
+    # Sürüm takibi başladığında her tablo için bir satır açılır; daha önceki
+    # yazmalar bu andan eski olduğundan Last-Modified doğru kalır
+    now = time.time()
+    connection.execute(insert(target), [
+        {"table_name": table.name, "version": 0, "modified_at": now}
+        for table in Base.metadata.sorted_tables if table is not target
+    ])
+
+def _written_tables(session) -> set:
+    return session.info.setdefault(WRITTEN_TABLES, set())
+
+@event.listens_for(Session, "before_flush")
+def _track_flushed_tables(session, flush_context, instances):
+    for obj in itertools.chain(session.new, session.dirty, session.deleted):
+        _written_tables(session).add(object_mapper(obj).local_table.name)
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_executed_tables(orm_execute_state):
+    # ORM üzerinden çalıştırılan toplu INSERT/UPDATE/DELETE ifadeleri
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _written_tables(orm_execute_state.session).add(orm_execute_state.statement.table.name)
+
+@event.listens_for(Session, "before_commit")
+def _bump_table_versions(session):
+    """
+    Oturumun yazdığı tabloların sürümlerini commit'ten önce aynı transaction'da artırır.
+    """
+    session.flush()
+    tables = session.info.pop(WRITTEN_TABLES, set()) - {TableVersion.__tablename__}
+    if not tables:
+        return
+    now = time.time()
+    statement = sqlite_insert(TableVersion.__table__)
+    session.connection().execute(
+        statement.on_conflict_do_update(
+            index_elements=[TableVersion.table_name],
+            set_={"version": TableVersion.version + 1, "modified_at": statement.excluded.modified_at},
+        ),
+        [{"table_name": table, "version": 1, "modified_at": now} for table in sorted(tables)],
+    )
+
+@event.listens_for(Session, "after_rollback")
+def _forget_written_tables(session):
+    session.info.pop(WRITTEN_TABLES, None)
@@ -0,0 +1,67 @@
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+# Bir sonraki sayfanın imlecini taşıyan yanıt başlığı
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: list) -> str:
+    """
+    Sıralama anahtarlarının değerlerini opak bir imlece dönüştürür.
+    """
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: list) -> list:
+    """
+    İmleci çözer ve değerleri sıralama kolonlarının tiplerine çevirir.
+    Bozuk imleçlerde 400 döner.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != len(columns):
+            raise ValueError
+        values = []
+        for column, value in zip(columns, payload):
+            if column.type.python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif not isinstance(value, column.type.python_type):
+                raise ValueError
+            values.append(value)
+        return values
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Geçersiz sayfalama imleci")
+
+
+def paginate(query, columns: list, skip: int, limit: int, cursor: str = None):
+    """
+    Sorguyu verilen kolonlara göre sıralayıp bir sayfa döndürür.
+
+    İmleç verilirse keyset (seek) sayfalama yapılır; son görülen anahtardan
+    sonrası indeks üzerinden okunur ve sayfa maliyeti derinlikten bağımsızdır.
+    İmleç yoksa eski skip/limit davranışı korunur. Her iki modda da sayfa
+    doluysa bir sonraki sayfanın imleci döner.
+    """
+    query = query.order_by(*columns)
+    if cursor:
+        values = decode_cursor(cursor, columns)
+        if len(columns) == 1:
+            query = query.filter(columns[0] > values[0])
+        else:
+            query = query.filter(tuple_(*columns) > tuple_(*values))
+    elif skip:
+        query = query.offset(skip)
+
+    rows = query.limit(limit).all()
+    next_cursor = None
+    if limit and len(rows) == limit:
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column in columns])
+    return rows, next_cursor
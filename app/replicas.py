@@ -0,0 +1,104 @@
+"""
+Okuma replikaları: isteklerin birincil veritabanı ile replikalar arasında
+yönlendirilmesi, yazma sonrası kısa süreli birincil yapışkanlığı
+(read-your-writes) ve yerel geliştirme/testler için SQLite backup API ile
+replika eşitleme.
+
+Replikayı yerelde güncel tutmak için:
+
+    LIBRARY_DB_REPLICA_URLS=sqlite:///./library-replica.db python -m app.replicas --interval 2
+"""
+import argparse
+import math
+import sqlite3
+import time
+
+from sqlalchemy.engine import make_url
+
+READ_METHODS = ("GET", "HEAD")
+PRIMARY_COOKIE = "library_primary"
+# Gövdesi sorgu taşıdığı için POST olan ama yazma yapmayan yollar
+READ_ONLY_POSTS = ("/books/lookup",)
+
+
+def uses_replica(request) -> bool:
+    """
+    GET/HEAD istekleri ve salt okunur POST'lar replikadan okunur. İstemci
+    yakın zamanda yazdıysa (yapışkanlık çerezi) kendi yazmasını görmesi için
+    birincile gider.
+    """
+    read_only = request.method in READ_METHODS or (
+        request.method == "POST" and request.url.path in READ_ONLY_POSTS
+    )
+    return read_only and PRIMARY_COOKIE not in request.cookies
+
+
+class ReadYourWritesMiddleware:
+    """
+    Başarılı yazma yanıtlarına `max_age` saniyelik bir çerez ekleyen ASGI
+    middleware'i; bu süre içinde istemcinin okumaları birincil veritabanından
+    yapılır. Çerez istemcide tutulduğundan birden çok işçi arasında da geçerlidir.
+    """
+
+    def __init__(self, app, max_age: float):
+        self.app = app
+        self.cookie = (
+            f"{PRIMARY_COOKIE}=1; Max-Age={max(math.ceil(max_age), 1)}; Path=/; HttpOnly; SameSite=Lax"
+        ).encode("latin-1")
+
+    async def __call__(self, scope, receive, send):
+        if (scope["type"] != "http" or scope["method"] in READ_METHODS + ("OPTIONS",)
+                or scope["path"] in READ_ONLY_POSTS):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                message = {**message, "headers": [*message["headers"], (b"set-cookie", self.cookie)]}
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def sqlite_path(url: str) -> str:
+    database = make_url(url).database
+    if not database or database == ":memory:":
+        raise ValueError(f"Dosya tabanlı bir SQLite adresi gerekli: {url}")
+    return database
+
+
+def sync_replica(primary_url: str, replica_url: str) -> None:
+    """
+    Birincil SQLite veritabanının tutarlı bir anlık görüntüsünü backup API ile
+    replika dosyasına kopyalar; gerçek bir replikasyonun yerel karşılığıdır.
+    """
+    source = sqlite3.connect(sqlite_path(primary_url))
+    target = sqlite3.connect(sqlite_path(replica_url))
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite okuma replikalarını birincil veritabanından eşitler")
+    parser.add_argument("--interval", type=float, default=0, help="Saniye cinsinden tekrar aralığı (0: bir kez)")
+    args = parser.parse_args()
+
+    from app.settings import Settings
+
+    settings = Settings.from_env()
+    if not settings.replica_urls:
+        parser.error("LIBRARY_DB_REPLICA_URLS tanımlı değil")
+    while True:
+        for replica_url in settings.replica_urls:
+            sync_replica(settings.database_url, replica_url)
+        print(f"{len(settings.replica_urls)} replika eşitlendi")
+        if not args.interval:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
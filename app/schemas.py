@@ -1,19 +1,46 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from enum import Enum
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, field_validator, model_validator
+from typing import Annotated, Dict, Optional, List
 from datetime import datetime
 
+# Giriş şemaları kısıtları taşır ve istek gövdesinde bir kez doğrulanır.
+# Çıkış şemaları kısıtsızdır; veritabanından okunan satırlar yeniden
+# doğrulanmaz (eski kayıtlar da sorunsuz serileştirilir).
+
+# ISBN-10 (kontrol hanesi X olabilir) ya da ISBN-13; tire ve boşluklar atılır
+ISBN_PATTERN = r"^(\d{9}[\dX]|\d{13})$"
+MIN_PUBLICATION_YEAR = 1000
+
+def max_publication_year() -> int:
+    # Uzun süre çalışan süreçlerde yıl dönümünde sınır eskimesin diye her
+    # doğrulamada hesaplanır
+    return datetime.now().year + 1
+
+def normalize_isbn(value):
+    if isinstance(value, str):
+        return value.replace("-", "").replace(" ", "").upper()
+    return value
+
+ISBN = Annotated[str, BeforeValidator(normalize_isbn), Field(pattern=ISBN_PATTERN)]
+
+class ListView(str, Enum):
+    full = "full"
+    summary = "summary"
+
 class CategoryBase(BaseModel):
     name: str
     description: Optional[str] = None
 
 class CategoryCreate(CategoryBase):
-    pass
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    name: str = Field(..., min_length=1, max_length=100)
+    description: Optional[str] = Field(None, max_length=1000)
 
 class Category(CategoryBase):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
-    
-    class Config:
-        from_attributes = True
 
 class BookBase(BaseModel):
     title: str
@@ -23,27 +50,177 @@ class BookBase(BaseModel):
     category_id: int
 
 class BookCreate(BookBase):
-    pass
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    title: str = Field(..., min_length=1, max_length=300)
+    author: str = Field(..., min_length=1, max_length=200)
+    isbn: ISBN
+    publication_year: int = Field(..., ge=MIN_PUBLICATION_YEAR)
+    category_id: int = Field(..., gt=0)
+
+    @field_validator("publication_year")
+    @classmethod
+    def check_publication_year(cls, value: int) -> int:
+        limit = max_publication_year()
+        if value > limit:
+            raise ValueError(f"Yayın yılı en fazla {limit} olabilir")
+        return value
 
 class Book(BookBase):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    available: bool
+
+# Liste ve seçim kutuları için hafif kitap şeması (`view=summary`)
+class BookSummary(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
+    title: str
+    author: str
     available: bool
-    
-    class Config:
-        from_attributes = True
 
 class LoanBase(BaseModel):
     book_id: int
     borrower_name: str
 
 class LoanCreate(LoanBase):
-    pass
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    book_id: int = Field(..., gt=0)
+    borrower_name: str = Field(..., min_length=1, max_length=100)
 
 class Loan(LoanBase):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     loan_date: datetime
     return_date: Optional[datetime] = None
     is_returned: bool
-    
-    class Config:
-        from_attributes = True 
\ No newline at end of file
+
+# Listeler için hafif ödünç şeması (`view=summary`)
+class LoanSummary(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    book_id: int
+    borrower_name: str
+    loan_date: datetime
+    is_returned: bool
+
+class LoanHistory(LoanBase):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    loan_date: datetime
+    return_date: Optional[datetime] = None
+    archived_at: datetime
+
+class ArchiveResult(BaseModel):
+    archived: int
+    batches: int
+    cutoff: datetime
+
+class BookDetail(Book):
+    category: Optional[Category] = None
+
+class LoanDetail(Loan):
+    book: Optional[BookDetail] = None
+
+class BulkBookResult(BaseModel):
+    index: int
+    status: str
+    id: Optional[int] = None
+    isbn: Optional[str] = None
+    error: Optional[str] = None
+
+class BulkBookResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkBookResult]
+
+# Tek istekte işlenebilecek en fazla ödünç/iade kalemi
+MAX_BULK_LOAN_ITEMS = 5000
+
+class BulkLoanCreate(BaseModel):
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    borrower_name: str = Field(..., min_length=1, max_length=100)
+    book_ids: List[int] = Field(..., min_length=1, max_length=MAX_BULK_LOAN_ITEMS)
+
+class BulkLoanResult(BaseModel):
+    book_id: int
+    status: str
+    loan_id: Optional[int] = None
+    error: Optional[str] = None
+
+class BulkLoanResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BulkLoanResult]
+
+class BulkLoanReturn(BaseModel):
+    loan_ids: List[int] = Field(..., min_length=1, max_length=MAX_BULK_LOAN_ITEMS)
+
+class BulkReturnResult(BaseModel):
+    loan_id: int
+    status: str
+    book_id: Optional[int] = None
+    error: Optional[str] = None
+
+class BulkReturnResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BulkReturnResult]
+
+# Tek istekte sorgulanabilecek en fazla id ve ISBN (toplam)
+MAX_LOOKUP_ITEMS = 5000
+
+class BookLookup(BaseModel):
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    ids: List[int] = Field(default_factory=list, max_length=MAX_LOOKUP_ITEMS)
+    # Geçersiz biçimdeki ISBN'ler isteği reddetmez, yanıtta bulunamadı olarak döner
+    isbns: List[Annotated[str, Field(max_length=32)]] = Field(default_factory=list, max_length=MAX_LOOKUP_ITEMS)
+
+    @model_validator(mode="after")
+    def check_item_count(self):
+        total = len(self.ids) + len(self.isbns)
+        if total == 0:
+            raise ValueError("En az bir id ya da ISBN gönderilmelidir")
+        if total > MAX_LOOKUP_ITEMS:
+            raise ValueError(f"Tek istekte en fazla {MAX_LOOKUP_ITEMS} id ve ISBN sorgulanabilir")
+        return self
+
+class BookLookupResponse(BaseModel):
+    found: int
+    missing: int
+    # Gönderilen değerle anahtarlanır; bulunamayanlar null döner
+    ids: Dict[int, Optional[Book]]
+    isbns: Dict[str, Optional[Book]]
+
+class BookStat(BaseModel):
+    book_id: int
+    title: str
+    author: str
+    loan_count: int
+
+class AuthorStat(BaseModel):
+    author: str
+    loan_count: int
+
+class CategoryStat(BaseModel):
+    category_id: int
+    name: str
+    book_count: int
+    on_loan_count: int
+
+class LibraryStats(BaseModel):
+    total_books: int
+    books_on_loan: int
+    total_loans: int
+    active_loans: int
+    average_loan_days: Optional[float] = None
+    top_books: List[BookStat]
+    top_authors: List[AuthorStat]
\ No newline at end of file
@@ -0,0 +1,81 @@
+import re
+
+from sqlalchemy import DDL, event, inspect, text
+from sqlalchemy.orm import Session
+
+from app import models
+
+# books tablosunun title/author kolonlarını indeksleyen harici içerikli FTS5 tablosu.
+# Metin ayrıca saklanmaz; eşleşen satırlar rowid üzerinden books'tan okunur.
+FTS_TABLE = "books_fts"
+
+CREATE_FTS_STATEMENTS = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, author, content='books', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON books BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, author) VALUES (new.id, new.title, new.author);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON books BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, author) VALUES ('delete', old.id, old.title, old.author);
+    END""",
+    # Yalnızca title/author değiştiğinde çalışır; ödünç işlemlerinde available
+    # güncellenirken indekse dokunulmaz
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, author ON books BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, author) VALUES ('delete', old.id, old.title, old.author);
+        INSERT INTO {FTS_TABLE}(rowid, title, author) VALUES (new.id, new.title, new.author);
+    END""",
+]
+
+# bm25 ağırlıkları: başlıktaki eşleşme yazardakinden daha değerlidir
+TITLE_WEIGHT = 10.0
+AUTHOR_WEIGHT = 5.0
+
+SEARCH_SQL = text(f"""
+    SELECT books.* FROM {FTS_TABLE}
+    JOIN books ON books.id = {FTS_TABLE}.rowid
+    WHERE {FTS_TABLE} MATCH :query
+    ORDER BY bm25({FTS_TABLE}, {TITLE_WEIGHT}, {AUTHOR_WEIGHT}), books.id
+    LIMIT :limit OFFSET :skip
+""")
+
+for statement in CREATE_FTS_STATEMENTS:
+    event.listen(models.Book.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(
+    models.Book.__table__, "before_drop", DDL(f"DROP TABLE IF EXISTS {FTS_TABLE}").execute_if(dialect="sqlite")
+)
+
+
+def ensure_search_index(engine) -> None:
+    """
+    FTS tablosu ve tetikleyicileri olmayan mevcut bir veritabanında bunları
+    oluşturur ve indeksi books tablosundan yeniden inşa eder.
+    """
+    if engine.dialect.name != "sqlite" or inspect(engine).has_table(FTS_TABLE):
+        return
+    with engine.begin() as conn:
+        for statement in CREATE_FTS_STATEMENTS:
+            conn.exec_driver_sql(statement)
+        conn.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def build_match_query(q: str) -> str:
+    """
+    Kullanıcı girdisini FTS5 sorgusuna çevirir: her kelime tırnak içine alınır
+    (operatör enjeksiyonunu önler) ve önek eşleşmesi için sonuna * eklenir.
+    """
+    terms = re.findall(r"\w+", q)
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def search_books(db: Session, q: str, skip: int = 0, limit: int = 20) -> list:
+    match_query = build_match_query(q)
+    if not match_query:
+        return []
+    return (
+        db.query(models.Book)
+        .from_statement(SEARCH_SQL)
+        .params(query=match_query, limit=limit, skip=skip)
+        .all()
+    )
@@ -0,0 +1,38 @@
+import os
+
+from fastapi import Response
+from pydantic_core import to_json
+
+try:
+    import orjson
+except ImportError:  # orjson opsiyoneldir; yoksa pydantic-core'un serileştiricisi kullanılır
+    orjson = None
+
+# Liste endpoint'lerinde ORM nesnesi ve satır başına Pydantic doğrulaması
+# yerine yalnızca şemadaki kolonları tuple olarak seçip doğrudan JSON'a
+# çeviren hızlı yol. Çıktı ve OpenAPI şeması response_model ile aynıdır.
+FAST_JSON_RESPONSES = os.getenv("LIBRARY_FAST_JSON", "1") == "1"
+
+
+def schema_columns(schema, model) -> list:
+    """
+    Şemanın alanlarına karşılık gelen model kolonlarını şema sırasıyla döndürür.
+    """
+    return [getattr(model, name) for name in schema.model_fields]
+
+
+def dumps(value) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return to_json(value)
+
+
+def rows_json_response(rows, headers: dict = None) -> Response:
+    """
+    Kolon seçimiyle gelen satırları doğrulamadan JSON yanıta çevirir.
+    """
+    return Response(
+        content=dumps([row._asdict() for row in rows]),
+        media_type="application/json",
+        headers=headers,
+    )
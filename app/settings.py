@@ -0,0 +1,62 @@
+import os
+from dataclasses import dataclass
+from typing import Tuple
+
+DB_MODES = ("sync", "async")
+
+
+def _env_flag(name: str, default: str = "0") -> bool:
+    return os.getenv(name, default).strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Uygulama ayarları. `create_app` bir Settings örneği alır; verilmezse
+    `Settings.from_env()` ile LIBRARY_* ortam değişkenlerinden okunur.
+
+    - **database_url**: Birincil veritabanı adresi
+    - **db_mode**: "sync" (threadpool'da senkron oturum) ya da "async" (aiosqlite)
+    - **sqlite_profile**: SQLite pragma profili ("default" ya da "production")
+    - **pool_size** / **max_overflow** / **pool_timeout**: Bağlantı havuzu ayarları
+    - **replica_urls**: GET isteklerinin okunduğu replika adresleri (boşsa tüm
+      istekler birincile gider)
+    - **read_your_writes_seconds**: Bir istemcinin yazmasından sonra okumalarının
+      birincilden yapıldığı süre
+    - **admission_control**: Kabul kontrolü ve yük atma middleware'i (bkz. app/admission.py)
+    - **auto_migrate**: Açıksa şema, uygulama açılışında (lifespan) kurulur;
+      yalnızca tek süreçli geliştirme ortamı içindir
+    """
+    database_url: str = "sqlite:///./library.db"
+    db_mode: str = "sync"
+    sqlite_profile: str = "default"
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+    replica_urls: Tuple[str, ...] = ()
+    read_your_writes_seconds: float = 5.0
+    admission_control: bool = True
+    auto_migrate: bool = False
+
+    def __post_init__(self):
+        if self.db_mode not in DB_MODES:
+            raise ValueError(f"Bilinmeyen veritabanı modu: {self.db_mode}")
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        return cls(
+            database_url=os.getenv("LIBRARY_DATABASE_URL", cls.database_url),
+            db_mode=os.getenv("LIBRARY_DB_MODE", cls.db_mode),
+            sqlite_profile=os.getenv("LIBRARY_SQLITE_PROFILE", cls.sqlite_profile),
+            pool_size=int(os.getenv("LIBRARY_DB_POOL_SIZE", str(cls.pool_size))),
+            max_overflow=int(os.getenv("LIBRARY_DB_MAX_OVERFLOW", str(cls.max_overflow))),
+            pool_timeout=float(os.getenv("LIBRARY_DB_POOL_TIMEOUT", str(cls.pool_timeout))),
+            replica_urls=tuple(
+                url.strip() for url in os.getenv("LIBRARY_DB_REPLICA_URLS", "").split(",") if url.strip()
+            ),
+            read_your_writes_seconds=float(
+                os.getenv("LIBRARY_READ_YOUR_WRITES_SECONDS", str(cls.read_your_writes_seconds))
+            ),
+            admission_control=_env_flag("LIBRARY_ADMISSION_CONTROL", "1"),
+            auto_migrate=_env_flag("LIBRARY_AUTO_MIGRATE"),
+        )
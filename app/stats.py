@@ -0,0 +1,254 @@
+import argparse
+from typing import Optional
+
+from sqlalchemy import bindparam, case, delete, func, insert, literal, select, union_all
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app import models
+
+# Tüm sayaç güncellemeleri yazma işleminin kendi transaction'ı içinde yapılır;
+# böylece özet tablolar ana tablolarla birlikte commit ya da rollback olur.
+
+
+def _increment(db: Session, model, keys: list, rows: list) -> None:
+    """
+    Anahtar kolonlara göre satırı yoksa ekler, varsa sayaçları artırır
+    (INSERT ... ON CONFLICT DO UPDATE). Birden fazla satır executemany ile işlenir.
+    """
+    if not rows:
+        return
+    table = model.__table__
+    columns = list(rows[0])
+    statement = sqlite_insert(table).values({column: bindparam(column) for column in columns})
+    statement = statement.on_conflict_do_update(
+        index_elements=keys,
+        set_={column: table.c[column] + statement.excluded[column] for column in columns if column not in keys},
+    )
+    db.execute(statement, rows)
+
+
+def _increment_library(db: Session, **deltas) -> None:
+    _increment(db, models.LibraryStats, ["id"], [{"id": 1, **deltas}])
+
+
+def _group_counts(values: list) -> dict:
+    counts = {}
+    for value in values:
+        if value is not None:
+            counts[value] = counts.get(value, 0) + 1
+    return counts
+
+
+def books_added(db: Session, category_ids: list) -> None:
+    _increment_library(db, total_books=len(category_ids))
+    _increment(db, models.CategoryStats, ["category_id"], [
+        {"category_id": category_id, "book_count": count}
+        for category_id, count in _group_counts(category_ids).items()
+    ])
+
+
+def _book_loan_count(db: Session, book_id: int) -> int:
+    return db.scalar(
+        select(models.BookLoanStats.loan_count).where(models.BookLoanStats.book_id == book_id)
+    ) or 0
+
+
+def book_removed(db: Session, book_id: int, category_id: Optional[int], author: str, available: bool) -> None:
+    on_loan = 0 if available else 1
+    _increment_library(db, total_books=-1, books_on_loan=-on_loan)
+    if category_id is not None:
+        _increment(db, models.CategoryStats, ["category_id"], [
+            {"category_id": category_id, "book_count": -1, "on_loan_count": -on_loan}
+        ])
+    loan_count = _book_loan_count(db, book_id)
+    if loan_count:
+        _increment(db, models.AuthorLoanStats, ["author"], [{"author": author, "loan_count": -loan_count}])
+        db.execute(delete(models.BookLoanStats).where(models.BookLoanStats.book_id == book_id))
+
+
+def book_updated(db: Session, book_id: int, old: tuple, new: tuple, available: bool) -> None:
+    """
+    old/new: kitabın güncelleme öncesi ve sonrası (category_id, author) değerleri
+    """
+    (old_category_id, old_author), (new_category_id, new_author) = old, new
+    if old_category_id != new_category_id:
+        on_loan = 0 if available else 1
+        rows = [{"category_id": new_category_id, "book_count": 1, "on_loan_count": on_loan}]
+        if old_category_id is not None:
+            rows.append({"category_id": old_category_id, "book_count": -1, "on_loan_count": -on_loan})
+        _increment(db, models.CategoryStats, ["category_id"], rows)
+    if old_author != new_author:
+        loan_count = _book_loan_count(db, book_id)
+        if loan_count:
+            _increment(db, models.AuthorLoanStats, ["author"], [
+                {"author": old_author, "loan_count": -loan_count},
+                {"author": new_author, "loan_count": loan_count},
+            ])
+
+
+def loans_created(db: Session, books: list) -> None:
+    """
+    books: ödünç verilen her kitap için (book_id, author, category_id)
+    """
+    _increment_library(db, total_loans=len(books), books_on_loan=len(books))
+    _increment(db, models.CategoryStats, ["category_id"], [
+        {"category_id": category_id, "on_loan_count": count}
+        for category_id, count in _group_counts([category_id for _, _, category_id in books]).items()
+    ])
+    _increment(db, models.BookLoanStats, ["book_id"], [
+        {"book_id": book_id, "loan_count": count}
+        for book_id, count in _group_counts([book_id for book_id, _, _ in books]).items()
+    ])
+    _increment(db, models.AuthorLoanStats, ["author"], [
+        {"author": author, "loan_count": count}
+        for author, count in _group_counts([author for _, author, _ in books]).items()
+    ])
+
+
+def loans_returned(db: Session, loan_seconds: list, released_category_ids: list) -> None:
+    """
+    loan_seconds: iade edilen her ödüncün süresi (saniye)
+    released_category_ids: yeniden müsait olan her kitabın kategorisi
+    (ödünçteyken silinmiş kitaplar bu listede yer almaz)
+    """
+    _increment_library(
+        db,
+        returned_loans=len(loan_seconds),
+        total_loan_seconds=float(sum(loan_seconds)),
+        books_on_loan=-len(released_category_ids),
+    )
+    _increment(db, models.CategoryStats, ["category_id"], [
+        {"category_id": category_id, "on_loan_count": -count}
+        for category_id, count in _group_counts(released_category_ids).items()
+    ])
+
+
+def rebuild(db: Session) -> None:
+    """
+    Özet tabloları ana tablolardan tek transaction'da yeniden hesaplar.
+    Arşivlenmiş ödünçler (loan_history) de toplamlara dahildir.
+    """
+    Book, Loan, History = models.Book, models.Loan, models.LoanHistory
+    for model in (models.LibraryStats, models.CategoryStats, models.BookLoanStats, models.AuthorLoanStats):
+        db.execute(delete(model))
+
+    all_loans = union_all(
+        select(Loan.book_id, Loan.loan_date, Loan.return_date, Loan.is_returned),
+        select(History.book_id, History.loan_date, History.return_date, literal(True)),
+    ).subquery()
+    loan_seconds = (func.julianday(all_loans.c.return_date) - func.julianday(all_loans.c.loan_date)) * 86400
+    db.execute(insert(models.LibraryStats).from_select(
+        ["id", "total_books", "books_on_loan", "total_loans", "returned_loans", "total_loan_seconds"],
+        select(
+            literal(1),
+            select(func.count()).select_from(Book).scalar_subquery(),
+            select(func.count()).select_from(Book).where(Book.available == False).scalar_subquery(),
+            select(func.count()).select_from(all_loans).scalar_subquery(),
+            select(func.count()).select_from(all_loans).where(all_loans.c.is_returned == True).scalar_subquery(),
+            select(func.coalesce(func.sum(loan_seconds), 0)).where(all_loans.c.is_returned == True).scalar_subquery(),
+        ),
+    ))
+    db.execute(insert(models.CategoryStats).from_select(
+        ["category_id", "book_count", "on_loan_count"],
+        select(
+            Book.category_id, func.count(), func.sum(case((Book.available == False, 1), else_=0))
+        ).where(Book.category_id.is_not(None)).group_by(Book.category_id),
+    ))
+    db.execute(insert(models.BookLoanStats).from_select(
+        ["book_id", "loan_count"],
+        select(all_loans.c.book_id, func.count())
+        .join(Book, Book.id == all_loans.c.book_id).group_by(all_loans.c.book_id),
+    ))
+    db.execute(insert(models.AuthorLoanStats).from_select(
+        ["author", "loan_count"],
+        select(Book.author, func.count()).join(all_loans, all_loans.c.book_id == Book.id)
+        .where(Book.author.is_not(None)).group_by(Book.author),
+    ))
+    db.commit()
+
+
+def is_initialized(db: Session) -> bool:
+    return db.get(models.LibraryStats, 1) is not None
+
+
+def ensure_stats(engine) -> None:
+    """
+    Özet tabloları henüz hesaplanmamış (ör. bu özellikten önce oluşturulmuş)
+    bir veritabanında bunları bir kez yeniden hesaplar.
+    """
+    with Session(engine) as db:
+        if not is_initialized(db):
+            rebuild(db)
+
+
+def summary(db: Session, top: int = 10) -> dict:
+    library = db.get(models.LibraryStats, 1) or models.LibraryStats(
+        total_books=0, books_on_loan=0, total_loans=0, returned_loans=0, total_loan_seconds=0
+    )
+    return {
+        "total_books": library.total_books,
+        "books_on_loan": library.books_on_loan,
+        "total_loans": library.total_loans,
+        "active_loans": library.total_loans - library.returned_loans,
+        "average_loan_days": (
+            round(library.total_loan_seconds / library.returned_loans / 86400, 2)
+            if library.returned_loans else None
+        ),
+        "top_books": top_books(db, top),
+        "top_authors": top_authors(db, top),
+    }
+
+
+def top_books(db: Session, limit: int) -> list:
+    rows = db.execute(
+        select(models.BookLoanStats.book_id, models.Book.title, models.Book.author, models.BookLoanStats.loan_count)
+        .join(models.Book, models.Book.id == models.BookLoanStats.book_id)
+        .order_by(models.BookLoanStats.loan_count.desc(), models.BookLoanStats.book_id.desc())
+        .limit(limit)
+    )
+    return [row._asdict() for row in rows]
+
+
+def top_authors(db: Session, limit: int) -> list:
+    rows = db.execute(
+        select(models.AuthorLoanStats.author, models.AuthorLoanStats.loan_count)
+        .where(models.AuthorLoanStats.loan_count > 0)
+        .order_by(models.AuthorLoanStats.loan_count.desc(), models.AuthorLoanStats.author)
+        .limit(limit)
+    )
+    return [row._asdict() for row in rows]
+
+
+def category_stats(db: Session, skip: int, limit: int) -> list:
+    rows = db.execute(
+        select(
+            models.CategoryStats.category_id, models.Category.name,
+            models.CategoryStats.book_count, models.CategoryStats.on_loan_count,
+        )
+        .join(models.Category, models.Category.id == models.CategoryStats.category_id)
+        .order_by(models.CategoryStats.category_id)
+        .offset(skip)
+        .limit(limit)
+    )
+    return [row._asdict() for row in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kütüphane istatistik tabloları")
+    parser.add_argument("command", choices=["rebuild"], help="rebuild: özet tabloları yeniden hesapla")
+    parser.parse_args()
+
+    from app.database import create_db_engine
+    from app.settings import Settings
+
+    # Şemanın `python -m app.migrate` ile kurulmuş olduğu varsayılır
+    engine = create_db_engine(Settings.from_env())
+    with Session(engine) as db:
+        rebuild(db)
+    engine.dispose()
+    print("İstatistikler yeniden hesaplandı")
+
+
+if __name__ == "__main__":
+    main()
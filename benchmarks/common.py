@@ -0,0 +1,162 @@
+"""
+Benchmark betiklerinin ortak yardımcıları: örnek veri yükleme, uygulamayı
+süreç içinde eşzamanlı istemcilerle sürme ve her senaryoyu ayrı bir süreçte
+(farklı ortam değişkenleriyle) çalıştırma.
+"""
+import asyncio
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def create_benchmark_app():
+    """
+    Ortam değişkenlerindeki ayarlarla uygulamayı oluşturur ve şemayı kurar.
+    httpx.ASGITransport lifespan'i çalıştırmadığından Database doğrudan verilir.
+    """
+    from dataclasses import replace
+
+    from app.database import Database
+    from app.main import create_app
+    from app.migrate import migrate
+    from app.settings import Settings
+
+    settings = Settings.from_env()
+    if "LIBRARY_ADMISSION_CONTROL" not in os.environ:
+        # Benchmark'lar kapasiteyi ölçer; yük atma açık olsaydı aşırı yük 503 hatalarına dönüşürdü
+        settings = replace(settings, admission_control=False)
+    database = Database(settings)
+    migrate(database.engine)
+    return create_app(settings, database=database)
+
+
+def seed_books(app, count: int = 1000) -> None:
+    """
+    Uygulamanın veritabanına tek kategori altında `count` kitap ekler.
+    """
+    from app import models
+
+    db = app.state.database.SessionLocal()
+    category = models.Category(name="Benchmark")
+    db.add(category)
+    db.flush()
+    db.add_all(
+        models.Book(
+            title=f"Kitap {i}", author=f"Yazar {i % 50}", isbn=f"978{i:010d}",
+            publication_year=1900 + i % 120, category_id=category.id,
+        )
+        for i in range(count)
+    )
+    db.commit()
+    db.close()
+
+
+def seed_loans(app, count: int, book_count: int) -> None:
+    """
+    İlk `book_count` kitap üzerinde `count` ödünç kaydı ekler; sonuncusu hariç
+    hepsi iade edilmiş olarak işaretlenir.
+    """
+    from datetime import datetime, timedelta
+
+    from app import models
+
+    db = app.state.database.SessionLocal()
+    start = datetime(2020, 1, 1)
+    db.add_all(
+        models.Loan(
+            book_id=i % book_count + 1, borrower_name=f"Okur {i % 500}",
+            loan_date=start + timedelta(minutes=i),
+            return_date=start + timedelta(minutes=i, days=14) if i < count - 1 else None,
+            is_returned=i < count - 1,
+        )
+        for i in range(count)
+    )
+    db.commit()
+    db.close()
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """
+    Sıralı bir listenin en yakın sıra (nearest-rank) yöntemiyle yüzdeliği.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[rank]
+
+
+def drive(app, calls: list, concurrency: int) -> dict:
+    """
+    (method, url, json) üçlülerinden oluşan istekleri `concurrency` eşzamanlı
+    istemciyle uygulamaya gönderir; RPS ve p50/p95/p99 gecikmelerini döndürür.
+    """
+    import httpx
+
+    async def run():
+        latencies = []
+        errors = 0
+        queue = asyncio.Queue()
+        for call in calls:
+            queue.put_nowait(call)
+
+        async def client_loop(client):
+            nonlocal errors
+            while not queue.empty():
+                method, url, body = queue.get_nowait()
+                started = time.perf_counter()
+                response = await client.request(method, url, json=body)
+                latencies.append(time.perf_counter() - started)
+                if response.status_code >= 400:
+                    errors += 1
+
+        # Havuz zaman aşımı gibi uygulama hataları 500 olarak sayılır
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            started = time.perf_counter()
+            await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+            elapsed = time.perf_counter() - started
+        # Async motorun bağlantıları bu event loop'a bağlıdır; döngü kapanmadan
+        # bırakılır (motorlar sonraki çağrılarda yeni bağlantı açar)
+        await app.state.database.dispose()
+
+        latencies.sort()
+        return {
+            "requests": len(calls),
+            "concurrency": concurrency,
+            "errors": errors,
+            "rps": round(len(calls) / elapsed, 1),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        }
+
+    return asyncio.run(run())
+
+
+def run_scenario(module: str, env: dict, args: list) -> dict:
+    """
+    `python -m <module> --worker ...` komutunu geçici bir SQLite dosyasıyla ve
+    verilen ortam değişkenleriyle çalıştırır; son satırdaki JSON sonucu döndürür.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(
+            os.environ,
+            LIBRARY_DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            **env,
+        )
+        output = subprocess.run(
+            [sys.executable, "-m", module, *args],
+            env=env, check=True, capture_output=True, text=True,
+        ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def print_result(name: str, result: dict) -> None:
+    print(
+        f"{name:>10}: {result['rps']:>8} istek/sn  p50={result['p50_ms']} ms  "
+        f"p99={result['p99_ms']} ms  hata={result['errors']}"
+    )
@@ -0,0 +1,47 @@
+"""
+Senkron ve async veritabanı modlarının eşzamanlılık karşılaştırması.
+
+Her mod ayrı bir süreçte (LIBRARY_DB_MODE ortam değişkeniyle) başlatılır,
+geçici bir SQLite dosyasına örnek veri yüklenir ve uygulama httpx'in ASGI
+transport'u ile süreç içinde, verilen eşzamanlılıkta istek yağmuruna tutulur.
+
+Kullanım:
+    python -m benchmarks.db_modes --requests 1000 --concurrency 100
+"""
+import argparse
+import json
+
+from benchmarks.common import create_benchmark_app, drive, print_result, run_scenario, seed_books
+
+
+def run_worker(total_requests: int, concurrency: int) -> dict:
+    app = create_benchmark_app()
+    seed_books(app, 1000)
+    calls = [
+        ("GET", f"/books/{i % 1000 + 1}" if i % 2 else "/books/?limit=50", None)
+        for i in range(total_requests)
+    ]
+    return drive(app, calls, concurrency)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--worker", choices=["sync", "async"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.requests, args.concurrency)))
+        return
+
+    for mode in ("sync", "async"):
+        result = run_scenario(
+            "benchmarks.db_modes", {"LIBRARY_DB_MODE": mode},
+            ["--worker", mode, "--requests", str(args.requests), "--concurrency", str(args.concurrency)],
+        )
+        print_result(mode, result)
+
+
+if __name__ == "__main__":
+    main()
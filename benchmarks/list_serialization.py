@@ -0,0 +1,50 @@
+"""
+Büyük liste yanıtlarında serileştirme yolu karşılaştırması.
+
+"orm" senaryosu ORM nesnelerini response_model ile satır başına doğrulayıp
+FastAPI'nin genel kodlayıcısıyla serileştirir (LIBRARY_FAST_JSON=0); "fast"
+senaryosu yalnızca şema kolonlarını tuple olarak seçip doğrudan JSON'a çevirir.
+
+Kullanım:
+    python -m benchmarks.list_serialization --requests 200 --limit 1000
+"""
+import argparse
+import json
+
+from benchmarks.common import create_benchmark_app, drive, print_result, run_scenario, seed_books, seed_loans
+
+BOOK_COUNT = 5000
+
+
+def run_worker(total_requests: int, limit: int) -> dict:
+    app = create_benchmark_app()
+    seed_books(app, BOOK_COUNT)
+    seed_loans(app, BOOK_COUNT, BOOK_COUNT)
+    calls = [
+        ("GET", f"/books/?limit={limit}" if i % 2 else f"/loans/?limit={limit}", None)
+        for i in range(total_requests)
+    ]
+    return drive(app, calls, concurrency=4)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.requests, args.limit)))
+        return
+
+    for name, fast_json in (("orm", "0"), ("fast", "1")):
+        result = run_scenario(
+            "benchmarks.list_serialization", {"LIBRARY_FAST_JSON": fast_json},
+            ["--worker", "--requests", str(args.requests), "--limit", str(args.limit)],
+        )
+        print_result(name, result)
+
+
+if __name__ == "__main__":
+    main()
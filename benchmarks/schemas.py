@@ -0,0 +1,130 @@
+"""
+Pydantic şemalarının doğrulama ve serileştirme maliyeti mikrobenchmark'ı.
+
+Her şema için işlem başına süre (mikrosaniye) ölçülür:
+- giriş şemaları: istek gövdesine karşılık gelen sözlükten doğrulama
+  (`model_validate`) ve `model_dump`; karşılaştırma için eski `.dict()`
+- çıkış şemaları: ORM nesnesinden doğrulama (`from_attributes`),
+  `model_dump` ve `model_dump_json`
+- liste şemaları: `limit` satırlık bir sayfanın TypeAdapter ile doğrulanıp
+  JSON'a çevrilmesi; tam (`Book`, `Loan`) ve hafif (`BookSummary`,
+  `LoanSummary`) liste öğeleri karşılaştırılır
+
+Veritabanı kullanılmaz; ORM nesneleri oturuma eklenmeden oluşturulur.
+
+Kullanım:
+    python -m benchmarks.schemas --number 20000 --limit 1000
+"""
+import argparse
+import timeit
+import warnings
+from datetime import datetime
+from typing import List
+
+from pydantic import TypeAdapter
+
+from app import models, schemas
+
+BOOK_PAYLOAD = {
+    "title": "Suç ve Ceza", "author": "Fyodor Dostoyevski", "isbn": "978-0-306-40615-7",
+    "publication_year": 1866, "category_id": 1,
+}
+LOAN_PAYLOAD = {"book_id": 1, "borrower_name": "Okur"}
+CATEGORY_PAYLOAD = {"name": "Roman", "description": "Roman kategorisi"}
+
+
+def per_call_us(func, number: int) -> float:
+    # En iyi üç tekrarın en küçüğü; gürültüyü azaltır
+    return round(min(timeit.repeat(func, number=number, repeat=3)) / number * 1e6, 2)
+
+
+def sample_book(i: int = 1) -> models.Book:
+    return models.Book(
+        id=i, title=f"Kitap {i}", author=f"Yazar {i % 50}", isbn=f"978{i:010d}",
+        publication_year=2000, category_id=1, available=True,
+    )
+
+
+def sample_loan(i: int = 1) -> models.Loan:
+    return models.Loan(
+        id=i, book_id=i, borrower_name=f"Okur {i}", loan_date=datetime(2024, 1, 1),
+        return_date=None, is_returned=False,
+    )
+
+
+def input_results(number: int) -> list:
+    results = []
+    for schema, payload in (
+        (schemas.CategoryCreate, CATEGORY_PAYLOAD),
+        (schemas.BookCreate, BOOK_PAYLOAD),
+        (schemas.LoanCreate, LOAN_PAYLOAD),
+    ):
+        instance = schema.model_validate(payload)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            legacy_dict = per_call_us(instance.dict, number)
+        results.append((schema.__name__, {
+            "validate": per_call_us(lambda: schema.model_validate(payload), number),
+            "model_dump": per_call_us(instance.model_dump, number),
+            "dict (eski)": legacy_dict,
+        }))
+    return results
+
+
+def output_results(number: int) -> list:
+    book, loan = sample_book(), sample_loan()
+    loan.book = book
+    results = []
+    for schema, obj in (
+        (schemas.Book, book),
+        (schemas.BookSummary, book),
+        (schemas.Loan, loan),
+        (schemas.LoanSummary, loan),
+        (schemas.LoanDetail, loan),
+    ):
+        instance = schema.model_validate(obj)
+        results.append((schema.__name__, {
+            "validate": per_call_us(lambda: schema.model_validate(obj), number),
+            "model_dump": per_call_us(instance.model_dump, number),
+            "dump_json": per_call_us(instance.model_dump_json, number),
+        }))
+    return results
+
+
+def list_results(limit: int, number: int) -> list:
+    books = [sample_book(i) for i in range(1, limit + 1)]
+    loans = [sample_loan(i) for i in range(1, limit + 1)]
+    results = []
+    for schema, rows in (
+        (schemas.Book, books),
+        (schemas.BookSummary, books),
+        (schemas.Loan, loans),
+        (schemas.LoanSummary, loans),
+    ):
+        adapter = TypeAdapter(List[schema])
+        results.append((f"List[{schema.__name__}]", {
+            "validate+dump_json": per_call_us(lambda: adapter.dump_json(adapter.validate_python(rows)), number),
+        }))
+    return results
+
+
+def print_table(title: str, results: list) -> None:
+    print(title)
+    for name, timings in results:
+        cells = "  ".join(f"{key}={value} µs" for key, value in timings.items())
+        print(f"{name:>20}: {cells}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=20000, help="Tekil ölçümlerde tekrar sayısı")
+    parser.add_argument("--limit", type=int, default=1000, help="Liste ölçümlerinde sayfa boyutu")
+    args = parser.parse_args()
+
+    print_table("Giriş şemaları", input_results(args.number))
+    print_table("Çıkış şemaları", output_results(args.number))
+    print_table(f"Liste sayfası ({args.limit} satır)", list_results(args.limit, max(args.number // args.limit, 5)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+SQLite "default" ve "production" profillerinin karışık okuma/yazma yükü
+altında karşılaştırması.
+
+Yükün yaklaşık %80'i okuma (kitap detayı ve liste), %20'si yazmadır
+(ödünç verme ve kitap güncelleme). Her profil ayrı bir süreçte
+LIBRARY_SQLITE_PROFILE ortam değişkeniyle çalıştırılır.
+
+Kullanım:
+    python -m benchmarks.sqlite_profile --requests 2000 --concurrency 10
+"""
+import argparse
+import json
+
+from benchmarks.common import create_benchmark_app, drive, print_result, run_scenario, seed_books
+
+BOOK_COUNT = 5000
+
+
+def run_worker(total_requests: int, concurrency: int) -> dict:
+    app = create_benchmark_app()
+    seed_books(app, BOOK_COUNT)
+    calls = []
+    loans = 0
+    for i in range(total_requests):
+        book_id = i % BOOK_COUNT + 1
+        if i % 10 == 0:
+            # Her kitap en fazla bir kez ödünç verilir, böylece yazmalar 400 almaz
+            loans += 1
+            calls.append(("POST", "/loans/", {"book_id": loans, "borrower_name": f"Okur {i}"}))
+        elif i % 10 == 5:
+            calls.append(("PUT", f"/books/{book_id}", {
+                "title": f"Kitap {i}", "author": "Yazar", "isbn": f"978{book_id - 1:010d}",
+                "publication_year": 2000, "category_id": 1,
+            }))
+        elif i % 2:
+            calls.append(("GET", f"/books/{book_id}", None))
+        else:
+            calls.append(("GET", "/books/?limit=50", None))
+    return drive(app, calls, concurrency)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.requests, args.concurrency)))
+        return
+
+    for profile in ("default", "production"):
+        result = run_scenario(
+            "benchmarks.sqlite_profile", {"LIBRARY_SQLITE_PROFILE": profile},
+            ["--worker", "--requests", str(args.requests), "--concurrency", str(args.concurrency)],
+        )
+        print_result(profile, result)
+
+
+if __name__ == "__main__":
+    main()
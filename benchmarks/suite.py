@@ -0,0 +1,329 @@
+"""
+Kütüphane API'si için yük testi ve benchmark paketi.
+
+`run` alt komutu geçici bir SQLite dosyasına app.models tabloları üzerinden
+gerçekçi boyutta veri yükler (varsayılan: 10k kategori, 500k kitap, 2M ödünç),
+uygulamayı httpx'in ASGI transport'u ile süreç içinde eşzamanlı istemcilerle
+sürer ve her endpoint için RPS ile p50/p95/p99 gecikmelerini raporlar.
+Sonuçlar JSON olarak kaydedilir.
+
+`compare` alt komutu iki sonuç dosyasını karşılaştırır ve herhangi bir
+endpoint'in gecikmesi eşiği aşacak kadar kötüleşmişse sıfırdan farklı kodla
+çıkar; CI'da gerileme kontrolü için kullanılabilir.
+
+Kullanım:
+    python -m benchmarks.suite run --output results.json
+    python -m benchmarks.suite run --books 50000 --loans 200000 --baseline results.json
+    python -m benchmarks.suite compare results.json new.json --threshold 0.2
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.common import create_benchmark_app, drive
+
+INSERT_BATCH_SIZE = 50000
+# Toplu senaryolarda istek başına kalem sayısı
+BULK_ITEMS = 100
+LOOKUP_ITEMS = 100
+
+
+def seed_dataset(engine, categories: int, books: int, loans: int, seed: int = 42) -> dict:
+    """
+    Veriyi app.models tabloları üzerinden toplu INSERT'lerle yükler.
+
+    Ödünçlerin çoğu iade edilmiştir; kitapların ~%5'i aktif ödünçtedir ve
+    müsait değildir. Yükleme sonunda planlayıcı istatistikleri için ANALYZE
+    çalıştırılır.
+    """
+    from sqlalchemy import insert, text
+
+    from app import models
+
+    rng = random.Random(seed)
+    active_loans = min(books // 20, loans)
+
+    def batched(rows):
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == INSERT_BATCH_SIZE:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    with engine.begin() as conn:
+        for batch in batched(
+            {"name": f"Kategori {i}", "description": f"Kategori {i} açıklaması"} for i in range(categories)
+        ):
+            conn.execute(insert(models.Category), batch)
+
+        words = ["Gece", "Deniz", "Yol", "Şehir", "Ayna", "Rüzgar", "Saat", "Kuyu", "Bahçe", "Ateş"]
+        for batch in batched(
+            {
+                "title": f"{rng.choice(words)} {rng.choice(words)} {i}",
+                "author": f"Yazar {rng.randrange(books // 10 + 1)}",
+                "isbn": f"978{i:010d}",
+                "publication_year": rng.randint(1900, 2024),
+                "category_id": rng.randrange(categories) + 1,
+                # İlk `active_loans` kitap aktif ödünçtedir
+                "available": i >= active_loans,
+            }
+            for i in range(books)
+        ):
+            conn.execute(insert(models.Book), batch)
+
+        start = datetime(2020, 1, 1)
+        returned_loans = loans - active_loans
+
+        def loan_rows():
+            for i in range(returned_loans):
+                loan_date = start + timedelta(seconds=i * 60)
+                yield {
+                    "book_id": rng.randrange(books) + 1,
+                    "borrower_name": f"Okur {rng.randrange(50000)}",
+                    "loan_date": loan_date,
+                    "return_date": loan_date + timedelta(days=rng.randint(1, 30)),
+                    "is_returned": True,
+                }
+            for i in range(active_loans):
+                yield {
+                    "book_id": i + 1,
+                    "borrower_name": f"Okur {rng.randrange(50000)}",
+                    "loan_date": start + timedelta(seconds=(returned_loans + i) * 60),
+                    "return_date": None,
+                    "is_returned": False,
+                }
+
+        for batch in batched(loan_rows()):
+            conn.execute(insert(models.Loan), batch)
+        conn.execute(text("ANALYZE"))
+
+    # Veri API atlanarak yüklendiği için özet tablolar sıfırdan hesaplanır
+    from sqlalchemy.orm import Session
+
+    from app import stats
+
+    with Session(engine) as db:
+        stats.rebuild(db)
+
+    return {"categories": categories, "books": books, "loans": loans, "active_loans": active_loans}
+
+
+def build_scenarios(dataset: dict, requests: int, seed: int = 42) -> list:
+    """
+    (isim, istek listesi) çiftleri döndürür. Yazma senaryoları okuma
+    senaryolarından sonra çalışır; ödünç senaryoları yalnızca müsait kitapları,
+    kitap güncelleme/silme senaryoları yalnızca benchmark'ın eklediği kitapları
+    kullanır.
+
+    Kapsam dışı bırakılan endpoint'ler:
+
+    - `GET /events`: Uzun ömürlü akış; istek/sn ve gecikme ile ölçülemez
+    - `GET /metrics`, `GET /cache/stats` ve dokümantasyon yolları: Yönetim uçları
+    - `POST /stats/rebuild`, `POST /loans/archive`: Tüm veri kümesini yeniden yazan
+      yönetim işleri; sonraki senaryoların ölçümlerini bozar
+
+    `loans_history` senaryosu arşivlenmiş kayıt olmadan boş tabloyu okur.
+    """
+    rng = random.Random(seed)
+    books, categories = dataset["books"], dataset["categories"]
+    active_loans = dataset["active_loans"]
+    prefixes = ["gec", "den", "yol", "şeh", "ayn", "rüz", "saa", "kuy", "bah", "ate"]
+
+    def repeat(make):
+        return [make(i) for i in range(requests)]
+
+    def new_book(isbn: str, i: int) -> dict:
+        return {
+            "title": f"Benchmark Kitap {i}", "author": f"Yazar {i % 100}", "isbn": isbn,
+            "publication_year": 2000 + i % 25, "category_id": rng.randrange(categories) + 1,
+        }
+
+    def seeded_isbn(book_id: int) -> str:
+        # seed_dataset'teki ISBN biçimi; id'ler 1'den başlar
+        return f"978{book_id - 1:010d}"
+
+    # Her ödünç isteği farklı, müsait bir kitabı kullanır; tekil ve toplu ödünç
+    # senaryoları aynı kitaplara dokunmaz
+    bulk_requests = max(requests // BULK_ITEMS, 1)
+    available = range(active_loans + 1, books + 1)
+    sample = rng.sample(available, min(requests + bulk_requests * BULK_ITEMS, len(available)))
+    checkout_books, bulk_checkout_books = sample[:requests], sample[requests:]
+    bulk_checkout_batches = [
+        bulk_checkout_books[start:start + BULK_ITEMS] for start in range(0, len(bulk_checkout_books), BULK_ITEMS)
+    ]
+    first_new_loan_id = dataset["loans"] + 1
+    first_bulk_loan_id = first_new_loan_id + len(checkout_books)
+    # POST /books/ ile eklenen kitaplar veri kümesinin ardından gelen id'leri alır
+    first_new_book_id = books + 1
+
+    return [
+        ("categories_list", repeat(lambda i: ("GET", "/categories/?limit=100", None))),
+        ("books_list", repeat(lambda i: ("GET", "/books/?limit=100", None))),
+        ("books_list_deep_skip", repeat(lambda i: ("GET", f"/books/?skip={books - 200}&limit=100", None))),
+        ("books_list_filtered", repeat(
+            lambda i: ("GET", f"/books/?category_id={rng.randrange(categories) + 1}&available=true", None)
+        )),
+        ("book_detail", repeat(lambda i: ("GET", f"/books/{rng.randrange(books) + 1}", None))),
+        ("books_search", repeat(lambda i: ("GET", f"/books/search?q={rng.choice(prefixes)}", None))),
+        ("books_lookup", repeat(lambda i: ("POST", "/books/lookup", {
+            "ids": [rng.randrange(books) + 1 for _ in range(LOOKUP_ITEMS)],
+            "isbns": [seeded_isbn(rng.randrange(books) + 1) for _ in range(LOOKUP_ITEMS)],
+        }))),
+        ("stats", repeat(lambda i: ("GET", "/stats", None))),
+        ("stats_categories", repeat(lambda i: ("GET", "/stats/categories?limit=100", None))),
+        ("loans_list", repeat(lambda i: ("GET", "/loans/?limit=100", None))),
+        ("loans_active_details", repeat(
+            lambda i: ("GET", "/loans/details?is_returned=false&limit=100&include_category=true", None)
+        )),
+        ("loans_history", repeat(lambda i: ("GET", "/loans/history?limit=100", None))),
+        # Filtreli dışa aktarmalar akış yolunu tüm tabloyu indirmeden ölçer
+        ("export_books", repeat(
+            lambda i: ("GET", f"/export/books?category_id={rng.randrange(categories) + 1}", None)
+        )),
+        ("export_loans", repeat(lambda i: ("GET", f"/export/loans?book_id={rng.randrange(books) + 1}", None))),
+        ("category_create", repeat(
+            lambda i: ("POST", "/categories/", {"name": f"Benchmark Kategori {i}", "description": ""})
+        )),
+        ("book_create", repeat(lambda i: ("POST", "/books/", new_book(f"979{i:010d}", i)))),
+        # Eşzamanlı eklemelerde id sırası istek sırasından farklı olabileceğinden
+        # güncellemeler yeni, benzersiz ISBN'ler kullanır
+        ("book_update", repeat(
+            lambda i: ("PUT", f"/books/{first_new_book_id + i}", new_book(f"976{i:010d}", i + 1))
+        )),
+        ("book_delete", repeat(lambda i: ("DELETE", f"/books/{first_new_book_id + i}", None))),
+        ("books_bulk_create", [
+            ("POST", "/books/bulk", [
+                new_book(f"977{i * BULK_ITEMS + j:010d}", j) for j in range(BULK_ITEMS)
+            ])
+            for i in range(bulk_requests)
+        ]),
+        ("loan_checkout", [
+            ("POST", "/loans/", {"book_id": book_id, "borrower_name": f"Benchmark {i}"})
+            for i, book_id in enumerate(checkout_books)
+        ]),
+        ("loan_return", [
+            ("PUT", f"/loans/{first_new_loan_id + i}/return", None) for i in range(len(checkout_books))
+        ]),
+        ("loans_bulk_checkout", [
+            ("POST", "/loans/bulk", {"borrower_name": f"Benchmark Sepet {i}", "book_ids": batch})
+            for i, batch in enumerate(bulk_checkout_batches)
+        ]),
+        ("loans_bulk_return", [
+            ("PUT", "/loans/return/bulk", {
+                "loan_ids": list(range(first_bulk_loan_id + start, first_bulk_loan_id + start + len(batch)))
+            })
+            for start, batch in zip(range(0, len(bulk_checkout_books), BULK_ITEMS), bulk_checkout_batches)
+        ]),
+    ]
+
+
+def run(args) -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["LIBRARY_DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'suite.db')}"
+        app = create_benchmark_app()
+        engine = app.state.database.engine
+
+        started = time.perf_counter()
+        dataset = seed_dataset(engine, args.categories, args.books, args.loans)
+        print(f"Veri yüklendi ({time.perf_counter() - started:.1f} sn): {dataset}", file=sys.stderr)
+
+        results = {
+            "meta": {
+                "dataset": dataset,
+                "requests": args.requests,
+                "concurrency": args.concurrency,
+                "python": platform.python_version(),
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+            },
+            "endpoints": {},
+        }
+        for name, calls in build_scenarios(dataset, args.requests):
+            result = drive(app, calls, args.concurrency)
+            results["endpoints"][name] = result
+            print(
+                f"{name:>22}: {result['rps']:>8} istek/sn  p50={result['p50_ms']} ms  "
+                f"p95={result['p95_ms']} ms  p99={result['p99_ms']} ms  hata={result['errors']}"
+            )
+        engine.dispose()
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"Sonuçlar kaydedildi: {args.output}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            return report_regressions(json.load(f), results, args.threshold, args.metric)
+    return 0
+
+
+def find_regressions(baseline: dict, current: dict, threshold: float, metric: str = "p95_ms") -> list:
+    """
+    Gecikmesi (metric) temel ölçüme göre `threshold` oranından fazla artan
+    endpoint'leri (isim, eski, yeni) olarak döndürür. Hata sayısındaki artış da
+    gerileme sayılır.
+    """
+    regressions = []
+    for name, base in baseline["endpoints"].items():
+        new = current["endpoints"].get(name)
+        if new is None:
+            continue
+        if new[metric] > base[metric] * (1 + threshold):
+            regressions.append((name, base[metric], new[metric]))
+        elif new["errors"] > base["errors"]:
+            regressions.append((f"{name} (hata)", base["errors"], new["errors"]))
+    return regressions
+
+
+def report_regressions(baseline: dict, current: dict, threshold: float, metric: str) -> int:
+    regressions = find_regressions(baseline, current, threshold, metric)
+    for name, old, new in regressions:
+        print(f"GERİLEME {name}: {old} -> {new} ({metric}, eşik %{threshold * 100:.0f})")
+    if not regressions:
+        print(f"Gerileme yok ({metric}, eşik %{threshold * 100:.0f})")
+    return 1 if regressions else 0
+
+
+def compare(args) -> int:
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+    return report_regressions(baseline, current, args.threshold, args.metric)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Veriyi yükle ve benchmark'ı çalıştır")
+    run_parser.add_argument("--categories", type=int, default=10000)
+    run_parser.add_argument("--books", type=int, default=500000)
+    run_parser.add_argument("--loans", type=int, default=2000000)
+    run_parser.add_argument("--requests", type=int, default=500, help="Endpoint başına istek sayısı")
+    run_parser.add_argument("--concurrency", type=int, default=10)
+    run_parser.add_argument("--output", default="benchmark_results.json")
+    run_parser.add_argument("--baseline", help="Karşılaştırılacak önceki sonuç dosyası")
+
+    compare_parser = subparsers.add_parser("compare", help="İki sonuç dosyasını karşılaştır")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+
+    for sub in (run_parser, compare_parser):
+        sub.add_argument("--threshold", type=float, default=0.2, help="İzin verilen gecikme artışı oranı")
+        sub.add_argument("--metric", default="p95_ms", choices=["p50_ms", "p95_ms", "p99_ms"])
+
+    args = parser.parse_args()
+    sys.exit(run(args) if args.command == "run" else compare(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,110 @@
 import streamlit as st
-import requests
 from datetime import datetime
 
-# API URL'si
-API_URL = "http://localhost:8000"
+from api_client import LibraryClient, create_transport
+
+# Okuma önbelleklerinin süresi (saniye). Kendi yazmalarımızdan sonra önbellek
+# hemen temizlenir; TTL yalnızca başka istemcilerin değişiklikleri içindir.
+CATEGORIES_TTL = 300
+LIST_TTL = 30
+
+PAGE_SIZES = [25, 50, 100]
+# API'nin arama endpoint'inin kabul ettiği en büyük sayfa
+SEARCH_LIMIT = 100
+
+@st.cache_resource
+def get_transport():
+    # Tüm oturumlar ve yeniden çizimler aynı bağlantı havuzunu paylaşır
+    return create_transport()
+
+def get_client() -> LibraryClient:
+    # Her oturumun kendi istemcisi vardır; read-your-writes çerezi ve ETag'ler
+    # kullanıcılar arasında paylaşılmaz
+    if "client" not in st.session_state:
+        st.session_state.client = LibraryClient(transport=get_transport())
+    return st.session_state.client
+
+@st.cache_data(ttl=CATEGORIES_TTL, show_spinner=False)
+def fetch_categories() -> list:
+    return get_client().get("/categories/", {"limit": 1000})
+
+@st.cache_data(ttl=LIST_TTL, show_spinner=False)
+def fetch_books_page(limit: int, cursor: str = None, category_id: int = None, available: bool = None,
+                     view: str = "full") -> tuple:
+    return get_client().get_page(
+        "/books/",
+        {"limit": limit, "cursor": cursor, "category_id": category_id, "available": available, "view": view},
+    )
+
+@st.cache_data(ttl=LIST_TTL, show_spinner=False)
+def search_books(q: str, skip: int, limit: int) -> list:
+    return get_client().get("/books/search", {"q": q, "skip": skip, "limit": limit})
+
+@st.cache_data(ttl=LIST_TTL, show_spinner=False)
+def fetch_loans_page(limit: int, cursor: str = None, is_returned: bool = None) -> tuple:
+    return get_client().get_page("/loans/details", {"limit": limit, "cursor": cursor, "is_returned": is_returned})
+
+def clear_caches(*fetchers) -> None:
+    """
+    Başarılı bir yazmadan sonra etkilenen okuma önbelleklerini temizler.
+    """
+    for fetcher in fetchers:
+        fetcher.clear()
+
+def page_cursor(key: str, filters: tuple):
+    """
+    Sayfalı bir tablonun geçerli sayfa imlecini döndürür. Filtreler
+    değiştiğinde ilk sayfaya dönülür.
+    """
+    state = st.session_state.setdefault(key, {"filters": filters, "cursors": [None]})
+    if state["filters"] != filters:
+        state["filters"] = filters
+        state["cursors"] = [None]
+    return state["cursors"][-1]
+
+def page_controls(key: str, next_cursor) -> None:
+    """
+    Önceki/sonraki sayfa düğmeleri. Geri dönüş için ziyaret edilen sayfaların
+    imleçleri saklanır; sonraki sayfa sunucunun verdiği imleçle istenir.
+    """
+    state = st.session_state[key]
+    col1, col2, col3 = st.columns([1, 1, 6])
+    if col1.button("◀ Önceki", key=f"{key}_prev", disabled=len(state["cursors"]) == 1):
+        state["cursors"].pop()
+        st.rerun()
+    if col2.button("Sonraki ▶", key=f"{key}_next", disabled=next_cursor is None):
+        state["cursors"].append(next_cursor)
+        st.rerun()
+    col3.caption(f"Sayfa {len(state['cursors'])}")
+
+def book_search_page(key: str, q: str, limit: int, **filters) -> tuple:
+    """
+    Arama kutusu doluysa tam metin aramayı (skip ile), boşsa kitap listesini
+    (imleçle) sayfalar; (kitaplar, sonraki sayfa imleci) döndürür.
+    """
+    cursor = page_cursor(key, (q, limit, tuple(sorted(filters.items()))))
+    if q:
+        skip = cursor or 0
+        books = search_books(q, skip, min(limit, SEARCH_LIMIT))
+        next_skip = skip + len(books) if len(books) == min(limit, SEARCH_LIMIT) else None
+        return books, next_skip
+    return fetch_books_page(limit, cursor, **filters)
+
+def loan_label(loan: dict) -> str:
+    book_title = loan["book"]["title"] if loan["book"] else "Silinmiş Kitap"
+    return f"{book_title} - {loan['borrower_name']}"
+
+def loan_rows(loans: list) -> list:
+    return [
+        {
+            "Kitap": loan["book"]["title"] if loan["book"] else "Silinmiş Kitap",
+            "Ödünç Alan": loan["borrower_name"],
+            "Ödünç Alma Tarihi": loan["loan_date"],
+            "İade Tarihi": loan["return_date"] or "İade Edilmemiş",
+            "Durum": "İade Edildi" if loan["is_returned"] else "Ödünç Verilmiş",
+        }
+        for loan in loans
+    ]
 
 st.set_page_config(
     page_title="Kütüphane Yönetim Sistemi",
@@ -23,7 +124,7 @@ if menu == "Ana Sayfa":
     st.header("Hoş Geldiniz!")
     st.write("""
     Bu uygulama ile kütüphanenizi kolayca yönetebilirsiniz.
-    
+
     ### Özellikler:
     - 📖 Kitap ekleme, düzenleme ve silme
     - 📑 Kategori yönetimi
@@ -33,45 +134,63 @@ if menu == "Ana Sayfa":
 
 elif menu == "Kitaplar":
     st.header("Kitap Yönetimi")
-    
+
     tab1, tab2 = st.tabs(["Kitap Listesi", "Yeni Kitap Ekle"])
-    
+
     with tab1:
-        # Kategori filtresi
         try:
-            categories = requests.get(f"{API_URL}/categories/").json()
-            category_filter = st.selectbox(
+            categories = fetch_categories()
+            # Seçim kutuları ve tablo için sabit zamanlı ad/ID eşlemeleri
+            category_names = {cat["id"]: cat["name"] for cat in categories}
+
+            col1, col2, col3 = st.columns([3, 2, 1])
+            query = col1.text_input("Başlık ya da yazarda ara", key="book_search").strip()
+            category_id = col2.selectbox(
                 "Kategoriye Göre Filtrele",
-                ["Tümü"] + [cat["name"] for cat in categories]
+                options=[None] + list(category_names),
+                format_func=lambda x: "Tümü" if x is None else category_names[x],
+                disabled=bool(query),
             )
-            
-            # Kitapları listele
-            if category_filter == "Tümü":
-                books = requests.get(f"{API_URL}/books/").json()
-            else:
-                selected_category = next(cat for cat in categories if cat["name"] == category_filter)
-                books = requests.get(f"{API_URL}/books/?category_id={selected_category['id']}").json()
-            
-            for book in books:
-                with st.expander(f"{book['title']} - {book['author']}"):
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.write(f"**ISBN:** {book['isbn']}")
-                        st.write(f"**Yayın Yılı:** {book['publication_year']}")
-                    with col2:
-                        st.write(f"**Durum:** {'Müsait' if book['available'] else 'Ödünç Verilmiş'}")
-                        if st.button("Sil", key=f"delete_{book['id']}"):
-                            response = requests.delete(f"{API_URL}/books/{book['id']}")
-                            if response.status_code == 200:
-                                st.success("Kitap başarıyla silindi!")
-                                st.rerun()
-                            
+            limit = col3.selectbox("Sayfa Boyutu", PAGE_SIZES, index=1)
+
+            books, next_cursor = book_search_page("books_page", query, limit, category_id=category_id)
+            st.dataframe(
+                [
+                    {
+                        "ID": book["id"],
+                        "Başlık": book["title"],
+                        "Yazar": book["author"],
+                        "ISBN": book["isbn"],
+                        "Yayın Yılı": book["publication_year"],
+                        "Kategori": category_names.get(book["category_id"], "-"),
+                        "Müsait": book["available"],
+                    }
+                    for book in books
+                ],
+                use_container_width=True,
+                hide_index=True,
+            )
+            page_controls("books_page", next_cursor)
+
+            if books:
+                book_labels = {book["id"]: f"{book['title']} - {book['author']}" for book in books}
+                col1, col2 = st.columns([4, 1])
+                book_id = col1.selectbox("Bu sayfadan kitap seç", options=list(book_labels), format_func=book_labels.get)
+                if col2.button("Sil", key="delete_book"):
+                    response = get_client().delete(f"/books/{book_id}")
+                    if response.status_code == 200:
+                        clear_caches(fetch_books_page, search_books, fetch_loans_page)
+                        st.success("Kitap başarıyla silindi!")
+                        st.rerun()
+                    else:
+                        st.error("Kitap silinirken bir hata oluştu!")
         except Exception as e:
             st.error(f"Kitaplar yüklenirken bir hata oluştu: {str(e)}")
-    
+
     with tab2:
         try:
-            categories = requests.get(f"{API_URL}/categories/").json()
+            categories = fetch_categories()
+            category_names = {cat["id"]: cat["name"] for cat in categories}
             with st.form("new_book_form"):
                 title = st.text_input("Kitap Adı")
                 author = st.text_input("Yazar")
@@ -79,13 +198,13 @@ elif menu == "Kitaplar":
                 publication_year = st.number_input("Yayın Yılı", min_value=1000, max_value=datetime.now().year)
                 category_id = st.selectbox(
                     "Kategori",
-                    options=[cat["id"] for cat in categories],
-                    format_func=lambda x: next(cat["name"] for cat in categories if cat["id"] == x)
+                    options=list(category_names),
+                    format_func=category_names.get
                 )
-                
+
                 if st.form_submit_button("Kitap Ekle"):
-                    response = requests.post(
-                        f"{API_URL}/books/",
+                    response = get_client().post(
+                        "/books/",
                         json={
                             "title": title,
                             "author": author,
@@ -95,6 +214,7 @@ elif menu == "Kitaplar":
                         }
                     )
                     if response.status_code == 200:
+                        clear_caches(fetch_books_page, search_books)
                         st.success("Kitap başarıyla eklendi!")
                     else:
                         st.error("Kitap eklenirken bir hata oluştu!")
@@ -103,97 +223,111 @@ elif menu == "Kitaplar":
 
 elif menu == "Kategoriler":
     st.header("Kategori Yönetimi")
-    
+
     tab1, tab2 = st.tabs(["Kategori Listesi", "Yeni Kategori Ekle"])
-    
+
     with tab1:
         try:
-            categories = requests.get(f"{API_URL}/categories/").json()
-            for category in categories:
-                with st.expander(category["name"]):
-                    st.write(f"**Açıklama:** {category['description']}")
+            categories = fetch_categories()
+            st.dataframe(
+                [{"Kategori": category["name"], "Açıklama": category["description"]} for category in categories],
+                use_container_width=True,
+                hide_index=True,
+            )
         except Exception as e:
             st.error(f"Kategoriler yüklenirken bir hata oluştu: {str(e)}")
-    
+
     with tab2:
         with st.form("new_category_form"):
             name = st.text_input("Kategori Adı")
             description = st.text_area("Açıklama")
-            
+
             if st.form_submit_button("Kategori Ekle"):
-                response = requests.post(
-                    f"{API_URL}/categories/",
+                response = get_client().post(
+                    "/categories/",
                     json={
                         "name": name,
                         "description": description
                     }
                 )
                 if response.status_code == 200:
+                    clear_caches(fetch_categories)
                     st.success("Kategori başarıyla eklendi!")
                 else:
                     st.error("Kategori eklenirken bir hata oluştu!")
 
 elif menu == "Ödünç İşlemleri":
     st.header("Ödünç İşlemleri")
-    
+
     tab1, tab2, tab3 = st.tabs(["Ödünç Al", "İade Et", "Ödünç Kayıtları"])
-    
+
     with tab1:
         try:
-            books = requests.get(f"{API_URL}/books/").json()
-            available_books = [book for book in books if book["available"]]
-            
+            # Tüm katalog yerine aramayla daraltılmış tek bir sayfa müsait kitap yüklenir
+            query = st.text_input("Kitap ara", key="loan_book_search").strip()
+            if query:
+                books = [book for book in search_books(query, 0, SEARCH_LIMIT) if book["available"]]
+            else:
+                books, _ = fetch_books_page(SEARCH_LIMIT, available=True, view="summary")
+            book_labels = {book["id"]: f"{book['title']} - {book['author']}" for book in books}
+
             with st.form("loan_form"):
                 book_id = st.selectbox(
                     "Kitap",
-                    options=[book["id"] for book in available_books],
-                    format_func=lambda x: next(book["title"] for book in available_books if book["id"] == x)
+                    options=list(book_labels),
+                    format_func=book_labels.get
                 )
                 borrower_name = st.text_input("Ödünç Alan Kişi")
-                
+
                 if st.form_submit_button("Ödünç Ver"):
-                    response = requests.post(
-                        f"{API_URL}/loans/",
+                    response = get_client().post(
+                        "/loans/",
                         json={
                             "book_id": book_id,
                             "borrower_name": borrower_name
                         }
                     )
                     if response.status_code == 200:
+                        clear_caches(fetch_books_page, search_books, fetch_loans_page)
                         st.success("Kitap başarıyla ödünç verildi!")
                     else:
                         st.error("Ödünç verme işlemi başarısız oldu!")
         except Exception as e:
             st.error(f"Bir hata oluştu: {str(e)}")
-    
+
     with tab2:
         try:
-            loans = requests.get(f"{API_URL}/loans/").json()
-            active_loans = [loan for loan in loans if not loan["is_returned"]]
-            
+            limit = st.selectbox("Sayfa Boyutu", PAGE_SIZES, index=1, key="active_loans_limit")
+            cursor = page_cursor("active_loans_page", (limit,))
+            # Kitap bilgisi gömülü tek istek; iade filtresi sunucuda uygulanır
+            active_loans, next_cursor = fetch_loans_page(limit, cursor, is_returned=False)
+
             if active_loans:
-                for loan in active_loans:
-                    book = requests.get(f"{API_URL}/books/{loan['book_id']}").json()
-                    with st.expander(f"{book['title']} - {loan['borrower_name']}"):
-                        st.write(f"Ödünç Alma Tarihi: {loan['loan_date']}")
-                        if st.button("İade Et", key=f"return_{loan['id']}"):
-                            response = requests.put(f"{API_URL}/loans/{loan['id']}/return")
-                            if response.status_code == 200:
-                                st.success("Kitap başarıyla iade edildi!")
-                                st.rerun()
+                st.dataframe(loan_rows(active_loans), use_container_width=True, hide_index=True)
+                page_controls("active_loans_page", next_cursor)
+
+                loan_labels = {loan["id"]: loan_label(loan) for loan in active_loans}
+                col1, col2 = st.columns([4, 1])
+                loan_id = col1.selectbox("Bu sayfadan ödünç seç", options=list(loan_labels), format_func=loan_labels.get)
+                if col2.button("İade Et", key="return_loan"):
+                    response = get_client().put(f"/loans/{loan_id}/return")
+                    if response.status_code == 200:
+                        clear_caches(fetch_books_page, search_books, fetch_loans_page)
+                        st.success("Kitap başarıyla iade edildi!")
+                        st.rerun()
+                    else:
+                        st.error("İade işlemi başarısız oldu!")
             else:
                 st.info("İade edilmemiş ödünç kayıt bulunmamaktadır.")
         except Exception as e:
             st.error(f"Bir hata oluştu: {str(e)}")
-    
+
     with tab3:
         try:
-            loans = requests.get(f"{API_URL}/loans/").json()
-            for loan in loans:
-                book = requests.get(f"{API_URL}/books/{loan['book_id']}").json()
-                with st.expander(f"{book['title']} - {loan['borrower_name']}"):
-                    st.write(f"**Ödünç Alma Tarihi:** {loan['loan_date']}")
-                    st.write(f"**İade Tarihi:** {loan['return_date'] if loan['return_date'] else 'İade Edilmemiş'}")
-                    st.write(f"**Durum:** {'İade Edildi' if loan['is_returned'] else 'Ödünç Verilmiş'}")
+            limit = st.selectbox("Sayfa Boyutu", PAGE_SIZES, index=1, key="loans_limit")
+            cursor = page_cursor("loans_page", (limit,))
+            loans, next_cursor = fetch_loans_page(limit, cursor)
+            st.dataframe(loan_rows(loans), use_container_width=True, hide_index=True)
+            page_controls("loans_page", next_cursor)
         except Exception as e:
-            st.error(f"Bir hata oluştu: {str(e)}") 
\ No newline at end of file
+            st.error(f"Bir hata oluştu: {str(e)}")
\ No newline at end of file
@@ -5,8 +5,10 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 import uuid
 
-from app.main import app
-from app.database import Base, get_db
+from app.main import create_app
+from app.cache import response_cache
+from app.database import Base, Database
+from app.settings import Settings
 from app.models import Category, Book, Loan
 
 # Test veritabanı için SQLite bellek içi veritabanı kullanıyoruz
@@ -20,10 +22,13 @@ engine = create_engine(
 
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+test_settings = Settings(database_url=SQLALCHEMY_DATABASE_URL)
+
 @pytest.fixture(autouse=True)
 def setup_database():
     # Her test için tabloları oluştur
     Base.metadata.create_all(bind=engine)
+    response_cache.clear()
     yield
     # Her test sonrasında tabloları temizle
     Base.metadata.drop_all(bind=engine)
@@ -42,15 +47,9 @@ def db_session():
 
 @pytest.fixture
 def client(db_session):
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            db_session.close()
-            
-    app.dependency_overrides[get_db] = override_get_db
-    yield TestClient(app)
-    del app.dependency_overrides[get_db]
+    # Uygulama, istekleri testin oturumuyla karşılayan bir Database ile oluşturulur
+    database = Database(test_settings, engine=engine, session_factory=lambda: db_session)
+    yield TestClient(create_app(test_settings, database=database))
 
 @pytest.fixture
 def test_category(db_session):
@@ -0,0 +1,109 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app import metrics
+from app.admission import AdmissionMiddleware, ConcurrencyGate, TokenBuckets, cost_class
+
+POLICIES = {
+    "export": (1, 0, 0.0, 0.5, 10),
+    "list": (1, 0, 0.0, 0.5, 2),
+    "write": (4, 4, 1.0, 1.0, 1),
+    "read": (4, 4, 1.0, 1.0, 1),
+}
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    metrics.reset_metrics()
+    yield
+    metrics.reset_metrics()
+
+
+def make_app(**options):
+    release = asyncio.Event()
+    app = FastAPI()
+
+    @app.get("/books/")
+    async def read_books():
+        await release.wait()
+        return []
+
+    @app.get("/books/{book_id}")
+    async def read_book(book_id: int):
+        return {"id": book_id}
+
+    app.add_middleware(AdmissionMiddleware, **{"max_in_flight": 2, "policies": POLICIES, **options})
+    return app, release
+
+
+def test_cost_classes():
+    assert cost_class("GET", "/export/books") == "export"
+    assert cost_class("GET", "/books/") == "list"
+    assert cost_class("GET", "/books/{book_id}") == "read"
+    assert cost_class("POST", "/loans/") == "write"
+    assert cost_class("POST", "/books/lookup") == "list"
+
+def test_token_bucket_refills_over_time():
+    buckets = TokenBuckets(rate=1, burst=2)
+    assert buckets.take("a", 1, now=0) == 0
+    assert buckets.take("a", 1, now=0) == 0
+    assert buckets.take("a", 1, now=0) == pytest.approx(1.0)
+    # Diğer istemcilerin kovası ayrıdır
+    assert buckets.take("b", 1, now=0) == 0
+    assert buckets.take("a", 1, now=1.5) == 0
+
+def test_gate_queues_then_times_out():
+    async def scenario():
+        gate = ConcurrencyGate(limit=1, max_queue=1, max_wait=0.05)
+        assert await gate.acquire()
+        # Kuyruktaki istek, yer boşalınca devralır
+        waiter = asyncio.ensure_future(gate.acquire())
+        await asyncio.sleep(0)
+        assert not await gate.acquire()  # kuyruk dolu
+        gate.release()
+        assert await waiter
+        assert not await gate.acquire()  # bekleme süresi aşıldı
+        gate.release()
+        assert gate.active == 0
+
+    asyncio.run(scenario())
+
+def test_lists_are_shed_while_point_reads_are_served():
+    app, release = make_app()
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            slow = asyncio.ensure_future(client.get("/books/"))
+            await asyncio.sleep(0.05)
+
+            shed = await client.get("/books/")
+            assert shed.status_code == 503
+            assert shed.headers["retry-after"] == "1"
+
+            assert (await client.get("/books/1")).json() == {"id": 1}
+
+            release.set()
+            assert (await slow).status_code == 200
+            assert (await client.get("/books/")).status_code == 200
+
+    asyncio.run(scenario())
+    rendered = "\n".join(metrics.REQUESTS_SHED.render())
+    assert 'library_http_requests_shed_total{class="list",reason="overload"} 1' in rendered
+
+def test_rate_limit_returns_429_with_retry_after():
+    app, _ = make_app(rate=1, burst=2)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            assert (await client.get("/books/1")).status_code == 200
+            assert (await client.get("/books/1")).status_code == 200
+            limited = await client.get("/books/1")
+            assert limited.status_code == 429
+            assert limited.headers["retry-after"] == "1"
+
+    asyncio.run(scenario())
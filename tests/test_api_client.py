@@ -0,0 +1,86 @@
+import httpx
+
+import api_client
+from api_client import LibraryClient
+
+
+def test_get_revalidates_with_etag(client, test_book):
+    book_id = test_book.id
+    requests = []
+    client.event_hooks["response"] = [lambda response: requests.append(response.status_code)]
+    library = LibraryClient(http=client)
+
+    first = library.get("/books/")
+    assert [book["id"] for book in first] == [book_id]
+    assert library.get("/books/") == first
+    assert requests == [200, 304]
+
+    library.post("/loans/", json={"book_id": book_id, "borrower_name": "Test Kullanıcı"})
+    assert library.get("/books/")[0]["available"] == False
+    assert requests[-1] == 200
+
+def test_get_page_returns_next_cursor(client, test_category):
+    category_id = test_category.id
+    for i in range(3):
+        client.post(
+            "/books/",
+            json={"title": f"Kitap {i}", "author": "Yazar", "isbn": f"978110000{i:04d}", "publication_year": 2000, "category_id": category_id}
+        )
+    library = LibraryClient(http=client)
+    books, cursor = library.get_page("/books/", {"limit": 2, "available": None})
+    assert len(books) == 2 and cursor
+    books, cursor = library.get_page("/books/", {"limit": 2, "cursor": cursor})
+    assert len(books) == 1 and cursor is None
+
+def test_get_retries_transient_errors(monkeypatch):
+    monkeypatch.setattr(api_client, "RETRY_BACKOFF", 0)
+    statuses = iter([503, 502, 200])
+
+    def handler(request):
+        status = next(statuses)
+        return httpx.Response(status, json=[] if status == 200 else {"detail": "meşgul"}, headers={"Retry-After": "0"})
+
+    library = LibraryClient(http=httpx.Client(transport=httpx.MockTransport(handler), base_url="http://test"))
+    assert library.get("/books/") == []
+
+def test_writes_are_not_retried():
+    calls = []
+
+    def handler(request):
+        calls.append(request.method)
+        return httpx.Response(503)
+
+    library = LibraryClient(http=httpx.Client(transport=httpx.MockTransport(handler), base_url="http://test"))
+    assert library.post("/loans/", json={}).status_code == 503
+    assert calls == ["POST"]
+
+def test_clients_share_transport_but_not_cookies():
+    cookies = []
+
+    def handler(request):
+        cookies.append(request.headers.get("cookie"))
+        if request.method == "POST":
+            return httpx.Response(200, json={}, headers={"Set-Cookie": "library_primary=1; Path=/"})
+        return httpx.Response(200, json=[])
+
+    transport = httpx.MockTransport(handler)
+    writer = LibraryClient(base_url="http://test", transport=transport)
+    reader = LibraryClient(base_url="http://test", transport=transport)
+    writer.post("/categories/", json={})
+    writer.get("/categories/")
+    reader.get("/categories/")
+    assert cookies == [None, "library_primary=1", None]
+
+def test_etag_cache_is_thread_safe():
+    from concurrent.futures import ThreadPoolExecutor
+
+    def handler(request):
+        if request.headers.get("if-none-match"):
+            return httpx.Response(304, headers={"ETag": request.headers["if-none-match"]})
+        return httpx.Response(200, json=[request.url.path], headers={"ETag": f'"{request.url.path}"'})
+
+    library = LibraryClient(base_url="http://test", transport=httpx.MockTransport(handler), etag_cache_size=4)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda i: library.get(f"/books/{i % 10}"), range(2000)))
+    assert results == [[f"/books/{i % 10}"] for i in range(2000)]
+    assert len(library._validated) <= 4
@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta
+
+from app.models import Loan
+
+
+def create_returned_loans(client, db_session, category_id, count, days_ago):
+    loan_ids = []
+    for i in range(count):
+        book_id = client.post(
+            "/books/",
+            json={"title": f"Kitap {days_ago}-{i}", "author": "Yazar", "isbn": f"978{days_ago:05d}{i:05d}", "publication_year": 2020, "category_id": category_id}
+        ).json()["id"]
+        loan_id = client.post("/loans/", json={"book_id": book_id, "borrower_name": "Okur"}).json()["id"]
+        client.put(f"/loans/{loan_id}/return")
+        loan_ids.append(loan_id)
+    past = datetime.now() - timedelta(days=days_ago)
+    db_session.query(Loan).filter(Loan.id.in_(loan_ids)).update(
+        {Loan.loan_date: past - timedelta(days=3), Loan.return_date: past}, synchronize_session=False
+    )
+    db_session.commit()
+    return loan_ids
+
+def test_archive_moves_only_old_returned_loans(client, db_session, test_category):
+    category_id = test_category.id
+    old_ids = create_returned_loans(client, db_session, category_id, 3, days_ago=400)
+    recent_ids = create_returned_loans(client, db_session, category_id, 2, days_ago=10)
+    book_id = client.post(
+        "/books/", json={"title": "Aktif", "author": "Yazar", "isbn": "9780000000001", "publication_year": 2020, "category_id": category_id}
+    ).json()["id"]
+    active_id = client.post("/loans/", json={"book_id": book_id, "borrower_name": "Okur"}).json()["id"]
+    # Tarihler doğrudan değiştirildiği için sayaçlar önce yeniden hesaplanır
+    stats_before = client.post("/stats/rebuild").json()
+
+    response = client.post("/loans/archive?older_than_days=365")
+    assert response.status_code == 200
+    assert response.json()["archived"] == 3
+
+    assert sorted(loan["id"] for loan in client.get("/loans/").json()) == sorted(recent_ids + [active_id])
+    history = client.get("/loans/history").json()
+    assert [loan["id"] for loan in history] == old_ids
+    assert all(loan["return_date"] and loan["archived_at"] for loan in history)
+
+    # Arşivleme istatistikleri değiştirmez, yeniden hesaplama da arşivi sayar
+    assert client.get("/stats").json() == stats_before
+    assert client.post("/stats/rebuild").json() == stats_before
+
+def test_archive_after_archiving_the_newest_loan(client, db_session, test_category):
+    category_id = test_category.id
+    first_id = create_returned_loans(client, db_session, category_id, 1, days_ago=400)[0]
+    assert client.post("/loans/archive?older_than_days=365").json()["archived"] == 1
+
+    # En büyük id arşive taşındıktan sonra yeni ödünç bu id'yi yeniden almaz
+    second_id = create_returned_loans(client, db_session, category_id, 1, days_ago=401)[0]
+    assert second_id > first_id
+    response = client.post("/loans/archive?older_than_days=365")
+    assert response.status_code == 200
+    assert response.json()["archived"] == 1
+    assert sorted(loan["id"] for loan in client.get("/loans/history").json()) == [first_id, second_id]
+
+def test_archive_runs_in_bounded_batches(client, db_session, test_category):
+    category_id = test_category.id
+    old_ids = create_returned_loans(client, db_session, category_id, 5, days_ago=100)
+
+    result = client.post("/loans/archive?older_than_days=30&batch_size=2&max_batches=2").json()
+    assert (result["archived"], result["batches"]) == (4, 2)
+    assert [loan["id"] for loan in client.get("/loans/").json()] == old_ids[4:]
+
+    result = client.post("/loans/archive?older_than_days=30&batch_size=2").json()
+    assert (result["archived"], result["batches"]) == (1, 1)
+    assert client.get("/loans/").json() == []
+
+def test_loan_history_pagination_and_filters(client, db_session, test_category):
+    old_ids = create_returned_loans(client, db_session, test_category.id, 3, days_ago=400)
+    client.post("/loans/archive?older_than_days=365")
+
+    first = client.get("/loans/history?limit=2")
+    assert [loan["id"] for loan in first.json()] == old_ids[:2]
+    cursor = first.headers["X-Next-Cursor"]
+    second = client.get(f"/loans/history?limit=2&cursor={cursor}")
+    assert [loan["id"] for loan in second.json()] == old_ids[2:]
+
+    book_id = first.json()[0]["book_id"]
+    assert [loan["id"] for loan in client.get(f"/loans/history?book_id={book_id}").json()] == old_ids[:1]
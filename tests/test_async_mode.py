@@ -0,0 +1,120 @@
+import pytest
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database import AsyncSessionRoute, Base, get_async_db, get_db
+from app.models import Category
+
+
+@pytest.fixture
+def async_client():
+    async_engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    AsyncTestingSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    test_app = FastAPI()
+    test_app.router.route_class = AsyncSessionRoute
+
+    @test_app.post("/categories/")
+    def create_category(name: str, db: Session = Depends(get_db)):
+        db_category = Category(name=name)
+        db.add(db_category)
+        db.commit()
+        return {"id": db_category.id, "name": db_category.name}
+
+    @test_app.get("/categories/{category_id}")
+    def read_category(category_id: int, db: Session = Depends(get_db)):
+        category = db.get(Category, category_id)
+        if category is None:
+            raise HTTPException(status_code=404, detail="Kategori bulunamadı")
+        return {"id": category.id, "name": category.name}
+
+    async def override_get_async_db():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
+
+    test_app.dependency_overrides[get_async_db] = override_get_async_db
+
+    with TestClient(test_app) as client:
+        async def create_tables():
+            async with async_engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+        client.portal.call(create_tables)
+        yield client
+
+
+def test_async_route_runs_sync_endpoint_body(async_client):
+    response = async_client.post("/categories/?name=Roman")
+    assert response.status_code == 200
+    category_id = response.json()["id"]
+
+    response = async_client.get(f"/categories/{category_id}")
+    assert response.status_code == 200
+    assert response.json()["name"] == "Roman"
+
+def test_async_route_propagates_http_errors(async_client):
+    response = async_client.get("/categories/999")
+    assert response.status_code == 404
+
+def test_create_app_async_mode_end_to_end(tmp_path):
+    import inspect
+
+    from app.main import create_app
+    from app.settings import Settings
+
+    app = create_app(Settings(database_url=f"sqlite:///{tmp_path / 'async.db'}", db_mode="async", auto_migrate=True))
+    with TestClient(app) as client:
+        # Uygulamanın kendi route'ları async oturumla çalışacak şekilde sarılmıştır
+        route = next(route for route in app.routes if getattr(route, "path", None) == "/books/")
+        assert isinstance(route, AsyncSessionRoute)
+        assert inspect.iscoroutinefunction(route.endpoint)
+
+        category = client.post("/categories/", json={"name": "Roman"}).json()
+        book = client.post("/books/", json={
+            "title": "Kitap", "author": "Yazar", "isbn": "9780306406157",
+            "publication_year": 2000, "category_id": category["id"],
+        })
+        assert book.status_code == 200
+        book_id = book.json()["id"]
+        assert [b["id"] for b in client.get("/books/").json()] == [book_id]
+
+        loan = client.post("/loans/", json={"book_id": book_id, "borrower_name": "Okur"})
+        assert loan.status_code == 200
+        assert client.get(f"/books/{book_id}").json()["available"] is False
+        assert client.post("/loans/", json={"book_id": book_id, "borrower_name": "Okur"}).status_code == 400
+
+        assert client.put(f"/loans/{loan.json()['id']}/return").status_code == 200
+        assert client.get(f"/books/{book_id}").json()["available"] is True
+
+def test_async_mode_conditional_get_uses_async_session(tmp_path):
+    from sqlalchemy import event
+
+    from app.main import create_app
+    from app.settings import Settings
+
+    app = create_app(Settings(database_url=f"sqlite:///{tmp_path / 'async.db'}", db_mode="async", auto_migrate=True))
+    with TestClient(app) as client:
+        database = app.state.database
+        category_id = client.post("/categories/", json={"name": "Roman"}).json()["id"]
+        client.post("/books/", json={
+            "title": "Kitap", "author": "Yazar", "isbn": "9780306406157",
+            "publication_year": 2000, "category_id": category_id,
+        })
+        # Açık bağlantılar bırakılır; dinleyici sonraki tüm senkron bağlantıları görür
+        database.engine.dispose()
+        sync_statements = []
+        event.listen(database.engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: sync_statements.append(statement))
+
+        for path in ["/books/", "/loans/", "/loans/details", "/loans/history",
+                     "/books/search?q=Kitap", "/stats", "/stats/categories"]:
+            response = client.get(path)
+            assert response.status_code == 200, path
+            etag = response.headers["etag"]
+            assert client.get(path, headers={"If-None-Match": etag}).status_code == 304, path
+        assert sync_statements == []
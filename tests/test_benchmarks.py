@@ -0,0 +1,29 @@
+from benchmarks.common import create_benchmark_app, drive
+from benchmarks.suite import build_scenarios, find_regressions, seed_dataset
+
+
+def result(p95_ms: float, errors: int = 0) -> dict:
+    return {"p95_ms": p95_ms, "errors": errors}
+
+def test_find_regressions():
+    baseline = {"endpoints": {"books_list": result(10), "book_detail": result(2), "stats": result(5)}}
+    current = {"endpoints": {
+        "books_list": result(12.5),            # eşiği aşan gecikme
+        "book_detail": result(2.2, errors=3),  # eşik içinde ama yeni hatalar
+        "loans_list": result(100),             # temel ölçümde olmayan senaryo yok sayılır
+    }}
+    assert find_regressions(baseline, current, threshold=0.2) == [
+        ("books_list", 10, 12.5),
+        ("book_detail (hata)", 0, 3),
+    ]
+    assert find_regressions(baseline, baseline, threshold=0.2) == []
+
+def test_suite_scenarios_run_without_errors(tmp_path, monkeypatch):
+    monkeypatch.setenv("LIBRARY_DATABASE_URL", f"sqlite:///{tmp_path / 'suite.db'}")
+    app = create_benchmark_app()
+    dataset = seed_dataset(app.state.database.engine, categories=5, books=400, loans=800)
+
+    for name, calls in build_scenarios(dataset, requests=10):
+        assert calls, name
+        assert drive(app, calls, concurrency=2)["errors"] == 0, name
+    app.state.database.engine.dispose()
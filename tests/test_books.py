@@ -1,3 +1,7 @@
+from datetime import datetime
+
+from app import main, schemas
+
 def test_create_book(client, test_category):
     response = client.post(
         "/books/",
@@ -64,4 +68,216 @@ def test_filter_books_by_category(client, test_book, test_category):
     assert response.status_code == 200
     data = response.json()
     assert len(data) == 1
-    assert data[0]["title"] == test_book.title 
\ No newline at end of file
+    assert data[0]["title"] == test_book.title 
+
+def test_read_books_cursor_pagination(client, test_category):
+    category_id = test_category.id
+    for i in range(5):
+        client.post(
+            "/books/",
+            json={
+                "title": f"Kitap {i}",
+                "author": "Test Yazar",
+                "isbn": f"978{i:010d}",
+                "publication_year": 2020,
+                "category_id": category_id
+            }
+        )
+
+    response = client.get("/books/?limit=2")
+    titles = [book["title"] for book in response.json()]
+    cursor = response.headers.get("X-Next-Cursor")
+    while cursor:
+        response = client.get(f"/books/?limit=2&cursor={cursor}")
+        assert response.status_code == 200
+        titles += [book["title"] for book in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+
+    assert titles == [f"Kitap {i}" for i in range(5)]
+
+def test_read_books_invalid_cursor(client):
+    response = client.get("/books/?cursor=bozuk-imlec")
+    assert response.status_code == 400
+
+def test_bulk_create_books(client, test_book):
+    category_id = test_book.category_id
+    existing_isbn = test_book.isbn
+    response = client.post(
+        "/books/bulk",
+        json=[
+            {"title": "Kitap A", "author": "Yazar", "isbn": "9781000000001", "publication_year": 2020, "category_id": category_id},
+            {"title": "Kitap B", "author": "Yazar", "isbn": existing_isbn, "publication_year": 2020, "category_id": category_id},
+            {"title": "Kitap C", "author": "Yazar", "isbn": "9781000000001", "publication_year": 2020, "category_id": category_id},
+            {"title": "Kitap D", "author": "Yazar", "isbn": "9781000000002", "publication_year": 2020, "category_id": 999},
+            {"title": "Kitap E", "author": "Yazar", "isbn": "9781000000003"},
+            {"title": "Kitap F", "author": "Yazar", "isbn": "9781000000004", "publication_year": 2021, "category_id": category_id},
+        ]
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 2
+    assert data["failed"] == 4
+    assert [result["status"] for result in data["results"]] == [
+        "created", "error", "error", "error", "error", "created"
+    ]
+    assert data["results"][1]["error"] == "ISBN zaten kayıtlı"
+    assert data["results"][3]["error"] == "Kategori bulunamadı"
+
+    response = client.get(f"/books/{data['results'][5]['id']}")
+    assert response.status_code == 200
+    assert response.json()["title"] == "Kitap F"
+
+def test_bulk_create_books_ndjson(client, test_category):
+    category_id = test_category.id
+    lines = [
+        '{"title": "Kitap A", "author": "Yazar", "isbn": "9782000000001", "publication_year": 2020, "category_id": %d}' % category_id,
+        '{bozuk satır',
+        '{"title": "Kitap B", "author": "Yazar", "isbn": "9782000000002", "publication_year": 2020, "category_id": %d}' % category_id,
+    ]
+    response = client.post(
+        "/books/bulk",
+        content="\n".join(lines),
+        headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 2
+    assert data["results"][1]["status"] == "error"
+
+def test_bulk_create_books_invalid_body(client):
+    response = client.post("/books/bulk", json={"title": "Dizi değil"})
+    assert response.status_code == 400
+
+def test_search_books(client, test_category):
+    category_id = test_category.id
+    for title, author, isbn in [
+        ("Suç ve Ceza", "Fyodor Dostoyevski", "9783000000001"),
+        ("Karamazov Kardeşler", "Fyodor Dostoyevski", "9783000000002"),
+        ("Savaş ve Barış", "Lev Tolstoy", "9783000000003"),
+    ]:
+        client.post(
+            "/books/",
+            json={"title": title, "author": author, "isbn": isbn, "publication_year": 1880, "category_id": category_id}
+        )
+
+    response = client.get("/books/search?q=dosto")
+    assert response.status_code == 200
+    assert {book["isbn"] for book in response.json()} == {"9783000000001", "9783000000002"}
+
+    response = client.get("/books/search?q=savaş barış")
+    assert [book["isbn"] for book in response.json()] == ["9783000000003"]
+
+    response = client.get("/books/search?q=dosto&limit=1&skip=1")
+    assert len(response.json()) == 1
+
+def test_search_books_index_follows_updates_and_deletes(client, test_book):
+    book_id = test_book.id
+    response = client.put(
+        f"/books/{book_id}",
+        json={
+            "title": "Tutunamayanlar",
+            "author": "Oğuz Atay",
+            "isbn": "1234567890",
+            "publication_year": 1972,
+            "category_id": test_book.category_id
+        }
+    )
+    assert response.status_code == 200
+    assert client.get("/books/search?q=Test").json() == []
+    assert [book["id"] for book in client.get("/books/search?q=tutunamay").json()] == [book_id]
+
+    client.delete(f"/books/{book_id}")
+    assert client.get("/books/search?q=tutunamay").json() == []
+
+def test_search_books_ignores_fts_operators(client, test_book):
+    response = client.get('/books/search?q="Test" OR NEAR(')
+    assert response.status_code == 200
+
+def test_filter_books(client, test_category):
+    category_id = test_category.id
+    for title, author, year in [("A", "Yazar 1", 1950), ("B", "Yazar 1", 1990), ("C", "Yazar 2", 2010)]:
+        client.post(
+            "/books/",
+            json={"title": title, "author": author, "isbn": f"978400000{ord(title):04d}", "publication_year": year, "category_id": category_id}
+        )
+    book_id = client.get("/books/?author=Yazar 2").json()[0]["id"]
+    client.post("/loans/", json={"book_id": book_id, "borrower_name": "Test Kullanıcı"})
+
+    assert [b["title"] for b in client.get("/books/?author=Yazar 1").json()] == ["A", "B"]
+    assert [b["title"] for b in client.get("/books/?year_from=1960&year_to=2010").json()] == ["B", "C"]
+    assert [b["title"] for b in client.get("/books/?available=false").json()] == ["C"]
+    assert [b["title"] for b in client.get(f"/books/?category_id={category_id}&available=true").json()] == ["A", "B"]
+
+def test_read_books_fast_path_matches_schema(client, test_book):
+    book_id = test_book.id
+    listed = client.get("/books/").json()
+    assert listed == [client.get(f"/books/{book_id}").json()]
+
+    schema = client.get("/openapi.json").json()["paths"]["/books/"]["get"]["responses"]["200"]
+    assert schema["content"]["application/json"]["schema"]["items"]["$ref"] == "#/components/schemas/Book"
+
+def test_create_book_normalizes_isbn(client, test_category):
+    response = client.post(
+        "/books/",
+        json={"title": " Kitap ", "author": "Yazar", "isbn": "978-0-306-40615-7", "publication_year": 2020, "category_id": test_category.id}
+    )
+    assert response.status_code == 200
+    assert response.json()["isbn"] == "9780306406157"
+    assert response.json()["title"] == "Kitap"
+
+def test_create_book_rejects_invalid_fields(client, test_category):
+    valid = {"title": "Kitap", "author": "Yazar", "isbn": "030640615X", "publication_year": 2020, "category_id": test_category.id}
+    assert client.post("/books/", json=valid).status_code == 200
+    for field, value in [("isbn", "abc-123"), ("isbn", "12345"), ("publication_year", 99999), ("title", "  ")]:
+        response = client.post("/books/", json={**valid, field: value})
+        assert response.status_code == 422, (field, value)
+        assert response.json()["detail"][0]["loc"] == ["body", field]
+
+def test_publication_year_limit_follows_current_year(client, test_category, monkeypatch):
+    book = {"title": "Kitap", "author": "Yazar", "isbn": "9780306406157", "publication_year": 2101, "category_id": test_category.id}
+    response = client.post("/books/", json=book)
+    assert response.status_code == 422
+    assert "Yayın yılı en fazla" in response.json()["detail"][0]["msg"]
+
+    # Sınır modül yüklenirken değil, her doğrulamada o anki yıla göre hesaplanır
+    class NextCentury(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime(2100, 1, 1)
+
+    monkeypatch.setattr(schemas, "datetime", NextCentury)
+    assert client.post("/books/", json=book).status_code == 200
+
+def test_read_books_summary_view(client, test_book, monkeypatch):
+    book_id = test_book.id
+    expected = [{"id": book_id, "title": "Test Kitap", "author": "Test Yazar", "available": True}]
+    assert client.get("/books/?view=summary").json() == expected
+
+    monkeypatch.setattr(main, "FAST_JSON_RESPONSES", False)
+    assert client.get("/books/?view=summary").json() == expected
+
+def test_lookup_books(client, test_book):
+    book_id = test_book.id
+    book = client.post("/books/", json={
+        "title": "Kitap", "author": "Yazar", "isbn": "9780306406157", "publication_year": 2020,
+        "category_id": test_book.category_id,
+    }).json()
+    response = client.post("/books/lookup", json={
+        "ids": [book_id, 999999, book_id],
+        "isbns": ["0-306-40615-2", "978 0306 406157", "9780000000002", "abc"],
+    })
+    assert response.status_code == 200
+    data = response.json()
+    assert data["found"] == 3
+    assert data["missing"] == 3
+    assert data["ids"][str(book_id)]["title"] == "Test Kitap"
+    assert data["ids"]["999999"] is None
+    assert data["isbns"]["0-306-40615-2"] == book
+    assert data["isbns"]["978 0306 406157"] == book
+    assert data["isbns"]["9780000000002"] is None
+    assert data["isbns"]["abc"] is None
+
+def test_lookup_books_limits(client):
+    assert client.post("/books/lookup", json={}).status_code == 422
+    response = client.post("/books/lookup", json={"ids": list(range(3000)), "isbns": ["0306406152"] * 2001})
+    assert response.status_code == 422
@@ -0,0 +1,169 @@
+import time
+
+from fastapi.testclient import TestClient
+
+from app.cache import ResponseCache
+
+
+def test_cache_lru_eviction():
+    cache = ResponseCache(maxsize=2, ttl=60)
+    cache.set("books", 1, b"1")
+    cache.set("books", 2, b"2")
+    cache.get("books", 1)
+    cache.set("books", 3, b"3")
+
+    assert cache.get("books", 2) is None
+    assert cache.get("books", 1).body == b"1"
+    assert cache.get("books", 3).body == b"3"
+
+def test_cache_ttl_expiry():
+    cache = ResponseCache(maxsize=10, ttl=0.01)
+    cache.set("books", 1, b"1")
+    time.sleep(0.02)
+    assert cache.get("books", 1) is None
+
+def test_cache_namespace_invalidation():
+    cache = ResponseCache()
+    cache.set("categories", (0, 100, None), b"[]")
+    cache.set("books", 1, b"{}")
+    cache.invalidate("categories")
+
+    assert cache.get("categories", (0, 100, None)) is None
+    assert cache.get("books", 1) is not None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+def test_cache_drops_read_that_raced_an_invalidation():
+    cache = ResponseCache()
+    token = cache.token("books")
+    # Okuma sürerken eşzamanlı bir yazma kitabı geçersiz kılar
+    cache.invalidate("books", 1)
+    entry = cache.set("books", 1, b'{"title": "Eski"}', token=token)
+
+    assert entry.body == b'{"title": "Eski"}'
+    assert cache.get("books", 1) is None
+    cache.set("books", 1, b'{"title": "Yeni"}', token=cache.token("books"))
+    assert cache.get("books", 1).body == b'{"title": "Yeni"}'
+
+def test_cache_clear_resets_tokens():
+    cache = ResponseCache()
+    cache.invalidate("books", 1)
+    cache.clear()
+    assert cache.token("books") == 0
+
+def test_create_book_does_not_invalidate_cached_books(client, test_book):
+    from app.cache import response_cache
+
+    book_id, category_id = test_book.id, test_book.category_id
+    client.get(f"/books/{book_id}")
+    token = response_cache.token("books")
+    response = client.post("/books/", json={
+        "title": "Yeni", "author": "Yazar", "isbn": "9780306406157",
+        "publication_year": 2000, "category_id": category_id,
+    })
+    assert response.status_code == 200
+    # Eşzamanlı okumaların önbelleğe yazması engellenmez, mevcut girdi korunur
+    assert response_cache.token("books") == token
+    assert response_cache.get("books", book_id) is not None
+
+def test_read_book_etag_not_modified(client, test_book):
+    book_id = test_book.id
+    response = client.get(f"/books/{book_id}")
+    etag = response.headers["ETag"]
+
+    response = client.get(f"/books/{book_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+def test_read_book_cache_invalidated_by_loan(client, test_book):
+    book_id = test_book.id
+    first = client.get(f"/books/{book_id}")
+    assert first.json()["available"] == True
+
+    client.post("/loans/", json={"book_id": book_id, "borrower_name": "Test Kullanıcı"})
+
+    response = client.get(f"/books/{book_id}", headers={"If-None-Match": first.headers["ETag"]})
+    assert response.status_code == 200
+    assert response.json()["available"] == False
+
+def test_read_categories_cache_invalidated_by_create(client):
+    client.post("/categories/", json={"name": "Roman"})
+    assert len(client.get("/categories/").json()) == 1
+    assert len(client.get("/categories/").json()) == 1
+
+    client.post("/categories/", json={"name": "Şiir"})
+    assert len(client.get("/categories/").json()) == 2
+
+    stats = client.get("/cache/stats").json()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+def test_collection_not_modified_reads_only_versions(client, test_book, db_session):
+    from sqlalchemy import event
+
+    first = client.get("/books/?limit=10")
+    assert first.headers["ETag"].startswith('W/"')
+    assert "Last-Modified" in first.headers
+
+    # Olaylar, testin oturumunun bağlı olduğu bağlantıya eklenir
+    connection = db_session.connection()
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(connection, "before_cursor_execute", listener)
+    try:
+        response = client.get("/books/?limit=10", headers={"If-None-Match": first.headers["ETag"]})
+    finally:
+        event.remove(connection, "before_cursor_execute", listener)
+    assert response.status_code == 304
+    assert response.headers["ETag"] == first.headers["ETag"]
+    assert len(statements) == 1 and "FROM table_versions" in statements[0]
+
+    # Farklı sorgu parametreleri farklı ETag alır
+    assert client.get("/books/?limit=5").headers["ETag"] != first.headers["ETag"]
+
+def test_collection_etag_changes_after_write(client, test_book):
+    book_id = test_book.id
+    etag = client.get("/books/").headers["ETag"]
+    loans_etag = client.get("/loans/").headers["ETag"]
+
+    client.post("/loans/", json={"book_id": book_id, "borrower_name": "Test Kullanıcı"})
+
+    response = client.get("/books/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()[0]["available"] == False
+    assert client.get("/loans/", headers={"If-None-Match": loans_etag}).status_code == 200
+
+def test_collection_if_modified_since(client, test_category):
+    category_id = test_category.id
+    last_modified = client.get("/loans/").headers["Last-Modified"]
+    assert client.get("/loans/", headers={"If-Modified-Since": last_modified}).status_code == 304
+
+    # Başka tablolara yazmak bu koleksiyonu etkilemez
+    client.post("/categories/", json={"name": "Yeni", "description": ""})
+    assert client.get("/loans/", headers={"If-Modified-Since": last_modified}).status_code == 304
+    assert client.get("/books/", headers={"If-Modified-Since": "Thu, 01 Jan 1970 00:00:00 GMT"}).status_code == 200
+
+def test_collection_validators_shared_across_processes(client, test_book):
+    from app.main import create_app
+    from tests.conftest import test_settings
+
+    book_id, category_id = test_book.id, test_book.category_id
+    etag = client.get("/books/").headers["ETag"]
+    # Başka bir işçiyi temsil eden ikinci uygulama aynı veritabanından aynı ETag'i üretir
+    other = TestClient(create_app(test_settings, database=client.app.state.database))
+    assert other.get("/books/", headers={"If-None-Match": etag}).status_code == 304
+
+    # Bir işçideki yazma diğerinin ETag'ini de değiştirir
+    client.put(f"/books/{book_id}", json={
+        "title": "Yeni", "author": "Yazar", "isbn": "9780306406157",
+        "publication_year": 2000, "category_id": category_id,
+    })
+    assert other.get("/books/", headers={"If-None-Match": etag}).status_code == 200
+
+def test_last_modified_comes_from_database(client, db_session):
+    from app.models import TableVersion
+
+    version = db_session.get(TableVersion, "loans")
+    version.modified_at = 1_000_000_000.0
+    db_session.commit()
+    assert client.get("/loans/").headers["Last-Modified"] == "Sun, 09 Sep 2001 01:46:40 GMT"
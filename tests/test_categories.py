@@ -23,4 +23,15 @@ def test_create_category_invalid(client):
         "/categories/",
         json={"description": "Geçersiz kategori"}
     )
-    assert response.status_code == 422  # Validation Error 
\ No newline at end of file
+    assert response.status_code == 422  # Validation Error 
+
+def test_read_categories_cursor_pagination(client):
+    for name in ["Roman", "Şiir", "Tarih"]:
+        client.post("/categories/", json={"name": name})
+
+    first_page = client.get("/categories/?limit=2")
+    assert [cat["name"] for cat in first_page.json()] == ["Roman", "Şiir"]
+
+    cursor = first_page.headers["X-Next-Cursor"]
+    second_page = client.get(f"/categories/?limit=2&cursor={cursor}")
+    assert [cat["name"] for cat in second_page.json()] == ["Tarih"]
@@ -0,0 +1,86 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.compression import CompressionMiddleware, choose_encoding
+
+
+def make_client(**options):
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, **options)
+
+    @app.get("/small")
+    def small():
+        return PlainTextResponse("x" * 10)
+
+    @app.get("/large")
+    def large():
+        return PlainTextResponse("x" * 5000)
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([b"a" * 3000, b"b" * 3000]), media_type="text/plain")
+
+    @app.get("/gzip-file")
+    def gzip_file():
+        return PlainTextResponse(gzip.compress(b"x" * 5000), media_type="application/gzip")
+
+    return TestClient(app)
+
+def test_choose_encoding():
+    assert choose_encoding("gzip, deflate, br", ["br", "gzip"]) == "br"
+    assert choose_encoding("gzip;q=1.0, br;q=0", ["br", "gzip"]) == "gzip"
+    assert choose_encoding("identity", ["br", "gzip"]) is None
+    assert choose_encoding("", ["gzip"]) is None
+
+def test_gzip_above_minimum_size():
+    client = make_client(minimum_size=500, encodings=["gzip"])
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) < 5000
+    assert response.text == "x" * 5000
+
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.text == "x" * 10
+
+def test_no_compression_without_accept_encoding():
+    client = make_client(minimum_size=500, encodings=["gzip"])
+    response = client.get("/large", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.text == "x" * 5000
+
+def test_streaming_response_compressed():
+    client = make_client(minimum_size=500, encodings=["gzip"])
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.text == "a" * 3000 + "b" * 3000
+
+def test_already_compressed_content_skipped():
+    client = make_client(minimum_size=500, encodings=["gzip"])
+    response = client.get("/gzip-file", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert gzip.decompress(response.content) == b"x" * 5000
+
+def test_brotli():
+    brotli = pytest.importorskip("brotli")
+    client = make_client(minimum_size=500, encodings=["br", "gzip"])
+    response = client.get("/large", headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["content-encoding"] == "br"
+    assert response.text == "x" * 5000
+
+def test_api_list_compressed(client, test_category):
+    category_id = test_category.id
+    for i in range(30):
+        client.post(
+            "/books/",
+            json={"title": f"Kitap {i}", "author": "Yazar", "isbn": f"978900000{i:04d}", "publication_year": 2000, "category_id": category_id}
+        )
+    response = client.get("/books/", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()) == 30
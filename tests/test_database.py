@@ -0,0 +1,93 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import inspect, text
+
+from app.database import create_db_engine, engine_options, sqlite_pragmas
+from app.settings import Settings
+
+
+def test_production_profile_pragmas_applied_on_connect(tmp_path):
+    url = f"sqlite:///{tmp_path / 'profile.db'}"
+    test_engine = create_db_engine(Settings(database_url=url, sqlite_profile="production"))
+
+    with test_engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+        assert conn.execute(text("PRAGMA temp_store")).scalar() == 2  # MEMORY
+    test_engine.dispose()
+
+def test_pragma_override_from_environment(monkeypatch):
+    monkeypatch.setenv("LIBRARY_SQLITE_BUSY_TIMEOUT", "12000")
+    assert sqlite_pragmas("production")["busy_timeout"] == "12000"
+    assert sqlite_pragmas("default") == {"busy_timeout": "12000"}
+
+def test_unknown_profile():
+    with pytest.raises(ValueError):
+        sqlite_pragmas("bilinmeyen")
+
+def test_pool_options(monkeypatch):
+    monkeypatch.setenv("LIBRARY_DB_POOL_SIZE", "20")
+    monkeypatch.setenv("LIBRARY_DB_MAX_OVERFLOW", "5")
+    options = engine_options(Settings.from_env())
+    assert options["pool_size"] == 20
+    assert options["max_overflow"] == 5
+    assert engine_options(Settings(database_url="sqlite://")) == {}
+
+def test_unknown_db_mode():
+    with pytest.raises(ValueError):
+        Settings(db_mode="bilinmeyen")
+
+def test_create_app_does_not_touch_database(tmp_path):
+    from app.main import create_app
+
+    path = tmp_path / "factory.db"
+    create_app(Settings(database_url=f"sqlite:///{path}"))
+    assert not path.exists()
+
+def test_lifespan_creates_engine_and_migrate_builds_schema(tmp_path):
+    from app.main import create_app
+    from app.migrate import migrate
+
+    settings = Settings(database_url=f"sqlite:///{tmp_path / 'factory.db'}")
+    app = create_app(settings)
+    with TestClient(app) as client:
+        database = app.state.database
+        assert str(database.engine.url) == settings.database_url
+        # Şema açılışta kurulmaz; ayrı geçiş adımıyla kurulur
+        assert not inspect(database.engine).has_table("books")
+        migrate(database.engine)
+        assert client.get("/categories/").json() == []
+    assert app.state.database is None
+
+def test_auto_migrate_on_startup(tmp_path):
+    from app.main import create_app
+
+    app = create_app(Settings(database_url=f"sqlite:///{tmp_path / 'factory.db'}", auto_migrate=True))
+    with TestClient(app) as client:
+        assert client.get("/stats").json()["total_books"] == 0
+
+def test_migrate_rebuilds_loans_without_autoincrement(tmp_path):
+    from app.migrate import migrate
+
+    engine = create_db_engine(Settings(database_url=f"sqlite:///{tmp_path / 'legacy.db'}"))
+    migrate(engine)
+    with engine.begin() as conn:
+        # AUTOINCREMENT'sız eski şema: en büyük id arşivlenmiş
+        conn.exec_driver_sql("DROP TABLE loans")
+        conn.exec_driver_sql(
+            "CREATE TABLE loans (id INTEGER PRIMARY KEY, book_id INTEGER, borrower_name VARCHAR, "
+            "loan_date DATETIME, return_date DATETIME, is_returned BOOLEAN)"
+        )
+        conn.exec_driver_sql("INSERT INTO loans (id, book_id, borrower_name, is_returned) VALUES (3, 1, 'Okur', 0)")
+        conn.exec_driver_sql("INSERT INTO loan_history (id, book_id, borrower_name) VALUES (7, 1, 'Okur')")
+
+    migrate(engine)
+    with engine.begin() as conn:
+        table_sql = conn.exec_driver_sql("SELECT sql FROM sqlite_master WHERE name = 'loans'").scalar()
+        assert "AUTOINCREMENT" in table_sql
+        assert conn.exec_driver_sql("SELECT id, borrower_name FROM loans").all() == [(3, "Okur")]
+        conn.exec_driver_sql("INSERT INTO loans (book_id, borrower_name, is_returned) VALUES (1, 'Yeni', 0)")
+        assert conn.exec_driver_sql("SELECT max(id) FROM loans").scalar() == 8
+    assert {index["name"] for index in inspect(engine).get_indexes("loans")} >= {"ix_loans_loan_date_id", "ix_loans_borrower_name"}
+    engine.dispose()
@@ -0,0 +1,99 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.events import EventBroker, event_broker
+
+
+@pytest.fixture(autouse=True)
+def clean_broker():
+    event_broker.clear()
+    yield
+    event_broker.clear()
+
+
+def parse_events(body: str) -> list:
+    events = []
+    for block in body.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if "event" in fields:
+            events.append((fields.get("id"), fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_subscriber_receives_published_events():
+    async def scenario():
+        broker = EventBroker()
+        subscription = broker.subscribe()
+        first = broker.publish("book.created", {"id": 1})
+        broker.publish("book.deleted", {"id": 1})
+        events, reset = await subscription.next_batch(timeout=1)
+        assert [event_type for _, event_type, _ in events] == ["book.created", "book.deleted"]
+        assert not reset
+        assert first == f"{broker.epoch}-1"
+        # Olay yoksa zaman aşımında boş döner
+        assert await subscription.next_batch(timeout=0.01) == ([], False)
+
+    asyncio.run(scenario())
+
+def test_slow_subscriber_drops_oldest_and_gets_reset():
+    async def scenario():
+        broker = EventBroker(queue_size=2)
+        subscription = broker.subscribe()
+        for i in range(5):
+            broker.publish("book.updated", {"id": i})
+        events, reset = await subscription.next_batch(timeout=1)
+        assert [json.loads(payload)["id"] for _, _, payload in events] == [3, 4]
+        assert reset
+
+    asyncio.run(scenario())
+
+def test_resume_from_last_event_id():
+    async def scenario():
+        broker = EventBroker(history_size=3)
+        ids = [broker.publish("loan.created", {"id": i}) for i in range(5)]
+
+        events, reset = await broker.subscribe(ids[3]).next_batch(timeout=1)
+        assert [json.loads(payload)["id"] for _, _, payload in events] == [4]
+        assert not reset
+
+        # Geçmişten düşmüş ya da başka bir sürece ait kimlikle devam edilemez
+        for last_event_id in (ids[0], "baska-3"):
+            events, reset = await broker.subscribe(last_event_id).next_batch(timeout=0.01)
+            assert events == [] and reset
+
+    asyncio.run(scenario())
+
+def test_events_endpoint_streams_write_events(client, test_category):
+    category_id = test_category.id
+    book = client.post("/books/", json={
+        "title": "Kitap", "author": "Yazar", "isbn": "9780306406157",
+        "publication_year": 2000, "category_id": category_id,
+    }).json()
+    loan = client.post("/loans/", json={"book_id": book["id"], "borrower_name": "Okur"}).json()
+    client.put(f"/loans/{loan['id']}/return")
+    client.delete(f"/books/{book['id']}")
+
+    async def read_stream():
+        transport = httpx.ASGITransport(app=client.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+            request = asyncio.ensure_future(
+                async_client.get("/events", headers={"Last-Event-ID": f"{event_broker.epoch}-0"})
+            )
+            while not event_broker._subscribers:
+                await asyncio.sleep(0.01)
+            event_broker.close_subscriptions()
+            return await request
+
+    response = asyncio.run(read_stream())
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert parse_events(response.text) == [
+        (f"{event_broker.epoch}-1", "book.created", {
+            "id": book["id"], "title": "Kitap", "author": "Yazar", "category_id": category_id, "available": True,
+        }),
+        (f"{event_broker.epoch}-2", "loan.created", {"id": loan["id"], "book_id": book["id"], "borrower_name": "Okur"}),
+        (f"{event_broker.epoch}-3", "loan.returned", {"id": loan["id"], "book_id": book["id"]}),
+        (f"{event_broker.epoch}-4", "book.deleted", {"id": book["id"]}),
+    ]
@@ -0,0 +1,58 @@
+import csv
+import gzip
+import io
+import json
+
+
+def create_books(client, category_id, count):
+    return [
+        client.post(
+            "/books/",
+            json={"title": f"Kitap {i}", "author": "Yazar", "isbn": f"978500000{i:04d}", "publication_year": 2000 + i, "category_id": category_id}
+        ).json()["id"]
+        for i in range(count)
+    ]
+
+def test_export_books_gzip_ndjson(client, test_category):
+    book_ids = create_books(client, test_category.id, 3)
+
+    response = client.get("/export/books")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/gzip"
+    assert 'filename="books.ndjson.gz"' in response.headers["content-disposition"]
+
+    rows = [json.loads(line) for line in gzip.decompress(response.content).splitlines()]
+    assert [row["id"] for row in rows] == book_ids
+    assert rows == client.get("/books/").json()
+
+def test_export_books_csv_uncompressed_with_filter(client, test_category):
+    create_books(client, test_category.id, 3)
+
+    response = client.get("/export/books?format=csv&compress=false&year_from=2001")
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["title"] for row in rows] == ["Kitap 1", "Kitap 2"]
+
+def test_export_loans_date_range(client, test_category):
+    book_ids = create_books(client, test_category.id, 2)
+    for book_id in book_ids:
+        client.post("/loans/", json={"book_id": book_id, "borrower_name": "Test Kullanıcı"})
+
+    response = client.get("/export/loans?loan_date_from=2000-01-01T00:00:00")
+    rows = [json.loads(line) for line in gzip.decompress(response.content).splitlines()]
+    assert [row["book_id"] for row in rows] == book_ids
+    assert rows == client.get("/loans/").json()
+
+    response = client.get("/export/loans?loan_date_to=2000-01-01T00:00:00")
+    assert gzip.decompress(response.content) == b""
+
+def test_export_closes_session_after_body(client, db_session, test_category, monkeypatch):
+    create_books(client, test_category.id, 2)
+    events = []
+    execute, close = db_session.execute, db_session.close
+    monkeypatch.setattr(db_session, "execute", lambda *args, **kwargs: events.append("execute") or execute(*args, **kwargs))
+    monkeypatch.setattr(db_session, "close", lambda: events.append("close") or close())
+
+    response = client.get("/export/books?compress=false")
+    assert len(response.text.splitlines()) == 2
+    assert events == ["execute", "close"]
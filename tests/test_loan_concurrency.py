@@ -0,0 +1,116 @@
+import random
+import threading
+import time
+from collections import Counter
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+from app import models, schemas
+from app.database import Base
+from app.main import create_loan, return_book
+
+THREADS = 16
+BOOKS = 40
+
+
+@pytest.fixture
+def file_sessionmaker(tmp_path):
+    # Gerçek eşzamanlılık için her iş parçacığı kendi bağlantısını kullanır
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'concurrency.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+        pool_size=THREADS,
+    )
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    db = SessionLocal()
+    category = models.Category(name="Eşzamanlılık")
+    db.add(category)
+    db.flush()
+    db.add_all(
+        models.Book(title=f"Kitap {i}", author="Yazar", isbn=f"978{i:010d}", publication_year=2000, category_id=category.id)
+        for i in range(BOOKS)
+    )
+    db.commit()
+    db.close()
+
+    yield SessionLocal
+    engine.dispose()
+
+
+def test_concurrent_checkouts_never_double_book(file_sessionmaker, record_property):
+    barrier = threading.Barrier(THREADS)
+    successes = Counter()
+    unexpected = []
+    lock = threading.Lock()
+
+    def borrower(worker: int):
+        book_ids = list(range(1, BOOKS + 1))
+        random.Random(worker).shuffle(book_ids)
+        barrier.wait()
+        for book_id in book_ids:
+            db = file_sessionmaker()
+            try:
+                create_loan(schemas.LoanCreate(book_id=book_id, borrower_name=f"Okur {worker}"), db=db)
+                with lock:
+                    successes[book_id] += 1
+            except HTTPException as e:
+                if e.status_code != 400:
+                    unexpected.append(e)
+            except Exception as e:
+                unexpected.append(e)
+            finally:
+                db.close()
+
+    threads = [threading.Thread(target=borrower, args=(i,)) for i in range(THREADS)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    record_property("checkout_attempts_per_second", round(THREADS * BOOKS / elapsed, 1))
+
+    assert unexpected == []
+    assert all(count == 1 for count in successes.values())
+    assert len(successes) == BOOKS
+
+    db = file_sessionmaker()
+    loans_per_book = dict(db.query(models.Loan.book_id, func.count()).group_by(models.Loan.book_id).all())
+    assert loans_per_book == {book_id: 1 for book_id in range(1, BOOKS + 1)}
+    assert db.query(models.Book).filter(models.Book.available == True).count() == 0
+    db.close()
+
+def test_concurrent_returns_only_one_succeeds(file_sessionmaker):
+    db = file_sessionmaker()
+    loan_id = create_loan(schemas.LoanCreate(book_id=1, borrower_name="Okur"), db=db).id
+    db.close()
+
+    barrier = threading.Barrier(THREADS)
+    results = []
+
+    def returner():
+        barrier.wait()
+        db = file_sessionmaker()
+        try:
+            return_book(loan_id, db=db)
+            results.append(200)
+        except HTTPException as e:
+            results.append(e.status_code)
+        finally:
+            db.close()
+
+    threads = [threading.Thread(target=returner) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(results) == [200] + [400] * (THREADS - 1)
+    db = file_sessionmaker()
+    assert db.get(models.Book, 1).available == True
+    db.close()
@@ -1,3 +1,6 @@
+from app import bulk, schemas
+from app.models import Book
+
 def test_create_loan(client, test_book):
     response = client.post(
         "/loans/",
@@ -97,4 +100,148 @@ def test_read_loans(client, test_book):
     data = response.json()
     assert len(data) == 1
     assert data[0]["book_id"] == test_book.id
-    assert data[0]["borrower_name"] == "Test Kullanıcı" 
\ No newline at end of file
+    assert data[0]["borrower_name"] == "Test Kullanıcı" 
+
+def test_read_loans_cursor_pagination(client, test_category, db_session):
+    category_id = test_category.id
+    for i in range(3):
+        book = client.post(
+            "/books/",
+            json={
+                "title": f"Kitap {i}",
+                "author": "Test Yazar",
+                "isbn": f"978{i:010d}",
+                "publication_year": 2020,
+                "category_id": category_id
+            }
+        ).json()
+        client.post("/loans/", json={"book_id": book["id"], "borrower_name": f"Kullanıcı {i}"})
+
+    first_page = client.get("/loans/?limit=2")
+    assert len(first_page.json()) == 2
+    cursor = first_page.headers["X-Next-Cursor"]
+
+    second_page = client.get(f"/loans/?limit=2&cursor={cursor}")
+    assert second_page.status_code == 200
+    assert [loan["borrower_name"] for loan in second_page.json()] == ["Kullanıcı 2"]
+    assert "X-Next-Cursor" not in second_page.headers
+
+def test_read_loan_details_embeds_book(client, test_book, db_session):
+    book_id = test_book.id
+    book_title = test_book.title
+    loan_id = client.post("/loans/", json={"book_id": book_id, "borrower_name": "Test Kullanıcı"}).json()["id"]
+
+    response = client.get("/loans/details?include_category=true")
+    assert response.status_code == 200
+    data = response.json()
+    assert data[0]["id"] == loan_id
+    assert data[0]["book"]["title"] == book_title
+    assert data[0]["book"]["category"]["name"].startswith("Test Kategori")
+
+    response = client.get("/loans/details")
+    assert response.json()[0]["book"]["category"] is None
+
+def test_read_loans_filter_is_returned(client, test_book, db_session):
+    book_id = test_book.id
+    loan_id = client.post("/loans/", json={"book_id": book_id, "borrower_name": "Test Kullanıcı"}).json()["id"]
+    client.put(f"/loans/{loan_id}/return")
+    client.post("/loans/", json={"book_id": book_id, "borrower_name": "İkinci Kullanıcı"})
+
+    active = client.get("/loans/?is_returned=false").json()
+    assert [loan["borrower_name"] for loan in active] == ["İkinci Kullanıcı"]
+
+    returned = client.get("/loans/details?is_returned=true").json()
+    assert [loan["id"] for loan in returned] == [loan_id]
+
+def test_filter_loans_by_borrower_and_date(client, test_book, db_session):
+    book_id = test_book.id
+    loan_id = client.post("/loans/", json={"book_id": book_id, "borrower_name": "Ayşe"}).json()["id"]
+    client.put(f"/loans/{loan_id}/return")
+    client.post("/loans/", json={"book_id": book_id, "borrower_name": "Mehmet"})
+
+    assert [loan["borrower_name"] for loan in client.get("/loans/?borrower_name=Ayşe").json()] == ["Ayşe"]
+    assert len(client.get(f"/loans/?book_id={book_id}").json()) == 2
+    assert client.get("/loans/?loan_date_from=2100-01-01T00:00:00").json() == []
+    assert len(client.get("/loans/?loan_date_from=2000-01-01T00:00:00&loan_date_to=2100-01-01T00:00:00").json()) == 2
+
+def test_read_loans_fast_path_matches_schema(client, test_book, db_session):
+    book_id = test_book.id
+    loan_id = client.post("/loans/", json={"book_id": book_id, "borrower_name": "Test Kullanıcı"}).json()["id"]
+    client.put(f"/loans/{loan_id}/return")
+
+    listed = client.get("/loans/").json()
+    detailed = client.get("/loans/details").json()
+    detailed[0].pop("book")
+    assert listed == detailed
+
+def test_read_loans_summary_view(client, test_book):
+    book_id = test_book.id
+    client.post("/loans/", json={"book_id": book_id, "borrower_name": "Test Kullanıcı"})
+
+    full = client.get("/loans/").json()[0]
+    summary = client.get("/loans/?view=summary").json()
+    assert summary == [{key: full[key] for key in ("id", "book_id", "borrower_name", "loan_date", "is_returned")}]
+
+def test_create_loan_rejects_empty_borrower(client, test_book):
+    response = client.post("/loans/", json={"book_id": test_book.id, "borrower_name": " "})
+    assert response.status_code == 422
+
+def test_bulk_checkout_and_return(client, test_category):
+    category_id = test_category.id
+    book_ids = [
+        client.post(
+            "/books/",
+            json={"title": f"Kitap {i}", "author": "Yazar", "isbn": f"978600000{i:04d}", "publication_year": 2000, "category_id": category_id}
+        ).json()["id"]
+        for i in range(3)
+    ]
+    client.post("/loans/", json={"book_id": book_ids[2], "borrower_name": "Başka Kullanıcı"})
+
+    response = client.post(
+        "/loans/bulk",
+        json={"borrower_name": "Sepet Kullanıcı", "book_ids": [book_ids[0], book_ids[1], book_ids[2], 999, book_ids[0]]}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["succeeded"] == 2
+    assert data["failed"] == 3
+    assert [item["status"] for item in data["results"]] == ["loaned", "loaned", "error", "error", "error"]
+    assert data["results"][2]["error"] == "Kitap şu anda ödünç verilemez"
+    assert data["results"][3]["error"] == "Kitap bulunamadı"
+    assert client.get(f"/books/{book_ids[0]}").json()["available"] == False
+
+    loan_ids = [item["loan_id"] for item in data["results"][:2]]
+    response = client.put("/loans/return/bulk", json={"loan_ids": loan_ids + [999]})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["succeeded"] == 2
+    assert [item["status"] for item in data["results"]] == ["returned", "returned", "error"]
+    assert client.get(f"/books/{book_ids[0]}").json()["available"] == True
+
+    response = client.put("/loans/return/bulk", json={"loan_ids": loan_ids[:1]})
+    assert response.json()["results"][0]["error"] == "Bu kitap zaten iade edilmiş"
+
+def test_bulk_checkout_rejects_empty_cart(client):
+    response = client.post("/loans/bulk", json={"borrower_name": "Kullanıcı", "book_ids": []})
+    assert response.status_code == 422
+
+def test_bulk_checkout_and_return_in_chunks(db_session, test_category):
+    books = [
+        Book(title=f"Parça {i}", author="Yazar", isbn=f"978610000{i:04d}", publication_year=2000, category_id=test_category.id)
+        for i in range(5)
+    ]
+    db_session.add_all(books)
+    db_session.commit()
+    book_ids = [book.id for book in books]
+
+    result = bulk.bulk_checkout(
+        db_session, schemas.BulkLoanCreate(borrower_name="Sepet Kullanıcı", book_ids=book_ids + [999]), chunk_size=2
+    )
+    assert result.succeeded == 5
+    assert result.results[-1].error == "Kitap bulunamadı"
+
+    loan_ids = [item.loan_id for item in result.results[:5]]
+    result = bulk.bulk_return(db_session, schemas.BulkLoanReturn(loan_ids=loan_ids + [999]), chunk_size=2)
+    assert result.succeeded == 5
+    assert result.results[-1].error is not None
+    assert all(db_session.get(Book, book_id).available for book_id in book_ids)
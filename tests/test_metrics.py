@@ -0,0 +1,44 @@
+import logging
+
+import pytest
+
+from app import metrics
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    metrics.reset_metrics()
+    yield
+    metrics.reset_metrics()
+
+
+def test_metrics_endpoint_reports_route_latency_and_queries(client, test_book):
+    book_id = test_book.id
+    client.get(f"/books/{book_id}")
+    client.get("/books/999")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+
+    assert 'library_http_requests_total{method="GET",route="/books/{book_id}",status="200"} 1' in body
+    assert 'library_http_requests_total{method="GET",route="/books/{book_id}",status="404"} 1' in body
+    assert 'library_http_request_duration_seconds_count{method="GET",route="/books/{book_id}"} 2' in body
+    assert 'library_db_queries_per_request_bucket{method="GET",route="/books/{book_id}",le="0"} 0' in body
+    assert 'library_db_queries_per_request_bucket{method="GET",route="/books/{book_id}",le="1"} 2' in body
+    assert "library_http_requests_in_flight 1" in body
+    assert "library_cache_misses_total 2" in body
+
+def test_unmatched_routes_share_one_label(client):
+    client.get("/olmayan/yol/1")
+    client.get("/olmayan/yol/2")
+    assert 'route="unmatched",status="404"} 2' in client.get("/metrics").text
+
+def test_slow_query_log(client, test_book, monkeypatch, caplog):
+    book_id = test_book.id
+    monkeypatch.setattr(metrics, "SLOW_QUERY_THRESHOLD_MS", 0.000001)
+    with caplog.at_level(logging.WARNING, logger="app.sql.slow"):
+        client.get(f"/books/{book_id}")
+    assert any("FROM books" in record.getMessage() for record in caplog.records)
+    assert "library_db_slow_queries_total" in client.get("/metrics").text
@@ -0,0 +1,56 @@
+import pytest
+from sqlalchemy import event
+
+
+@pytest.fixture
+def captured_selects(db_session):
+    """
+    Endpoint'lerin çalıştırdığı SELECT ifadelerini parametreleriyle toplar.
+    """
+    engine = db_session.get_bind().engine
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    yield statements
+    event.remove(engine, "before_cursor_execute", capture)
+
+
+def query_plan(db_session, statement, parameters) -> str:
+    rows = db_session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    return " | ".join(row[-1] for row in rows)
+
+
+def test_active_loans_use_is_returned_loan_date_index(client, db_session, captured_selects):
+    response = client.get("/loans/?is_returned=false")
+    assert response.status_code == 200
+
+    statement, parameters = next(s for s in captured_selects if "FROM loans" in s[0])
+    plan = query_plan(db_session, statement, parameters)
+    assert "ix_loans_is_returned_loan_date" in plan
+    assert "TEMP B-TREE" not in plan
+
+def test_loans_by_book_use_book_id_index(client, db_session, captured_selects):
+    client.get("/loans/?book_id=1&is_returned=false")
+
+    statement, parameters = next(s for s in captured_selects if "FROM loans" in s[0])
+    plan = query_plan(db_session, statement, parameters)
+    assert "ix_loans_book_id_is_returned_loan_date" in plan
+    assert "TEMP B-TREE" not in plan
+
+def test_available_books_by_category_use_composite_index(client, db_session, captured_selects):
+    client.get("/books/?category_id=1&available=true")
+
+    statement, parameters = next(s for s in captured_selects if "FROM books" in s[0])
+    plan = query_plan(db_session, statement, parameters)
+    assert "ix_books_category_id_available" in plan
+    assert "TEMP B-TREE" not in plan
+
+def test_loans_by_borrower_use_index(client, db_session, captured_selects):
+    client.get("/loans/?borrower_name=Test")
+
+    statement, parameters = next(s for s in captured_selects if "FROM loans" in s[0])
+    assert "ix_loans_borrower_name" in query_plan(db_session, statement, parameters)
@@ -0,0 +1,135 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.main import create_app
+from app.migrate import migrate
+from app.replicas import PRIMARY_COOKIE, sync_replica
+from app.settings import Settings
+
+
+@pytest.fixture
+def replicated(tmp_path):
+    settings = Settings(
+        database_url=f"sqlite:///{tmp_path / 'primary.db'}",
+        replica_urls=(f"sqlite:///{tmp_path / 'replica.db'}",),
+    )
+    app = create_app(settings)
+    with TestClient(app) as client:
+        migrate(app.state.database.engine)
+        sync_replica(settings.database_url, settings.replica_urls[0])
+        yield app, client, settings
+
+
+def test_reads_go_to_replica_until_synced(replicated):
+    app, client, settings = replicated
+    category = client.post("/categories/", json={"name": "Roman"}).json()
+    book = {
+        "title": "Kitap", "author": "Yazar", "isbn": "9780306406157",
+        "publication_year": 2000, "category_id": category["id"],
+    }
+    assert client.post("/books/", json=book).status_code == 200
+
+    # Yazma yapmamış bir istemci replikadan okur ve henüz kitabı görmez
+    reader = TestClient(app)
+    assert reader.get("/books/").json() == []
+    sync_replica(settings.database_url, settings.replica_urls[0])
+    assert [b["title"] for b in reader.get("/books/").json()] == ["Kitap"]
+    # Toplu sorgu da replikadan okur ve istemciyi birincile yapıştırmaz
+    response = reader.post("/books/lookup", json={"isbns": ["0306406152"]})
+    assert response.json()["found"] == 1
+    assert "set-cookie" not in response.headers
+
+def test_writer_reads_its_own_writes(replicated):
+    app, client, settings = replicated
+    response = client.post("/categories/", json={"name": "Roman"})
+    assert PRIMARY_COOKIE in response.cookies
+    assert "Max-Age=5" in response.headers["set-cookie"]
+
+    # Çerez süresince okumalar birincilden yapılır
+    response = client.post("/books/", json={
+        "title": "Kitap", "author": "Yazar", "isbn": "9780306406157",
+        "publication_year": 2000, "category_id": response.json()["id"],
+    })
+    assert [b["title"] for b in client.get("/books/").json()] == ["Kitap"]
+
+def test_failed_writes_are_not_sticky(replicated):
+    app, client, settings = replicated
+    response = client.post("/loans/", json={"book_id": 999, "borrower_name": "Okur"})
+    assert response.status_code == 404
+    assert "set-cookie" not in response.headers
+
+def test_replica_sessions_are_read_only(replicated):
+    app, client, settings = replicated
+    database = app.state.database
+    with database.session_factory(read=True)() as db:
+        assert db.execute(text("SELECT count(*) FROM books")).scalar() == 0
+        with pytest.raises(OperationalError):
+            db.execute(text("DELETE FROM books"))
+    with database.session_factory(read=False)() as db:
+        db.execute(text("DELETE FROM books"))
+
+def test_writer_bypasses_replica_cache_entries(replicated):
+    app, client, settings = replicated
+    reader = TestClient(app)
+    assert client.post("/categories/", json={"name": "Roman"}).status_code == 200
+
+    # Başka bir istemci henüz eşitlenmemiş replikadan okur ve sonucu önbelleğe alır
+    assert reader.get("/categories/").json() == []
+    assert [c["name"] for c in client.get("/categories/").json()] == ["Roman"]
+
+    category_id = client.get("/categories/").json()[0]["id"]
+    book = client.post("/books/", json={
+        "title": "Eski", "author": "Yazar", "isbn": "9780306406157",
+        "publication_year": 2000, "category_id": category_id,
+    }).json()
+    sync_replica(settings.database_url, settings.replica_urls[0])
+    assert reader.get(f"/books/{book['id']}").json()["title"] == "Eski"
+
+    client.put(f"/books/{book['id']}", json={
+        "title": "Yeni", "author": "Yazar", "isbn": "9780306406157",
+        "publication_year": 2000, "category_id": category_id,
+    })
+    assert reader.get(f"/books/{book['id']}").json()["title"] == "Eski"
+    assert client.get(f"/books/{book['id']}").json()["title"] == "Yeni"
+
+def test_replica_etag_matches_replica_data(replicated):
+    app, client, settings = replicated
+    reader = TestClient(app)
+    category = client.post("/categories/", json={"name": "Roman"}).json()
+    client.post("/books/", json={
+        "title": "Kitap", "author": "Yazar", "isbn": "9780306406157",
+        "publication_year": 2000, "category_id": category["id"],
+    })
+
+    stale = reader.get("/books/")
+    assert stale.json() == []
+    sync_replica(settings.database_url, settings.replica_urls[0])
+    # Geride kalmış gövdenin ETag'i eşitlemeden sonra güncel sayılmaz
+    response = reader.get("/books/", headers={"If-None-Match": stale.headers["ETag"]})
+    assert response.status_code == 200
+    assert [b["title"] for b in response.json()] == ["Kitap"]
+
+def test_replica_is_pinned_per_request(tmp_path):
+    from starlette.requests import Request
+
+    from app.database import Database
+
+    settings = Settings(
+        database_url=f"sqlite:///{tmp_path / 'primary.db'}",
+        replica_urls=(f"sqlite:///{tmp_path / 'a.db'}", f"sqlite:///{tmp_path / 'b.db'}"),
+    )
+    database = Database(settings)
+
+    def request(method="GET", headers=()):
+        return Request({"type": "http", "method": method, "path": "/books/", "headers": list(headers), "state": {}})
+
+    first, second = request(), request()
+    # Aynı isteğin tüm oturumları aynı replikayı okur; istekler replikalara sırayla dağılır
+    assert database.replica_for(first) == database.replica_for(first)
+    assert {database.replica_for(first), database.replica_for(second)} == {0, 1}
+    assert database.replica_for(request("POST")) is None
+    assert database.replica_for(request(headers=[(b"cookie", f"{PRIMARY_COOKIE}=1".encode())])) is None
+    for engine in (database.engine, *database.replica_engines):
+        engine.dispose()